@@ -0,0 +1,469 @@
+import asyncio
+import os
+from typing import List, Dict, Any, Iterable, Optional, Tuple
+
+import aiohttp
+
+from data_collector import StackOverflowDataCollector, DATASET_FIELDNAMES, API_BASE_URL
+from dataset_writer import open_dataset_writer
+from rate_limiter import TokenBucketRateLimiter, QuotaExhaustedError
+from checkpoint_store import CollectionCheckpoint
+from http_transport import HttpTransport
+
+class AsyncStackOverflowDataCollector(StackOverflowDataCollector):
+    """
+    An asyncio-based collector that keeps several requests in flight over one pooled
+    keep-alive session. Every request goes through a shared TokenBucketRateLimiter,
+    which replaces the fixed one-second sleeps of StackOverflowDataCollector.
+
+    get_questions, get_answers_for_questions and create_dataset are coroutines that
+    return and write the same data as their StackOverflowDataCollector counterparts.
+    """
+
+    def __init__(self, api_key: str = None, concurrency: int = 8,
+                 rate_limiter: Optional[TokenBucketRateLimiter] = None, max_retries: int = 3,
+                 checkpoint: Optional[CollectionCheckpoint] = None, transport: Optional[HttpTransport] = None,
+                 base_url: str = API_BASE_URL, output_format: str = "csv"):
+        """
+        Initialize the async collector.
+
+        Args:
+            api_key (str, optional): Stack Exchange API key. Defaults to None.
+            concurrency (int, optional): Maximum number of requests in flight. Defaults to 8.
+            rate_limiter (TokenBucketRateLimiter, optional): Limiter shared with other collectors.
+                                                             Defaults to a new limiter.
+            max_retries (int, optional): Retries for a failed request. Defaults to 3.
+            checkpoint (CollectionCheckpoint, optional): Checkpoint store for resumable collection. Defaults to None.
+            transport (HttpTransport, optional): HTTP layer for record/replay. Defaults to passthrough.
+            base_url (str, optional): API root, e.g. a local stand-in server. Defaults to the live API.
+            output_format (str, optional): Format of the intermediate dumps, "csv" or "parquet". Defaults to "csv".
+        """
+        super().__init__(api_key=api_key, checkpoint=checkpoint, transport=transport, base_url=base_url,
+                         output_format=output_format)
+        self.concurrency = concurrency
+        self.rate_limiter = rate_limiter or TokenBucketRateLimiter()
+        self.max_retries = max_retries
+        self._session = None
+        self._semaphore = None
+
+    async def __aenter__(self):
+        await self._get_session()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """
+        Return the pooled session, creating it on first use.
+
+        Returns:
+            aiohttp.ClientSession: Keep-alive session shared by all requests.
+        """
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.concurrency, keepalive_timeout=60)
+            self._session = aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=60))
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        return self._session
+
+    async def close(self):
+        """Close the pooled session."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def _get_json(self, url: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Send a rate-limited GET request and decode the JSON response.
+
+        Args:
+            url (str): Request URL.
+            params (Dict[str, Any]): Query parameters.
+
+        Returns:
+            Dict[str, Any]: Decoded API response.
+
+        Raises:
+            QuotaExhaustedError: If the API quota has reached the limiter's reserve.
+            aiohttp.ClientError: If the request still fails after max_retries retries.
+        """
+        if self.api_key:
+            params = dict(params, key=self.api_key)
+
+        session = await self._get_session()
+        attempt = 0
+        while True:
+            await self.rate_limiter.acquire()
+            try:
+                async with self._semaphore:
+                    status, data = await self.transport.fetch_async(session, url, params)
+                # Throttle violations come back as errors with a backoff-like wait
+                if status >= 400:
+                    if data and data.get('error_name') == 'throttle_violation':
+                        self.rate_limiter.backoff(30)
+                    raise aiohttp.ClientError(f"{status} error for {url}: {(data or {}).get('error_message', '')}")
+                self.rate_limiter.update(data)
+                return data
+
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+                attempt += 1
+                if attempt > self.max_retries:
+                    raise
+                print(f"Error making request to {url}: {e}. Retrying ({attempt}/{self.max_retries})...")
+                await asyncio.sleep(5 * attempt) # Wait before retrying
+
+    async def _get_questions_page(self, tag: str, page: int, page_size: int, since: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Fetch one page of questions for a tag.
+
+        Args:
+            tag (str): Tag to filter questions.
+            page (int): Page number.
+            page_size (int): Number of items per page.
+            since (int, optional): Activity watermark (Unix timestamp) for incremental runs. Defaults to None.
+
+        Returns:
+            Dict[str, Any]: Decoded API response for the page.
+        """
+        return await self._get_json(f"{self.base_url}/questions", self._questions_params(tag, page, page_size, since))
+
+    async def get_questions(self, tag: str = "nlp", page_size: int = 100, max_questions: int = 20000,
+                            since: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Collect questions with specified tag from Stack Overflow, fetching up to
+        `concurrency` pages at a time.
+
+        Args:
+            tag (str, optional): Tag to filter questions. Defaults to "nlp".
+            page_size (int, optional): Number of items per page. Defaults to 100.
+            max_questions (int, optional): Maximum number of questions to retrieve. Defaults to 20000.
+            since (int, optional): Only fetch questions created or edited at or after this Unix
+                                   timestamp, oldest activity first. Defaults to None.
+
+        Returns:
+            List[Dict[str, Any]]: List of question data dictionaries, in page order.
+        """
+        questions = []
+        page = 1
+        has_more = True
+        max_pages = -(-max_questions // page_size)
+        next_intermediate_save = 1000
+
+        os.makedirs("../data", exist_ok=True)
+
+        # Resume from the last completed page if a checkpoint exists for this tag
+        if self.checkpoint and since is None:
+            questions, page, has_more = self._resume_questions(tag)
+            next_intermediate_save = (len(questions) // 1000 + 1) * 1000
+
+        print(f"Collecting questions with tag [{tag}] ({self.concurrency} requests in flight)...")
+
+        while has_more and page <= max_pages:
+            pages = range(page, min(page + self.concurrency, max_pages + 1))
+            results = await asyncio.gather(
+                *(self._get_questions_page(tag, p, page_size, since) for p in pages),
+                return_exceptions=True
+            )
+
+            for p, result in zip(pages, results):
+                if isinstance(result, QuotaExhaustedError):
+                    print(f"Stopping collection: {result}")
+                    has_more = False
+                    break
+                if isinstance(result, Exception):
+                    print(f"Error getting page {p} for tag [{tag}]: {result}")
+                    has_more = False
+                    break
+
+                questions.extend(result.get('items', []))
+                # Pages are recorded in order, so the checkpoint never skips a failed page
+                if self.checkpoint and since is None:
+                    self.checkpoint.save_page(tag, p, result.get('items', []), result.get('has_more', False))
+                if not result.get('has_more', False):
+                    has_more = False
+                    break
+
+            page = pages[-1] + 1
+            questions = questions[:max_questions]
+            print(f"Collected {len(questions)} questions so far...")
+
+            # Save intermediate results every 1000 questions
+            if len(questions) >= next_intermediate_save:
+                self._save_intermediate(questions, tag)
+                next_intermediate_save = (len(questions) // 1000 + 1) * 1000
+
+        print(f"Collected a total of {len(questions)} questions.")
+        return questions
+
+    async def _get_answers_batch(self, question_ids: List[int]) -> Dict[int, List[Dict[str, Any]]]:
+        """
+        Fetch all answer pages for up to 100 questions.
+
+        Args:
+            question_ids (List[int]): IDs of the questions (at most 100).
+
+        Returns:
+            Dict[int, List[Dict[str, Any]]]: Answers grouped by question_id, sorted by votes (desc).
+        """
+        ids = ';'.join(str(question_id) for question_id in question_ids)
+        url = f"{self.base_url}/questions/{ids}/answers"
+        answers_by_question = {question_id: [] for question_id in question_ids}
+
+        page = 1
+        has_more = True
+        while has_more:
+            params = {
+                'page': page,
+                'pagesize': 100,
+                'order': 'desc',
+                'sort': 'votes',
+                'site': 'stackoverflow',
+                'filter': '!-*jbN-o8P3E5', # Default filter with some enhancements
+            }
+            data = await self._get_json(url, params)
+
+            for answer in data.get('items', []):
+                answers_by_question.setdefault(answer.get('question_id'), []).append(answer)
+
+            has_more = data.get('has_more', False)
+            page += 1
+
+        return answers_by_question
+
+    async def get_answers_for_questions(self, question_ids: List[int],
+                                        batch_size: int = 100) -> Tuple[Dict[int, List[Dict[str, Any]]], List[int]]:
+        """
+        Get answers for many questions, fetching the batches concurrently.
+        Each request is already retried max_retries times with backoff by _get_json,
+        so a batch that still fails is reported instead of retried again.
+
+        Args:
+            question_ids (List[int]): IDs of the questions.
+            batch_size (int, optional): Number of ids per request (max 100). Defaults to 100.
+
+        Returns:
+            Tuple[Dict[int, List[Dict[str, Any]]], List[int]]: Answers grouped by question_id, each list
+                sorted by votes (desc), and the ids whose answers could not be fetched.
+        """
+        batch_size = max(1, min(batch_size, 100))
+        batches = [question_ids[i:i + batch_size] for i in range(0, len(question_ids), batch_size)]
+        results = await asyncio.gather(*(self._get_answers_batch(batch) for batch in batches), return_exceptions=True)
+
+        answers_by_question = {}
+        failed_ids = []
+        for batch, result in zip(batches, results):
+            if isinstance(result, Exception):
+                print(f"Error getting answers for questions {batch[0]}..{batch[-1]}: {result}")
+                failed_ids.extend(batch)
+                continue
+            answers_by_question.update(result)
+
+        return answers_by_question, failed_ids
+
+    async def create_dataset(self, questions: List[Dict[str, Any]], filename: str = "nlp_stackoverflow_dataset.csv",
+                             batch_size: int = 100):
+        """
+        Fetch answers for the questions concurrently and append the rows to the dataset
+        (CSV, or a Parquet dataset for ".parquet" filenames). Rows are written in input
+        order, one window of `concurrency` batches at a time.
+
+        Args:
+            questions (List[Dict[str, Any]]): List of question data dictionaries.
+            filename (str, optional): Output filename to save the dataset. Defaults to "nlp_stackoverflow_dataset.csv".
+            batch_size (int, optional): Number of questions per answer request. Defaults to 100.
+        """
+        output_path = f"../data/{filename}"
+        window_size = max(1, min(batch_size, 100)) * self.concurrency
+
+        # Skip questions already written by an earlier (possibly interrupted) run
+        questions = self._filter_written(questions, output_path)
+        total_questions = len(questions)
+        skipped = 0
+
+        with open_dataset_writer(output_path, DATASET_FIELDNAMES) as writer:
+            if writer.created:
+                print(f"Created new dataset file: {output_path}")
+            else:
+                print(f"Appending to existing dataset file: {output_path}")
+
+            for window_start in range(0, total_questions, window_size):
+                window = questions[window_start:window_start + window_size]
+                print(f"Processing questions {window_start+1}-{window_start+len(window)}/{total_questions}")
+
+                if self.rate_limiter.exhausted:
+                    print("API quota exhausted. Stopping before all answers were fetched.")
+                    break
+
+                answers_by_question, failed_ids = await self.get_answers_for_questions(
+                    [question.get('question_id') for question in window], batch_size=batch_size
+                )
+                skipped += len(failed_ids)
+
+                written_ids = []
+                for question in window:
+                    question_id = question.get('question_id')
+                    # Rows are only written once their answers were fetched, so the next run retries them
+                    if question_id not in answers_by_question:
+                        continue
+                    try:
+                        writer.write_row(self._build_row(question, answers_by_question.get(question_id, [])))
+                        written_ids.append(question_id)
+                    except Exception as e:
+                        print(f"Error writing row for question {question_id}: {e}")
+
+                self._flush_written(writer, written_ids)
+
+        if skipped:
+            print(f"Skipped {skipped} questions whose answers could not be fetched. They will be retried on the next run.")
+        print(f"Finished processing questions. Data saved to {output_path}")
+        if self.rate_limiter.quota_remaining is not None:
+            print(f"API quota remaining: {self.rate_limiter.quota_remaining}")
+
+    async def upsert_dataset(self, questions: List[Dict[str, Any]], filename: str = "nlp_stackoverflow_dataset.csv",
+                             batch_size: int = 100):
+        """
+        Fetch answers for new or changed questions concurrently and upsert them into the dataset CSV.
+        Questions whose answers could not be fetched are left out.
+
+        Args:
+            questions (List[Dict[str, Any]]): New or changed question data dictionaries.
+            filename (str, optional): Dataset filename. Defaults to "nlp_stackoverflow_dataset.csv".
+            batch_size (int, optional): Number of questions per answer request. Defaults to 100.
+
+        Returns:
+            List[int]: Ids of the questions that were left out.
+        """
+        answers_by_question, failed_ids = await self.get_answers_for_questions(
+            [question.get('question_id') for question in questions], batch_size=batch_size
+        )
+        rows = [self._build_row(question, answers_by_question[question.get('question_id')])
+                for question in questions if question.get('question_id') in answers_by_question]
+        if failed_ids:
+            print(f"Skipped {len(failed_ids)} questions whose answers could not be fetched.")
+        self._upsert_rows(rows, f"../data/{filename}")
+        return failed_ids
+
+
+async def collect_tag(tag: str, api_key: str = None, max_questions: int = 20000, concurrency: int = 8,
+                      filename: str = "nlp_stackoverflow_dataset.csv",
+                      checkpoint: Optional[CollectionCheckpoint] = None, transport: Optional[HttpTransport] = None,
+                      base_url: str = API_BASE_URL, output_format: str = "csv") -> List[Dict[str, Any]]:
+    """
+    Collect questions and answers for one tag with the async collector.
+
+    Args:
+        tag (str): Tag to filter questions.
+        api_key (str, optional): Stack Exchange API key. Defaults to None.
+        max_questions (int, optional): Maximum number of questions to retrieve. Defaults to 20000.
+        concurrency (int, optional): Maximum number of requests in flight. Defaults to 8.
+        filename (str, optional): Output filename; a ".parquet" name writes a Parquet dataset.
+                                  Defaults to "nlp_stackoverflow_dataset.csv".
+        checkpoint (CollectionCheckpoint, optional): Checkpoint store for resumable collection. Defaults to None.
+        transport (HttpTransport, optional): HTTP layer for record/replay. Defaults to passthrough.
+        base_url (str, optional): API root. Defaults to the live API.
+        output_format (str, optional): Format of the intermediate dumps, "csv" or "parquet". Defaults to "csv".
+
+    Returns:
+        List[Dict[str, Any]]: The collected questions.
+    """
+    async with AsyncStackOverflowDataCollector(api_key=api_key, concurrency=concurrency, checkpoint=checkpoint,
+                                               transport=transport, base_url=base_url,
+                                               output_format=output_format) as collector:
+        questions = await collector.get_questions(tag=tag, max_questions=max_questions)
+        if questions:
+            await collector.create_dataset(questions, filename=filename)
+        return questions
+
+
+def deduplicate_questions(questions: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Drop repeated questions, keeping the first occurrence of each question_id.
+
+    Args:
+        questions (Iterable[Dict[str, Any]]): Question data dictionaries, possibly from several tags.
+
+    Returns:
+        List[Dict[str, Any]]: Unique questions in their original order.
+    """
+    seen = set()
+    unique = []
+    for question in questions:
+        question_id = question.get('question_id')
+        if question_id in seen:
+            continue
+        seen.add(question_id)
+        unique.append(question)
+    return unique
+
+
+async def collect_tags(tags: List[str], api_key: str = None, max_questions: int = 20000, concurrency: int = 8,
+                       filename: str = "nlp_stackoverflow_dataset.csv",
+                       checkpoint: Optional[CollectionCheckpoint] = None,
+                       since: Optional[Dict[str, int]] = None,
+                       preloaded: Optional[Dict[str, List[Dict[str, Any]]]] = None,
+                       transport: Optional[HttpTransport] = None,
+                       base_url: str = API_BASE_URL,
+                       output_format: str = "csv") -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Collect several tags concurrently through one collector, so every request shares the
+    same session and rate limiter (and therefore the same quota budget). Questions are
+    deduplicated across tags by question_id before answers are fetched, so the answer
+    phase runs once per unique question.
+
+    Args:
+        tags (List[str]): Tags to collect.
+        api_key (str, optional): Stack Exchange API key. Defaults to None.
+        max_questions (int, optional): Maximum number of questions to retrieve per tag. Defaults to 20000.
+        concurrency (int, optional): Maximum number of requests in flight across all tags. Defaults to 8.
+        filename (str, optional): Output filename; a ".parquet" name writes a Parquet dataset.
+                                  Defaults to "nlp_stackoverflow_dataset.csv".
+        checkpoint (CollectionCheckpoint, optional): Checkpoint store for resumable collection. Defaults to None.
+        since (Dict[str, int], optional): Watermark per tag. Tags listed here are collected incrementally
+                                          and upserted. Defaults to None.
+        preloaded (Dict[str, List[Dict[str, Any]]], optional): Questions already available per tag
+                                                                (e.g. from intermediate files); these
+                                                                tags are not fetched again. Defaults to None.
+        transport (HttpTransport, optional): HTTP layer for record/replay. Defaults to passthrough.
+        base_url (str, optional): API root. Defaults to the live API.
+        output_format (str, optional): Format of the intermediate dumps, "csv" or "parquet". Defaults to "csv".
+
+    Returns:
+        Dict[str, List[Dict[str, Any]]]: The questions collected for each tag.
+    """
+    since = since or {}
+    preloaded = preloaded or {}
+
+    async with AsyncStackOverflowDataCollector(api_key=api_key, concurrency=concurrency, checkpoint=checkpoint,
+                                               transport=transport, base_url=base_url,
+                                               output_format=output_format) as collector:
+        to_fetch = [tag for tag in tags if tag not in preloaded]
+        results = await asyncio.gather(*(
+            collector.get_questions(tag=tag, max_questions=max_questions, since=since.get(tag))
+            for tag in to_fetch
+        ))
+
+        questions_by_tag = dict(preloaded)
+        questions_by_tag.update(zip(to_fetch, results))
+
+        # Questions from incremental tags may already be in the dataset, so they are upserted.
+        # Everything else is appended; create_dataset also skips ids the checkpoint has seen.
+        changed = deduplicate_questions(q for tag in tags if tag in since for q in questions_by_tag[tag])
+        changed_ids = {question.get('question_id') for question in changed}
+        new = [q for q in deduplicate_questions(q for tag in tags if tag not in since for q in questions_by_tag[tag])
+               if q.get('question_id') not in changed_ids]
+
+        total = sum(len(questions_by_tag[tag]) for tag in tags)
+        print(f"Collected {total} questions across {len(tags)} tags ({len(new) + len(changed)} unique).")
+
+        if new:
+            await collector.create_dataset(new, filename=filename)
+        if changed:
+            await collector.upsert_dataset(changed, filename=filename)
+
+    return questions_by_tag
+
+
+if __name__ == "__main__":
+    # Example usage: collect a small number of questions for testing
+    test_questions = asyncio.run(collect_tag("nlp", max_questions=50, filename="test_nlp_dataset.csv"))
+    print(f"Collected {len(test_questions)} questions asynchronously.")
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+import argparse
+import random
+import re
+import sys
+import time
+from typing import Any, Dict, List
+
+import pandas as pd
+
+from categorizer import QUESTION_TYPE_PATTERNS, categorize_question_types
+
+# Vocabulary for synthetic titles: question words (also inside other words and in
+# upper case), NLP terms and filler
+TITLE_WORDS = [
+    "what", "which", "why", "how", "when", "where", "What", "HOW", "Why", "whatever",
+    "somehow", "elsewhere", "whenever", "showhow", "nltk", "spacy", "bert", "tokenize",
+    "sentences", "model", "error", "vectors", "in", "the", "a", "to", "with", "python",
+]
+
+def synthetic_titles(rows: int, seed: int = 0) -> pd.Series:
+    """
+    Build a column of random titles, with some missing values.
+
+    Args:
+        rows (int): Number of titles.
+        seed (int, optional): Random seed. Defaults to 0.
+
+    Returns:
+        pd.Series: Titles.
+    """
+    rng = random.Random(seed)
+    titles = []
+    for _ in range(rows):
+        if rng.random() < 0.01:
+            titles.append(None)
+        else:
+            titles.append(" ".join(rng.choices(TITLE_WORDS, k=rng.randint(3, 12))) + "?")
+    return pd.Series(titles, dtype=object)
+
+def question_types_iterrows(df: pd.DataFrame) -> Dict[str, List[Any]]:
+    """
+    Reference implementation: the original row-by-row question type categorization.
+
+    Args:
+        df (pd.DataFrame): Frame with a 'title' column.
+
+    Returns:
+        Dict[str, List[Any]]: Question types mapped to index labels.
+    """
+    question_categories = {cat: [] for cat in QUESTION_TYPE_PATTERNS.keys()}
+    for idx, row in df.iterrows():
+        if 'title' not in row:
+            continue
+        title = row['title'].lower() if isinstance(row['title'], str) else ""
+        for qtype, pattern in QUESTION_TYPE_PATTERNS.items():
+            if re.search(pattern, title):
+                question_categories[qtype].append(idx)
+                break
+    return question_categories
+
+def check_question_types(df: pd.DataFrame) -> int:
+    """
+    Compare the vectorized question type categorization with the reference.
+
+    Args:
+        df (pd.DataFrame): Frame with a 'title' column.
+
+    Returns:
+        int: Number of question types with different index lists.
+    """
+    expected = question_types_iterrows(df)
+    actual = categorize_question_types(df['title'])
+    mismatches = 0
+    for qtype in QUESTION_TYPE_PATTERNS:
+        if actual[qtype] != expected[qtype]:
+            mismatches += 1
+            print(f"Mismatch for {qtype}: expected {len(expected[qtype])} posts, got {len(actual[qtype])}")
+    return mismatches
+
+def benchmark_question_types(df: pd.DataFrame, reference_rows: int):
+    """
+    Print the throughput of the vectorized question type categorization against the
+    iterrows reference.
+
+    Args:
+        df (pd.DataFrame): Frame with a 'title' column.
+        reference_rows (int): Number of rows to time the (slow) reference on; its time
+                              is scaled up to the full frame.
+    """
+    start_time = time.perf_counter()
+    categorize_question_types(df['title'])
+    vectorized_time = time.perf_counter() - start_time
+
+    reference_rows = min(reference_rows, len(df))
+    start_time = time.perf_counter()
+    question_types_iterrows(df.iloc[:reference_rows])
+    reference_time = (time.perf_counter() - start_time) * len(df) / reference_rows
+
+    estimate = "" if reference_rows == len(df) else f" (estimated from {reference_rows} rows)"
+    print(f"\nQuestion type categorization of {len(df)} titles:")
+    print(f"  iterrows: {reference_time:.2f}s{estimate}  vectorized: {vectorized_time:.2f}s  "
+          f"speedup: {reference_time / vectorized_time:.1f}x")
+
+def parse_arguments():
+    """
+    Parse command line arguments.
+
+    Returns:
+        argparse.Namespace: Parsed arguments.
+    """
+    parser = argparse.ArgumentParser(description="Check and benchmark the vectorized categorizer paths on synthetic titles")
+
+    parser.add_argument("--rows", type=int, default=1000000, help="Number of synthetic titles")
+    parser.add_argument("--check-rows", type=int, default=100000, help="Titles to compare against the reference implementation")
+    parser.add_argument("--reference-rows", type=int, default=1000000, help="Titles to time the reference implementation on (0 = all)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for the synthetic titles")
+    parser.add_argument("--check-only", action="store_true", help="Only check that the vectorized path matches the reference output")
+
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    args = parse_arguments()
+
+    print(f"Generating {args.rows} synthetic titles...")
+    df = pd.DataFrame({'title': synthetic_titles(args.rows, seed=args.seed)})
+
+    check_df = df.iloc[:args.check_rows]
+    print(f"Checking question types against the iterrows reference on {len(check_df)} titles...")
+    mismatches = check_question_types(check_df)
+    print(f"{mismatches} mismatches.")
+
+    if not args.check_only:
+        benchmark_question_types(df, reference_rows=args.reference_rows or len(df))
+
+    sys.exit(1 if mismatches else 0)
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+import argparse
+import sys
+import time
+from typing import List, Callable
+
+from dataset_writer import load_dataset
+from preprocessor import DataPreprocessor
+
+def load_post_bodies(dataset_path: str, limit: int = 5000) -> List[str]:
+    """
+    Load real HTML post bodies (questions and answers) from the collected dataset.
+
+    Args:
+        dataset_path (str): Path to the raw combined dataset (CSV or Parquet).
+        limit (int, optional): Maximum number of bodies to return. Defaults to 5000.
+
+    Returns:
+        List[str]: HTML bodies.
+    """
+    df = load_dataset(dataset_path)
+    bodies = []
+    for column in ('description', 'accepted_answer'):
+        if column in df.columns:
+            bodies.extend(body for body in df[column] if isinstance(body, str) and body)
+    if 'other_answers' in df.columns:
+        for answers in df['other_answers']:
+            bodies.extend(answer for answer in answers if isinstance(answer, str) and answer)
+    return bodies[:limit]
+
+def time_function(function: Callable[[str], str], bodies: List[str], repeat: int = 3) -> float:
+    """
+    Time a text function over all bodies, keeping the best of several runs.
+
+    Args:
+        function (Callable[[str], str]): Function to time.
+        bodies (List[str]): Inputs.
+        repeat (int, optional): Number of runs. Defaults to 3.
+
+    Returns:
+        float: Best wall-clock time in seconds.
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        for body in bodies:
+            function(body)
+        best = min(best, time.perf_counter() - start_time)
+    return best
+
+def check_clean_html(bodies: List[str]) -> int:
+    """
+    Compare the fast clean_html path with the BeautifulSoup reference on every body,
+    with and without code removal.
+
+    Args:
+        bodies (List[str]): HTML bodies.
+
+    Returns:
+        int: Number of mismatching outputs.
+    """
+    mismatches = 0
+    for remove_code in (False, True):
+        preprocessor = DataPreprocessor(remove_code=remove_code)
+        for body in bodies:
+            expected = preprocessor._clean_html_soup(body)
+            actual = preprocessor.clean_html(body)
+            if actual != expected:
+                mismatches += 1
+                if mismatches <= 5:
+                    print(f"Mismatch (remove_code={remove_code}) for body starting {body[:80]!r}")
+                    print(f"  expected: {expected[:200]!r}")
+                    print(f"  actual:   {actual[:200]!r}")
+    return mismatches
+
+def benchmark_clean_html(bodies: List[str], repeat: int = 3):
+    """
+    Print the throughput of the fast clean_html path against the BeautifulSoup reference.
+
+    Args:
+        bodies (List[str]): HTML bodies.
+        repeat (int, optional): Number of timed runs per implementation. Defaults to 3.
+    """
+    total_kb = sum(len(body) for body in bodies) / 1024
+    print(f"\nclean_html on {len(bodies)} bodies ({total_kb:.0f} KB), best of {repeat}:")
+    for remove_code in (False, True):
+        preprocessor = DataPreprocessor(remove_code=remove_code)
+        soup_time = time_function(preprocessor._clean_html_soup, bodies, repeat)
+        fast_time = time_function(preprocessor.clean_html, bodies, repeat)
+        print(f"  remove_code={remove_code!s:<5}  BeautifulSoup: {soup_time:.3f}s  "
+              f"fast path: {fast_time:.3f}s  speedup: {soup_time / fast_time:.1f}x")
+
+def time_batch(function: Callable[[List[str]], list], texts: List[str], repeat: int = 3) -> float:
+    """
+    Time a batch function over all texts at once, keeping the best of several runs.
+
+    Args:
+        function (Callable[[List[str]], list]): Batch function to time.
+        texts (List[str]): Inputs.
+        repeat (int, optional): Number of runs. Defaults to 3.
+
+    Returns:
+        float: Best wall-clock time in seconds.
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        function(texts)
+        best = min(best, time.perf_counter() - start_time)
+    return best
+
+def tokenizer_inputs(bodies: List[str]) -> List[str]:
+    """
+    Run the steps of preprocess_text that come before tokenization.
+
+    Args:
+        bodies (List[str]): HTML bodies.
+
+    Returns:
+        List[str]: Lowercased texts without HTML, URLs or ASCII punctuation.
+    """
+    preprocessor = DataPreprocessor()
+    return [
+        preprocessor.remove_punctuation(preprocessor.remove_urls(preprocessor.clean_html(body)).lower())
+        for body in bodies
+    ]
+
+def check_tokenizers(texts: List[str]) -> int:
+    """
+    Compare the regex batch tokenizer with word_tokenize on every text.
+
+    Args:
+        texts (List[str]): Texts from tokenizer_inputs().
+
+    Returns:
+        int: Number of mismatching token lists.
+    """
+    expected = DataPreprocessor(tokenizer="nltk").tokenize_batch(texts)
+    actual = DataPreprocessor(tokenizer="regex").tokenize_batch(texts)
+    mismatches = 0
+    for text, expected_tokens, actual_tokens in zip(texts, expected, actual):
+        if actual_tokens != expected_tokens:
+            mismatches += 1
+            if mismatches <= 5:
+                print(f"Mismatch for text starting {text[:80]!r}")
+                print(f"  expected: {expected_tokens[:20]}")
+                print(f"  actual:   {actual_tokens[:20]}")
+    return mismatches
+
+def benchmark_tokenizers(bodies: List[str], texts: List[str], repeat: int = 3):
+    """
+    Print the throughput of the regex batch tokenizer against word_tokenize, on its own
+    and as part of the full (uncached) preprocessing pipeline.
+
+    Args:
+        bodies (List[str]): HTML bodies.
+        texts (List[str]): The same bodies passed through tokenizer_inputs().
+        repeat (int, optional): Number of timed runs per implementation. Defaults to 3.
+    """
+    nltk_preprocessor = DataPreprocessor(tokenizer="nltk")
+    regex_preprocessor = DataPreprocessor(tokenizer="regex")
+
+    print(f"\nTokenization of {len(texts)} texts, best of {repeat}:")
+    nltk_time = time_batch(nltk_preprocessor.tokenize_batch, texts, repeat)
+    regex_time = time_batch(regex_preprocessor.tokenize_batch, texts, repeat)
+    print(f"  word_tokenize: {nltk_time:.3f}s  regex batch: {regex_time:.3f}s  speedup: {nltk_time / regex_time:.1f}x")
+
+    print(f"\npreprocess_texts on {len(bodies)} bodies, best of {repeat}:")
+    nltk_time = time_batch(nltk_preprocessor.preprocess_texts, bodies, repeat)
+    regex_time = time_batch(regex_preprocessor.preprocess_texts, bodies, repeat)
+    print(f"  tokenizer=nltk: {nltk_time:.3f}s  tokenizer=regex: {regex_time:.3f}s  speedup: {nltk_time / regex_time:.1f}x")
+
+def parse_arguments():
+    """
+    Parse command line arguments.
+
+    Returns:
+        argparse.Namespace: Parsed arguments.
+    """
+    parser = argparse.ArgumentParser(description="Check and benchmark the preprocessing fast paths on real post bodies")
+
+    parser.add_argument("--dataset", type=str, default="../data/nlp_stackoverflow_dataset.csv", help="Raw combined dataset to take post bodies from")
+    parser.add_argument("--limit", type=int, default=5000, help="Maximum number of post bodies to use")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per implementation")
+    parser.add_argument("--check-only", action="store_true", help="Only check that the fast paths match the reference output")
+
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    args = parse_arguments()
+
+    bodies = load_post_bodies(args.dataset, limit=args.limit)
+    if not bodies:
+        print(f"No post bodies found in {args.dataset}. Collect data first (see main.py).")
+        sys.exit(1)
+
+    print(f"Checking clean_html against the BeautifulSoup reference on {len(bodies)} bodies...")
+    mismatches = check_clean_html(bodies)
+    print(f"{mismatches} mismatches.")
+
+    texts = tokenizer_inputs(bodies)
+    print(f"Checking the regex tokenizer against word_tokenize on {len(texts)} texts...")
+    tokenizer_mismatches = check_tokenizers(texts)
+    print(f"{tokenizer_mismatches} mismatches.")
+    mismatches += tokenizer_mismatches
+
+    if not args.check_only:
+        benchmark_clean_html(bodies, repeat=args.repeat)
+        benchmark_tokenizers(bodies, texts, repeat=args.repeat)
+
+    sys.exit(1 if mismatches else 0)
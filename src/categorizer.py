@@ -3,10 +3,150 @@ import re
 import numpy as np
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
+from scipy import sparse
 import json
+import glob
 import os
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Union, Tuple
 
+from category_membership import CategoryMembership, category_slug
+from dataset_writer import load_dataset
+from knowledge_base_db import write_knowledge_base
+from keyword_matcher import KeywordMatcher
+from post_store import write_post_store
+from search_index import write_ranked_index
+from tag_index import TagIndex, load_tag_index
+
+# Keywords per category for each keyword-driven categorization. A post belongs to a
+# category when one of its keywords occurs anywhere in the lowercased text.
+KEYWORD_CATEGORIES = {
+    "Text Classification": ["classification", "classifier", "classify", "categorization", "categorize"],
+    "Named Entity Recognition": ["ner", "named entity", "entity recognition", "entity extraction"],
+    "Sentiment Analysis": ["sentiment", "emotion", "polarity", "opinion"],
+    "Text Summarization": ["summary", "summarization", "summarize", "summarizing"],
+    "Machine Translation": ["translation", "translate", "translator", "machine translation", "mt"],
+    "Question Answering": ["question answering", "qa system", "answer questions"],
+    "Topic Modeling": ["topic", "lda", "topic model", "latent dirichlet"],
+    "Word Embeddings": ["word2vec", "glove", "embedding", "word embedding", "vector"],
+    "Text Preprocessing": ["preprocessing", "preprocess", "tokenization", "tokenize", "lemmatization", "stemming"],
+    "Language Identification": ["language identification", "language detection", "detect language", "identify language"],
+    "Text Similarity": ["similarity", "similar text", "document similarity", "semantic similarity"],
+    "Part-of-Speech Tagging": ["pos", "part of speech", "tagging", "tagger"],
+    "Implementation Issues": ["how to", "how do i", "implementation", "code", "example"],
+    "Understanding Concepts": ["what is", "explain", "understand", "concept", "difference between", "why"],
+    "Performance Issues": ["slow", "performance", "speed", "memory", "efficient", "optimization"],
+    "Error Troubleshooting": ["error", "problem", "issue", "bug", "fix", "solve", "exception", "failed"],
+    "Library Usage": ["spacy", "nltk", "huggingface", "transformers", "gensim", "pytorch", "tensorflow", "bert"],
+    "Data Collection": ["corpus", "dataset", "data collection", "scraping", "crawling"],
+    "Evaluation Metrics": ["accuracy", "precision", "recall", "f1", "bleu", "rouge", "evaluation", "metric"]
+}
+
+TASK_CATEGORIES = {
+    "Text Classification": ["classification", "classifier", "classify", "categorization", "categorize"],
+    "Named Entity Recognition": ["ner", "named entity", "entity recognition", "entity extraction"],
+    "Sentiment Analysis": ["sentiment", "emotion", "polarity", "opinion"],
+    "Text Summarization": ["summary", "summarization", "summarize", "summarizing"],
+    "Machine Translation": ["translation", "translate", "translator", "machine translation", "mt"],
+    "Question Answering": ["question answering", "qa system", "answer questions"],
+    "Topic Modeling": ["topic", "lda", "topic model", "latent dirichlet"],
+    "Word Embeddings": ["word2vec", "glove", "embedding", "word embedding", "vector"],
+    "Tokenization": ["tokenization", "tokenize", "tokenizer", "tokens"],
+    "Lemmatization": ["lemmatization", "lemmatize", "lemmatizer", "lemma"],
+    "Stemming": ["stemming", "stem", "stemmer", "porter"],
+    "Language Identification": ["language identification", "language detection", "detect language", "identify language"],
+    "Text Similarity": ["similarity", "similar text", "document similarity", "semantic similarity"],
+    "Part-of-Speech Tagging": ["pos", "part of speech", "tagging", "tagger"],
+    "Dependency Parsing": ["dependency parsing", "dependency parser", "syntactic parsing"],
+    "Coreference Resolution": ["coreference", "coreference resolution", "anaphora"],
+    "Text Generation": ["text generation", "generate text", "text generator", "gpt"]
+}
+
+# Library aliases are also looked up in the post's tags
+LIBRARY_CATEGORIES = {
+    "NLTK": ["nltk", "natural language toolkit"],
+    "spaCy": ["spacy", "spacy nlp"],
+    "Hugging Face": ["huggingface", "hugging face", "transformers", "🤗"],
+    "BERT": ["bert", "distilbert", "roberta", "albert"],
+    "Word2Vec": ["word2vec", "word vectors", "word embedding"],
+    "GloVe": ["glove", "global vectors"],
+    "fastText": ["fasttext"],
+    "Gensim": ["gensim"],
+    "Stanford NLP": ["stanford nlp", "stanford core nlp", "stanfordnlp", "stanza"],
+    "OpenNLP": ["opennlp"],
+    "TextBlob": ["textblob"],
+    "GPT": ["gpt", "gpt-2", "gpt-3", "gpt-4", "chatgpt"],
+    "WordNet": ["wordnet"],
+    "TensorFlow": ["tensorflow", "tf"],
+    "PyTorch": ["pytorch", "torch"],
+    "scikit-learn": ["scikit learn", "sklearn"]
+}
+
+KEYWORD_SCHEMES = {
+    "keyword_based": KEYWORD_CATEGORIES,
+    "task_based": TASK_CATEGORIES,
+    "library_based": LIBRARY_CATEGORIES,
+}
+
+# Threads writing category files in save_categories_to_files
+IO_WORKERS = 4
+
+# Order of the methods in self.categories, whatever order they finish in
+CATEGORIZATION_METHODS = ("keyword_based", "task_based", "library_based", "similarity_based")
+
+# Index of the saved categorizations: for each method, its categories and the membership
+# matrix holding their post positions in the shared post store
+CATEGORY_MANIFEST_FILE = "manifest.json"
+CATEGORY_MANIFEST_VERSION = 1
+
+# Posts per block when comparing TF-IDF rows, so at most block_size x n similarities
+# are held in memory instead of the dense n x n matrix
+SIMILARITY_BLOCK_SIZE = 500
+
+# Question words per question type, in priority order: a title containing several
+# question words gets the first matching type, wherever the words appear
+QUESTION_TYPE_PATTERNS = {
+    "what": r'\bwhat\b|\bwhich\b',
+    "why": r'\bwhy\b',
+    "how": r'\bhow\b',
+    "when": r'\bwhen\b',
+    "where": r'\bwhere\b'
+}
+
+# One lookahead per type, all anchored at the start of the title, so the regex engine
+# tries the types in priority order and the named group that matched gives the type
+QUESTION_TYPE_REGEX = '^(?:' + '|'.join(
+    f'(?=.*(?P<{qtype}>{pattern}))' for qtype, pattern in QUESTION_TYPE_PATTERNS.items()
+) + ')'
+
+
+def categorize_question_types(titles: pd.Series) -> Dict[str, List[Any]]:
+    """
+    Assign each title to the first question type in QUESTION_TYPE_PATTERNS whose
+    question word it contains, using vectorized string operations.
+    
+    Args:
+        titles (pd.Series): Post titles. Non-string values never match.
+        
+    Returns:
+        Dict[str, List[Any]]: Question types mapped to the index labels of their titles,
+                              in index order. Every type is present, possibly empty.
+    """
+    # Non-string titles become "", which also keeps .str usable on all-missing columns
+    is_string = titles.map(lambda value: isinstance(value, str)).astype(bool)
+    lowered = titles.where(is_string, "").astype(object).str.lower()
+    # DOTALL so a question word after a line break is found, as re.search did
+    matches = lowered.str.extract(re.compile(QUESTION_TYPE_REGEX, re.DOTALL))
+    
+    # Exactly one group is set for a matching title
+    matched = matches.notna()
+    question_type = matched.idxmax(axis=1)[matched.any(axis=1)]
+    
+    groups = {qtype: group.index.tolist() for qtype, group in question_type.groupby(question_type, sort=False)}
+    return {qtype: groups.get(qtype, []) for qtype in QUESTION_TYPE_PATTERNS}
+
 class PostCategorizer:
     """
     Categorize NLP-related Stack Overflow posts based on various criteria.
@@ -17,17 +157,34 @@ class PostCategorizer:
         Initialize the categorizer with preprocessed dataset.
         
         Args:
-            data_path (str): Path to the preprocessed dataset.
+            data_path (str): Path to the preprocessed dataset (CSV or Parquet).
         """
         self.data_path = data_path
-        self.df = pd.read_csv(data_path)
+        self.df = load_dataset(data_path)
         self.categories = {}
         
+        # Keyword memberships per column, shared by the keyword-driven categorizations
+        self._keyword_matches = {}
+        self._tags = None
+        self._tfidf = None
+        
+        # categorize_all(n_jobs > 1) runs the methods in threads that share these caches
+        self._keyword_lock = threading.Lock()
+        self._tfidf_lock = threading.Lock()
+        self._manifest_lock = threading.Lock()
+        
+        # Saved categorizations, written to ../data/categories/manifest.json
+        self._manifest = None
+        
+        # Top-k neighbours per post, filled by build_related_questions_index()
+        self.related_neighbors = None
+        self.related_scores = None
+        
         # Create categories directory
         os.makedirs("../data/categories", exist_ok=True)
     
     def keyword_based_categorization(self, column: str = 'processed_title', 
-                                    min_posts_per_category: int = 10) -> Dict[str, List[int]]:
+                                    min_posts_per_category: int = 10) -> CategoryMembership:
         """
         Categorize posts based on keywords in the title.
         
@@ -36,70 +193,30 @@ class PostCategorizer:
             min_posts_per_category (int, optional): Minimum posts required for a category. Defaults to 10.
             
         Returns:
-            Dict[str, List[int]]: Dictionary mapping category names to list of post indices.
+            CategoryMembership: Post × category membership; maps category names to post positions.
         """
         print(f"Performing keyword-based categorization on {column}...")
         
-        # Define categories and their keywords
-        category_keywords = {
-            "Text Classification": ["classification", "classifier", "classify", "categorization", "categorize"],
-            "Named Entity Recognition": ["ner", "named entity", "entity recognition", "entity extraction"],
-            "Sentiment Analysis": ["sentiment", "emotion", "polarity", "opinion"],
-            "Text Summarization": ["summary", "summarization", "summarize", "summarizing"],
-            "Machine Translation": ["translation", "translate", "translator", "machine translation", "mt"],
-            "Question Answering": ["question answering", "qa system", "answer questions"],
-            "Topic Modeling": ["topic", "lda", "topic model", "latent dirichlet"],
-            "Word Embeddings": ["word2vec", "glove", "embedding", "word embedding", "vector"],
-            "Text Preprocessing": ["preprocessing", "preprocess", "tokenization", "tokenize", "lemmatization", "stemming"],
-            "Language Identification": ["language identification", "language detection", "detect language", "identify language"],
-            "Text Similarity": ["similarity", "similar text", "document similarity", "semantic similarity"],
-            "Part-of-Speech Tagging": ["pos", "part of speech", "tagging", "tagger"],
-            "Implementation Issues": ["how to", "how do i", "implementation", "code", "example"],
-            "Understanding Concepts": ["what is", "explain", "understand", "concept", "difference between", "why"],
-            "Performance Issues": ["slow", "performance", "speed", "memory", "efficient", "optimization"],
-            "Error Troubleshooting": ["error", "problem", "issue", "bug", "fix", "solve", "exception", "failed"],
-            "Library Usage": ["spacy", "nltk", "huggingface", "transformers", "gensim", "pytorch", "tensorflow", "bert"],
-            "Data Collection": ["corpus", "dataset", "data collection", "scraping", "crawling"],
-            "Evaluation Metrics": ["accuracy", "precision", "recall", "f1", "bleu", "rouge", "evaluation", "metric"]
-        }
-        
-        # Initialize categories
-        categories = {category: [] for category in category_keywords}
-        
         # Check if column exists
         if column not in self.df.columns:
             print(f"Column '{column}' not found in the dataset.")
-            return categories
-        
-        # Iterate through posts and categorize
-        for i, post_text in enumerate(self.df[column]):
-            if not isinstance(post_text, str):
-                continue
-                
-            post_text = post_text.lower()
-            
-            # Check each category
-            for category, keywords in category_keywords.items():
-                for keyword in keywords:
-                    if keyword in post_text:
-                        categories[category].append(i)
-                        break
+            return CategoryMembership.from_index_lists({category: [] for category in KEYWORD_CATEGORIES}, len(self.df))
         
         # Remove categories with fewer than min_posts_per_category posts
-        categories = {k: v for k, v in categories.items() if len(v) >= min_posts_per_category}
+        categories = self._match_keywords(column)["keyword_based"].filter(min_posts_per_category)
         
         # Save categorized indices
         self.categories["keyword_based"] = categories
         
         # Print statistics
         print("\nKeyword-based categorization results:")
-        for category, indices in categories.items():
-            print(f"{category}: {len(indices)} posts")
+        for category, count in categories.counts().items():
+            print(f"{category}: {count} posts")
             
         return categories
     
     def task_based_categorization(self, column: str = 'processed_title', 
-                                min_posts_per_category: int = 10) -> Dict[str, List[int]]:
+                                min_posts_per_category: int = 10) -> CategoryMembership:
         """
         Categorize posts based on NLP tasks in the title.
         
@@ -108,63 +225,25 @@ class PostCategorizer:
             min_posts_per_category (int, optional): Minimum posts required for a category. Defaults to 10.
             
         Returns:
-            Dict[str, List[int]]: Dictionary mapping category names to list of post indices.
+            CategoryMembership: Post × category membership; maps category names to post positions.
         """
         print(f"Performing task-based categorization on {column}...")
         
-        # Define NLP tasks and their keywords
-        task_keywords = {
-            "Text Classification": ["classification", "classifier", "classify", "categorization", "categorize"],
-            "Named Entity Recognition": ["ner", "named entity", "entity recognition", "entity extraction"],
-            "Sentiment Analysis": ["sentiment", "emotion", "polarity", "opinion"],
-            "Text Summarization": ["summary", "summarization", "summarize", "summarizing"],
-            "Machine Translation": ["translation", "translate", "translator", "machine translation", "mt"],
-            "Question Answering": ["question answering", "qa system", "answer questions"],
-            "Topic Modeling": ["topic", "lda", "topic model", "latent dirichlet"],
-            "Word Embeddings": ["word2vec", "glove", "embedding", "word embedding", "vector"],
-            "Tokenization": ["tokenization", "tokenize", "tokenizer", "tokens"],
-            "Lemmatization": ["lemmatization", "lemmatize", "lemmatizer", "lemma"],
-            "Stemming": ["stemming", "stem", "stemmer", "porter"],
-            "Language Identification": ["language identification", "language detection", "detect language", "identify language"],
-            "Text Similarity": ["similarity", "similar text", "document similarity", "semantic similarity"],
-            "Part-of-Speech Tagging": ["pos", "part of speech", "tagging", "tagger"],
-            "Dependency Parsing": ["dependency parsing", "dependency parser", "syntactic parsing"],
-            "Coreference Resolution": ["coreference", "coreference resolution", "anaphora"],
-            "Text Generation": ["text generation", "generate text", "text generator", "gpt"]
-        }
-        
-        # Initialize categories
-        categories = {task: [] for task in task_keywords}
-        
         # Check if column exists
         if column not in self.df.columns:
             print(f"Column '{column}' not found in the dataset.")
-            return categories
-        
-        # Iterate through posts and categorize
-        for i, post_text in enumerate(self.df[column]):
-            if not isinstance(post_text, str):
-                continue
-                
-            post_text = post_text.lower()
-            
-            # Check each task
-            for task, keywords in task_keywords.items():
-                for keyword in keywords:
-                    if keyword in post_text:
-                        categories[task].append(i)
-                        break
+            return CategoryMembership.from_index_lists({task: [] for task in TASK_CATEGORIES}, len(self.df))
         
         # Remove tasks with fewer than min_posts_per_category posts
-        categories = {k: v for k, v in categories.items() if len(v) >= min_posts_per_category}
+        categories = self._match_keywords(column)["task_based"].filter(min_posts_per_category)
         
         # Save categorized indices
         self.categories["task_based"] = categories
         
         # Print statistics
         print("\nTask-based categorization results:")
-        for task, indices in categories.items():
-            print(f"{task}: {len(indices)} posts")
+        for task, count in categories.counts().items():
+            print(f"{task}: {count} posts")
             
         return categories
     
@@ -174,31 +253,11 @@ class PostCategorizer:
         """
         print("Performing question type categorization...")
         
-        # Create patterns for different question types
-        patterns = {
-            "what": r'\bwhat\b|\bwhich\b',
-            "why": r'\bwhy\b',
-            "how": r'\bhow\b',
-            "when": r'\bwhen\b',
-            "where": r'\bwhere\b'
-        }
-        
-        # Initialize categories
-        question_categories = {cat: [] for cat in patterns.keys()}
-        
-        # Iterate through posts and categorize them
-        for idx, row in self.df.iterrows():
-            # Make sure we're checking the original title, not processed_title
-            if 'title' not in row:
-                continue
-            
-            title = row['title'].lower() if isinstance(row['title'], str) else ""
-            
-            # Check each pattern and assign to appropriate category
-            for qtype, pattern in patterns.items():
-                if re.search(pattern, title):
-                    question_categories[qtype].append(idx)
-                    break  # Assign to first matching category only
+        # Make sure we're checking the original title, not processed_title
+        if 'title' in self.df.columns:
+            question_categories = categorize_question_types(self.df['title'])
+        else:
+            question_categories = {qtype: [] for qtype in QUESTION_TYPE_PATTERNS}
         
         # Save categorization results
         self._save_categorization("question_type", question_categories)
@@ -211,7 +270,7 @@ class PostCategorizer:
         return question_categories
     
     def library_based_categorization(self, column: str = 'processed_title', 
-                                  min_posts_per_category: int = 10) -> Dict[str, List[int]]:
+                                  min_posts_per_category: int = 10) -> CategoryMembership:
         """
         Categorize posts based on NLP libraries mentioned.
         
@@ -220,211 +279,470 @@ class PostCategorizer:
             min_posts_per_category (int, optional): Minimum posts required for a category. Defaults to 10.
             
         Returns:
-            Dict[str, List[int]]: Dictionary mapping category names to list of post indices.
+            CategoryMembership: Post × category membership; maps category names to post positions.
         """
         print(f"Performing library-based categorization on {column}...")
         
-        # Define NLP libraries and their aliases
-        library_keywords = {
-            "NLTK": ["nltk", "natural language toolkit"],
-            "spaCy": ["spacy", "spacy nlp"],
-            "Hugging Face": ["huggingface", "hugging face", "transformers", "🤗"],
-            "BERT": ["bert", "distilbert", "roberta", "albert"],
-            "Word2Vec": ["word2vec", "word vectors", "word embedding"],
-            "GloVe": ["glove", "global vectors"],
-            "fastText": ["fasttext"],
-            "Gensim": ["gensim"],
-            "Stanford NLP": ["stanford nlp", "stanford core nlp", "stanfordnlp", "stanza"],
-            "OpenNLP": ["opennlp"],
-            "TextBlob": ["textblob"],
-            "GPT": ["gpt", "gpt-2", "gpt-3", "gpt-4", "chatgpt"],
-            "WordNet": ["wordnet"],
-            "TensorFlow": ["tensorflow", "tf"],
-            "PyTorch": ["pytorch", "torch"],
-            "scikit-learn": ["scikit learn", "sklearn"]
-        }
-        
-        # Initialize categories
-        categories = {library: [] for library in library_keywords}
-        
         # Check if column exists
         if column not in self.df.columns:
             print(f"Column '{column}' not found in the dataset.")
-            return categories
+            return CategoryMembership.from_index_lists({library: [] for library in LIBRARY_CATEGORIES}, len(self.df))
         
-        # Check tags column as well if available
-        tags_available = 'tags' in self.df.columns
+        # Remove libraries with fewer than min_posts_per_category posts
+        categories = self._match_keywords(column)["library_based"].filter(min_posts_per_category)
         
-        # Iterate through posts and categorize
-        for i, post_text in enumerate(self.df[column]):
-            if not isinstance(post_text, str):
-                continue
-                
-            post_text = post_text.lower()
+        # Save categorized indices
+        self.categories["library_based"] = categories
+        
+        # Print statistics
+        print("\nLibrary-based categorization results:")
+        for library, count in categories.counts().items():
+            print(f"{library}: {count} posts")
+            
+        return categories
+    
+    def tfidf_matrix(self) -> sparse.csr_matrix:
+        """
+        Get the TF-IDF matrix of processed_title + processed_description, built on first use.
+        Rows are L2-normalized, so the dot product of two rows is their cosine similarity.
+        
+        Returns:
+            sparse.csr_matrix: Sparse posts × terms matrix.
+        """
+        with self._tfidf_lock:
+            if self._tfidf is None:
+                texts = pd.Series("", index=self.df.index)
+                for column in ('processed_title', 'processed_description'):
+                    if column in self.df.columns:
+                        texts = texts + " " + self.df[column].fillna("").astype(str)
             
-            # Get tags for this post if available
-            post_tags = []
-            if tags_available:
-                tags = self.df.iloc[i]['tags']
-                if isinstance(tags, str):
-                    try:
-                        # Try to convert string representation of list to actual list
-                        if tags.startswith('[') and tags.endswith(']'):
-                            post_tags = eval(tags)
-                        else:
-                            post_tags = tags.split()
-                    except:
-                        post_tags = []
-                elif isinstance(tags, list):
-                    post_tags = tags
+                print(f"Building TF-IDF matrix over {len(texts)} posts...")
+                vectorizer = TfidfVectorizer(max_features=50000, sublinear_tf=True, dtype=np.float32)
+                self._tfidf = vectorizer.fit_transform(texts).tocsr()
+                print(f"TF-IDF matrix: {self._tfidf.shape[0]} posts × {self._tfidf.shape[1]} terms, {self._tfidf.nnz} non-zeros")
+        
+            return self._tfidf
+    
+    def similarity_based_categorization(self, seed_method: str = 'keyword_based', min_similarity: float = 0.1,
+                                        min_posts_per_category: int = 10,
+                                        block_size: int = SIMILARITY_BLOCK_SIZE) -> CategoryMembership:
+        """
+        Categorize posts by TF-IDF similarity to category centroids. Each centroid is the
+        mean TF-IDF vector of the posts a keyword-driven method put in that category, and
+        each post goes to its most similar centroid, so posts without any keyword can
+        still be categorized.
+        
+        Args:
+            seed_method (str, optional): Keyword-driven method whose categories seed the centroids.
+                                         Defaults to 'keyword_based'.
+            min_similarity (float, optional): Minimum cosine similarity to the nearest centroid. Defaults to 0.1.
+            min_posts_per_category (int, optional): Minimum posts required for a category. Defaults to 10.
+            block_size (int, optional): Posts compared per block. Defaults to SIMILARITY_BLOCK_SIZE.
             
-            # Convert tags to lowercase for matching
-            post_tags = [tag.lower() for tag in post_tags]
+        Returns:
+            CategoryMembership: Post × category membership; maps category names to post positions.
+        """
+        print(f"Performing similarity-based categorization seeded from {seed_method}...")
+        
+        # Seed categories, from an earlier run of the method or straight from the keyword matches
+        seeds = self.categories.get(seed_method)
+        if seeds is None:
+            if 'processed_title' not in self.df.columns:
+                print("Column 'processed_title' not found in the dataset.")
+                return CategoryMembership.from_index_lists({}, len(self.df))
+            seeds = self._match_keywords('processed_title')[seed_method].filter(min_posts_per_category)
+        
+        tfidf = self.tfidf_matrix()
+        category_names = list(seeds)
+        categories = {category: [] for category in category_names}
+        
+        if category_names:
+            # Mean TF-IDF vector of the seed posts of each category
+            seed_counts = np.maximum(np.diff(seeds.matrix.indptr), 1)
+            centroids = sparse.diags(1.0 / seed_counts) @ (seeds.matrix.T.astype(np.float32) @ tfidf)
             
-            # Check each library in title and tags
-            for library, keywords in library_keywords.items():
-                # Check in title
-                for keyword in keywords:
-                    if keyword in post_text:
-                        categories[library].append(i)
-                        break
-                
-                # Check in tags if not already categorized
-                if i not in categories[library] and tags_available:
-                    for keyword in keywords:
-                        if any(keyword in tag for tag in post_tags):
-                            categories[library].append(i)
-                            break
+            for start in range(0, tfidf.shape[0], block_size):
+                similarities = cosine_similarity(tfidf[start:start + block_size], centroids)
+                best = similarities.argmax(axis=1)
+                best_similarity = similarities[np.arange(len(best)), best]
+                for offset in np.flatnonzero(best_similarity >= min_similarity):
+                    categories[category_names[best[offset]]].append(start + offset)
         
-        # Remove libraries with fewer than min_posts_per_category posts
-        categories = {k: v for k, v in categories.items() if len(v) >= min_posts_per_category}
+        # Remove categories with fewer than min_posts_per_category posts
+        categories = CategoryMembership.from_index_lists(categories, len(self.df)).filter(min_posts_per_category)
         
         # Save categorized indices
-        self.categories["library_based"] = categories
+        self.categories["similarity_based"] = categories
         
         # Print statistics
-        print("\nLibrary-based categorization results:")
-        for library, indices in categories.items():
-            print(f"{library}: {len(indices)} posts")
+        print("\nSimilarity-based categorization results:")
+        for category, count in categories.counts().items():
+            print(f"{category}: {count} posts")
             
         return categories
     
-    def save_categories_to_files(self):
+    def build_related_questions_index(self, k: int = 10, block_size: int = SIMILARITY_BLOCK_SIZE,
+                                      output_path: str = "../data/categories/related_questions.npz") -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find the k most similar other posts of every post ("related questions") by cosine
+        similarity of their TF-IDF vectors. Similarities are computed block_size rows at a
+        time, so only block_size × n of them are in memory at once.
+        
+        Args:
+            k (int, optional): Neighbours per post. Defaults to 10.
+            block_size (int, optional): Posts compared per block. Defaults to SIMILARITY_BLOCK_SIZE.
+            output_path (str, optional): Where to save the index (.npz). Defaults to
+                                         "../data/categories/related_questions.npz".
+            
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Neighbour positions and similarities, both posts × k and
+                                           sorted by decreasing similarity. Missing neighbours
+                                           (no shared terms) are -1 with similarity 0.
+        """
+        tfidf = self.tfidf_matrix()
+        n_posts = tfidf.shape[0]
+        k = max(0, min(k, n_posts - 1))
+        print(f"Building related questions index (top {k}) for {n_posts} posts...")
+        
+        neighbors = np.full((n_posts, k), -1, dtype=np.int32)
+        scores = np.zeros((n_posts, k), dtype=np.float32)
+        
+        if k > 0:
+            for start in range(0, n_posts, block_size):
+                end = min(start + block_size, n_posts)
+                similarities = cosine_similarity(tfidf[start:end], tfidf)
+                
+                # A post is not related to itself
+                rows = np.arange(end - start)
+                similarities[rows, start + rows] = -1
+                
+                top = np.argpartition(-similarities, k - 1, axis=1)[:, :k]
+                top_scores = similarities[rows[:, None], top]
+                order = np.argsort(-top_scores, axis=1, kind='stable')
+                top = top[rows[:, None], order]
+                top_scores = top_scores[rows[:, None], order]
+                
+                found = top_scores > 0
+                neighbors[start:end] = np.where(found, top, -1)
+                scores[start:end] = np.where(found, top_scores, 0)
+        
+        self.related_neighbors = neighbors
+        self.related_scores = scores
+        
+        # Keep question ids with the index, so it stays usable without the dataset row order
+        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+        question_ids = self.df['question_id'].to_numpy() if 'question_id' in self.df.columns else np.arange(n_posts)
+        np.savez_compressed(output_path, neighbors=neighbors, scores=scores, question_ids=question_ids)
+        print(f"Saved related questions index to {output_path}")
+        
+        return neighbors, scores
+    
+    def related_questions(self, post: int) -> List[Tuple[int, float]]:
+        """
+        Get the posts most similar to a post, from the related questions index.
+        
+        Args:
+            post (int): Post position.
+            
+        Returns:
+            List[Tuple[int, float]]: (post position, cosine similarity) pairs, most similar first.
+        """
+        if self.related_neighbors is None:
+            self.build_related_questions_index()
+        return [(int(neighbor), float(score))
+                for neighbor, score in zip(self.related_neighbors[post], self.related_scores[post]) if neighbor >= 0]
+    
+    @property
+    def tags(self) -> TagIndex:
+        """Parsed tags of every post, loaded on first use from the dataset's tag sidecar."""
+        if self._tags is None:
+            self._tags = load_tag_index(self.data_path, self.df['tags'])
+        return self._tags
+    
+    def _match_keywords(self, column: str) -> Dict[str, CategoryMembership]:
+        """
+        Scan every post once for the keywords of all keyword-driven categorizations.
+        Library aliases are also matched against the post's tags, once per distinct tag.
+        Results are cached per column, so the categorization methods share a single
+        pass over the data.
+        
+        Args:
+            column (str): Column to search for keywords.
+            
+        Returns:
+            Dict[str, CategoryMembership]: Membership of every category, for each method
+                                           in KEYWORD_SCHEMES.
+        """
+        with self._keyword_lock:
+            if column in self._keyword_matches:
+                return self._keyword_matches[column]
+            
+            matcher = KeywordMatcher(KEYWORD_SCHEMES)
+            matches = {method: {category: [] for category in categories}
+                       for method, categories in KEYWORD_SCHEMES.items()}
+        
+            has_text = np.zeros(len(self.df), dtype=bool)
+            for i, post_text in enumerate(self.df[column]):
+                if not isinstance(post_text, str):
+                    continue
+            
+                has_text[i] = True
+                for method, category in matcher.match(post_text.lower()):
+                    matches[method][category].append(i)
+        
+            # Library aliases in the tags: match each distinct tag once, then map back to posts
+            if 'tags' in self.df.columns:
+                codes_by_library = {}
+                for code, tag in enumerate(self.tags.vocabulary):
+                    for method, library in matcher.match(tag.lower()):
+                        if method == "library_based":
+                            codes_by_library.setdefault(library, []).append(code)
+            
+                for library, codes in codes_by_library.items():
+                    posts = self.tags.posts_with_tags(codes)
+                    matches["library_based"][library].extend(posts[has_text[posts]].tolist())
+        
+            self._keyword_matches[column] = {
+                method: CategoryMembership.from_index_lists(categories, len(self.df))
+                for method, categories in matches.items()
+            }
+            return self._keyword_matches[column]
+    
+    def save_categories_to_files(self, io_workers: int = IO_WORKERS):
         """
-        Save categorized posts to CSV files.
+        Save the categorizations. Posts are written once to a shared post store and each
+        method only saves its membership matrix (post positions per category), indexed
+        by ../data/categories/manifest.json. The matrices are written by a bounded pool
+        of I/O threads.
+        
+        Args:
+            io_workers (int, optional): Threads writing membership files. Defaults to IO_WORKERS.
         """
         print("Saving categorized posts to files...")
         
         # Create summary file
         summary = {
             "categorization_methods": {},
-            "total_categorized_posts": 0,
-            "unique_categorized_posts": set()
+            "total_categorized_posts": 0
         }
         
-        # Process each categorization method
-        for method, categories in self.categories.items():
-            print(f"\nSaving {method} categories...")
-            
-            method_dir = f"../data/categories/{method}"
-            os.makedirs(method_dir, exist_ok=True)
-            
-            # Create summary entry for this method
-            summary["categorization_methods"][method] = {
-                "categories": {},
-                "total_posts": 0
-            }
+        # Positions of posts in at least one category
+        categorized_posts = np.array([], dtype=np.int64)
+        
+        # Membership files are written in the background while the summary is built
+        with ThreadPoolExecutor(max_workers=max(1, io_workers)) as io_pool:
+            writes = []
             
-            # Save each category to a file
-            for category, indices in categories.items():
-                # Create a subset of the dataframe with these posts
-                category_df = self.df.iloc[indices].copy()
-                
-                # Add indices to unique categorized posts set
-                summary["unique_categorized_posts"].update(indices)
+            # Process each categorization method
+            for method, categories in self.categories.items():
+                print(f"\nSaving {method} categories...")
+                writes.append(io_pool.submit(self._save_membership, method, categories))
+                categorized_posts = np.union1d(categorized_posts, categories.union())
                 
-                # Update summary counts
-                summary["categorization_methods"][method]["categories"][category] = len(indices)
-                summary["categorization_methods"][method]["total_posts"] += len(indices)
-                
-                # Clean category name for filename
-                clean_category = category.replace(' ', '_').replace('/', '_')
-                
-                # Save to CSV
-                output_path = f"{method_dir}/{clean_category}.csv"
-                category_df.to_csv(output_path, index=False)
-                print(f"Saved {len(indices)} posts to {output_path}")
+                # Create summary entry for this method
+                counts = categories.counts()
+                summary["categorization_methods"][method] = {
+                    "categories": counts,
+                    "total_posts": sum(counts.values())
+                }
+            
+            # Wait for every file; result() re-raises the first write error
+            for write in writes:
+                write.result()
         
-        # Calculate total unique categorized posts
-        summary["total_categorized_posts"] = len(summary["unique_categorized_posts"])
+        self._write_manifest()
         
-        # Convert set to list for JSON serialization
-        summary["unique_categorized_posts"] = list(summary["unique_categorized_posts"])
+        # Calculate total unique categorized posts
+        summary["total_categorized_posts"] = len(categorized_posts)
         
         # Save summary to JSON
         with open("../data/categories/categorization_summary.json", "w") as f:
             json.dump({
                 "categorization_methods": summary["categorization_methods"],
                 "total_categorized_posts": summary["total_categorized_posts"],
-                "total_unique_posts": len(summary["unique_categorized_posts"])
+                "total_unique_posts": summary["total_categorized_posts"]
             }, f, indent=2)
         
         print(f"\nCategorization complete. Total unique categorized posts: {summary['total_categorized_posts']}")
     
-    def categorize_all(self):
+    def build_search_index(self, directory: str = "ranked_index"):
         """
-        Perform all categorization methods.
+        Build the BM25F index the web app ranks search results with, over the shared
+        post store, and list it in the category manifest. Quoted phrases are matched
+        by the knowledge base's full-text index instead.
+        
+        Args:
+            directory (str, optional): Base name of the ranked index directory in ../data/categories;
+                                       each build gets a new versioned directory. Defaults to "ranked_index".
+        """
+        self._ensure_post_store()
+        
+        print(f"Building ranked search index over {len(self.df)} posts...")
+        ranked_path = write_ranked_index(self.df, os.path.join("../data/categories", directory))
+        print(f"Saved ranked search index to {ranked_path}")
+        
+        # Positional indexes written by earlier runs are no longer read
+        for path in glob.glob("../data/categories/search_index") + glob.glob("../data/categories/search_index-*"):
+            shutil.rmtree(path, ignore_errors=True)
+        
+        with self._manifest_lock:
+            self._manifest.pop("search_index", None)
+            self._manifest["ranked_index"] = os.path.basename(ranked_path)
+        self._write_manifest()
+    
+    def export_knowledge_base(self, db_path: str = "../data/knowledge_base.db"):
+        """
+        Export the posts, their answers and tags, and every saved categorization into
+        a SQLite database with a full-text index, for the web app.
+        
+        Args:
+            db_path (str, optional): Output path. Defaults to "../data/knowledge_base.db".
+        """
+        with self._manifest_lock:
+            methods = dict(self._manifest["methods"]) if self._manifest is not None else {}
+        
+        # Every method saved so far, including question types, as saved in the manifest
+        memberships = {method: CategoryMembership.load(os.path.join("../data/categories", entry["membership"]))
+                       for method, entry in methods.items()}
+        
+        print(f"Exporting {len(self.df)} posts and {len(memberships)} categorizations to {db_path}...")
+        write_knowledge_base(self.df, memberships, db_path)
+        print(f"Saved knowledge base to {db_path}")
+    
+    def _ensure_post_store(self):
+        """
+        Write every post once to the shared post store, on first use, and start a
+        fresh manifest for it.
+        """
+        with self._manifest_lock:
+            if self._manifest is not None:
+                return
+            
+            store_path, offsets_path = write_post_store(self.df, "../data/categories")
+            print(f"Saved {len(self.df)} posts to {store_path}")
+            self._manifest = {
+                "version": CATEGORY_MANIFEST_VERSION,
+                "post_store": os.path.basename(store_path),
+                "post_offsets": os.path.basename(offsets_path),
+                "total_posts": len(self.df),
+                "methods": {}
+            }
+    
+    def _save_membership(self, method: str, categories: CategoryMembership):
         """
-        # Perform keyword-based categorization
-        self.keyword_based_categorization()
+        Save the membership matrix of one method and add it to the manifest.
         
-        # Perform task-based categorization
-        self.task_based_categorization()
+        Args:
+            method (str): Categorization method, also its directory name.
+            categories (CategoryMembership): Its categories.
+        """
+        self._ensure_post_store()
+        
+        method_dir = f"../data/categories/{method}"
+        os.makedirs(method_dir, exist_ok=True)
+        membership_path = f"{method}/membership.npz"
+        categories.save(f"../data/categories/{membership_path}")
+        print(f"Saved {len(categories)} {method} categories to ../data/categories/{membership_path}")
+        
+        entry = {
+            "membership": membership_path,
+            "categories": {
+                category: {
+                    "column": column,
+                    "count": count,
+                    # Clean category name, as used in URLs and the old per-category file names
+                    "slug": category_slug(category)
+                }
+                for column, (category, count) in enumerate(categories.counts().items())
+            }
+        }
+        with self._manifest_lock:
+            self._manifest["methods"][method] = entry
+    
+    def _write_manifest(self):
+        """Write the manifest of every categorization saved so far."""
+        with self._manifest_lock:
+            if self._manifest is None:
+                return
+            
+            # Fixed method order, whatever order they were saved in
+            order = CATEGORIZATION_METHODS + ("question_type",)
+            methods = sorted(self._manifest["methods"],
+                             key=lambda method: (order.index(method) if method in order else len(order), method))
+            manifest = dict(self._manifest, methods={method: self._manifest["methods"][method] for method in methods})
+            
+            manifest_path = os.path.join("../data/categories", CATEGORY_MANIFEST_FILE)
+            with open(f"{manifest_path}.tmp", "w") as f:
+                json.dump(manifest, f, indent=2)
+            os.replace(f"{manifest_path}.tmp", manifest_path)
+    
+    def categorize_all(self, n_jobs: int = 1, io_workers: int = IO_WORKERS):
+        """
+        Perform all categorization methods.
         
-        # Perform question type categorization
-        self.question_type_categorization()
+        The methods only read self.df, so with n_jobs > 1 they run concurrently in
+        threads that share the DataFrame instead of copying it to worker processes.
         
-        # Perform library-based categorization
-        self.library_based_categorization()
+        Args:
+            n_jobs (int, optional): Methods run at the same time (-1 for one per CPU). Defaults to 1.
+            io_workers (int, optional): Threads writing category files. Defaults to IO_WORKERS.
+        """
+        methods = [
+            self.keyword_based_categorization,
+            self.task_based_categorization,
+            self.question_type_categorization,
+            self.library_based_categorization,
+            self.similarity_based_categorization,
+            self.build_related_questions_index,
+        ]
+        
+        if n_jobs is None or n_jobs < 0:
+            n_jobs = os.cpu_count() or 1
+        
+        if n_jobs <= 1:
+            for method in methods:
+                method()
+        else:
+            print(f"Running {len(methods)} categorization methods across {n_jobs} threads...")
+            with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+                futures = [executor.submit(method) for method in methods]
+                # result() re-raises the first failure
+                for future in futures:
+                    future.result()
+            
+            # Keep the saved output in the same order as a sequential run
+            self.categories = {method: self.categories[method]
+                               for method in CATEGORIZATION_METHODS if method in self.categories}
         
         # Save categories to files
-        self.save_categories_to_files()
+        self.save_categories_to_files(io_workers=io_workers)
+        
+        # Index the post store for search
+        self.build_search_index()
+        
+        # Export everything the web app serves into one database
+        self.export_knowledge_base()
 
     def _save_categorization(self, category_type, categories):
         """
-        Save categorization results to JSON files.
+        Save categorization results as a membership matrix in the category manifest.
         
         Args:
             category_type (str): The type of categorization (e.g., 'keyword_based', 'task_based').
             categories (dict): Dictionary mapping category names to lists of post indices.
         """
         print(f"\n{category_type.replace('_', ' ').title()} categorization results:")
-        category_dir = os.path.join("../data/categories", category_type)
-        os.makedirs(category_dir, exist_ok=True)
-        
-        # Create a CSV lookup file for this category type
-        lookup_file = os.path.join("../data/categories", f"{category_type}_categories.csv")
-        with open(lookup_file, 'w') as f:
-            f.write("category,count,file_path\n")
-            
-            for category, post_indices in categories.items():
-                if len(post_indices) > 0:
-                    # Print summary
-                    print(f"{category.replace('_', ' ').title()}: {len(post_indices)} posts")
-                    
-                    # Save to CSV lookup
-                    category_filename = f"{category.lower().replace(' ', '_')}.json"
-                    file_path = os.path.join(category_type, category_filename)
-                    f.write(f"{category},{len(post_indices)},{file_path}\n")
-                    
-                    # Save category data
-                    category_data = {
-                        "category": category,
-                        "post_count": len(post_indices),
-                        "posts": self.df.iloc[post_indices].to_dict(orient='records')
-                    }
-                    with open(os.path.join(category_dir, category_filename), 'w') as cat_file:
-                        json.dump(category_data, cat_file, indent=2)
+        for category, post_indices in categories.items():
+            if len(post_indices) > 0:
+                print(f"{category.replace('_', ' ').title()}: {len(post_indices)} posts")
+        
+        # Post indices are index labels; the post store is addressed by row position
+        membership = CategoryMembership.from_index_lists(
+            {category: self.df.index.get_indexer(post_indices) for category, post_indices in categories.items()},
+            len(self.df)
+        )
+        self._save_membership(category_type, membership)
+        self._write_manifest()
 
 
 if __name__ == "__main__":
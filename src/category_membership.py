@@ -0,0 +1,235 @@
+from collections.abc import Mapping
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+def category_slug(category: str) -> str:
+    """
+    Get the file- and URL-safe name of a category.
+
+    Args:
+        category (str): Category name.
+
+    Returns:
+        str: Name with spaces and slashes replaced by underscores.
+    """
+    return category.replace(' ', '_').replace('/', '_')
+
+
+class CategoryMembership(Mapping):
+    """
+    Boolean post × category membership matrix of one categorization method.
+
+    The matrix is stored compressed by category (CSC), so each category is a sorted
+    array of post positions and per-category counts, overlaps and set operations never
+    build Python lists. It reads like the old Dict[str, List[int]]: iterating gives
+    category names and indexing by name gives the post positions of that category.
+    """
+
+    def __init__(self, matrix: sparse.spmatrix, category_names: List[str]):
+        """
+        Wrap a membership matrix.
+
+        Args:
+            matrix (sparse.spmatrix): Boolean matrix of shape (posts, categories).
+            category_names (List[str]): Category name of each column.
+        """
+        if matrix.shape[1] != len(category_names):
+            raise ValueError(f"Matrix has {matrix.shape[1]} columns for {len(category_names)} categories")
+        self.matrix = sparse.csc_matrix(matrix, dtype=bool)
+        self.matrix.sort_indices()
+        self.category_names = list(category_names)
+        self._columns = {name: column for column, name in enumerate(self.category_names)}
+        self._rows = None  # CSR copy for per-post lookups, built on first use
+
+    @classmethod
+    def from_index_lists(cls, categories: Dict[str, Iterable[int]], n_posts: int) -> "CategoryMembership":
+        """
+        Build the matrix from category names mapped to post positions.
+
+        Args:
+            categories (Dict[str, Iterable[int]]): Post positions per category.
+            n_posts (int): Number of posts (rows).
+
+        Returns:
+            CategoryMembership: Membership matrix.
+        """
+        columns = [np.unique(np.asarray(list(indices), dtype=np.int64)) for indices in categories.values()]
+        indptr = np.zeros(len(columns) + 1, dtype=np.int64)
+        indptr[1:] = np.cumsum([len(column) for column in columns])
+        indices = np.concatenate(columns) if columns else np.array([], dtype=np.int64)
+        matrix = sparse.csc_matrix(
+            (np.ones(len(indices), dtype=bool), indices, indptr), shape=(n_posts, len(columns))
+        )
+        return cls(matrix, list(categories))
+
+    @property
+    def n_posts(self) -> int:
+        """Number of posts (rows) in the matrix."""
+        return self.matrix.shape[0]
+
+    def __getitem__(self, category: str) -> np.ndarray:
+        column = self._columns[category]
+        return self.matrix.indices[self.matrix.indptr[column]:self.matrix.indptr[column + 1]]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.category_names)
+
+    def __len__(self) -> int:
+        return len(self.category_names)
+
+    def contains(self, post: int, category: str) -> bool:
+        """
+        Check whether a post belongs to a category.
+
+        Args:
+            post (int): Post position.
+            category (str): Category name.
+
+        Returns:
+            bool: True if the post is in the category.
+        """
+        posts = self[category]
+        position = np.searchsorted(posts, post)
+        return bool(position < len(posts) and posts[position] == post)
+
+    def count(self, category: str) -> int:
+        """
+        Get the number of posts in a category.
+
+        Args:
+            category (str): Category name.
+
+        Returns:
+            int: Number of posts.
+        """
+        column = self._columns[category]
+        return int(self.matrix.indptr[column + 1] - self.matrix.indptr[column])
+
+    def counts(self) -> Dict[str, int]:
+        """
+        Get the number of posts in every category.
+
+        Returns:
+            Dict[str, int]: Category names mapped to post counts.
+        """
+        return dict(zip(self.category_names, np.diff(self.matrix.indptr).tolist()))
+
+    def post_categories(self, post: int) -> List[str]:
+        """
+        Get the categories a post belongs to.
+
+        Args:
+            post (int): Post position.
+
+        Returns:
+            List[str]: Category names, in column order.
+        """
+        if self._rows is None:
+            self._rows = self.matrix.tocsr()
+            self._rows.sort_indices()
+        columns = self._rows.indices[self._rows.indptr[post]:self._rows.indptr[post + 1]]
+        return [self.category_names[column] for column in columns]
+
+    def overlap(self, first: str, second: str) -> int:
+        """
+        Count the posts that belong to both categories.
+
+        Args:
+            first (str): Category name.
+            second (str): Category name.
+
+        Returns:
+            int: Number of shared posts.
+        """
+        return len(np.intersect1d(self[first], self[second], assume_unique=True))
+
+    def overlaps(self) -> pd.DataFrame:
+        """
+        Count shared posts for every pair of categories at once.
+
+        Returns:
+            pd.DataFrame: Symmetric category × category counts; the diagonal holds the category sizes.
+        """
+        counts = self.matrix.astype(np.int64)
+        return pd.DataFrame((counts.T @ counts).toarray(), index=self.category_names, columns=self.category_names)
+
+    def union(self, categories: Optional[Iterable[str]] = None) -> np.ndarray:
+        """
+        Get the posts that belong to at least one of the categories.
+
+        Args:
+            categories (Optional[Iterable[str]], optional): Category names. Defaults to all categories.
+
+        Returns:
+            np.ndarray: Sorted post positions.
+        """
+        if categories is None:
+            return np.unique(self.matrix.indices)
+        arrays = [self[category] for category in categories]
+        return np.unique(np.concatenate(arrays)) if arrays else np.array([], dtype=self.matrix.indices.dtype)
+
+    def intersection(self, categories: Iterable[str]) -> np.ndarray:
+        """
+        Get the posts that belong to all of the categories.
+
+        Args:
+            categories (Iterable[str]): Category names.
+
+        Returns:
+            np.ndarray: Sorted post positions.
+        """
+        result = None
+        for category in categories:
+            posts = self[category]
+            result = posts if result is None else np.intersect1d(result, posts, assume_unique=True)
+        return result if result is not None else np.array([], dtype=self.matrix.indices.dtype)
+
+    def filter(self, min_posts: int) -> "CategoryMembership":
+        """
+        Drop the categories with fewer than min_posts posts.
+
+        Args:
+            min_posts (int): Minimum number of posts a category needs to be kept.
+
+        Returns:
+            CategoryMembership: Membership matrix of the remaining categories.
+        """
+        keep = np.flatnonzero(np.diff(self.matrix.indptr) >= min_posts)
+        return CategoryMembership(self.matrix[:, keep], [self.category_names[column] for column in keep])
+
+    def save(self, path: str):
+        """
+        Save the matrix as a compressed .npz file. Only numpy is needed to read it back,
+        e.g. counts are np.diff(np.load(path)['indptr']).
+
+        Args:
+            path (str): Output path.
+        """
+        np.savez_compressed(
+            path,
+            categories=np.array(self.category_names, dtype=str),
+            indptr=self.matrix.indptr,
+            indices=self.matrix.indices,
+            shape=np.array(self.matrix.shape),
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "CategoryMembership":
+        """
+        Load a matrix saved with save().
+
+        Args:
+            path (str): Path to the .npz file.
+
+        Returns:
+            CategoryMembership: Membership matrix.
+        """
+        with np.load(path) as data:
+            indices = data['indices']
+            matrix = sparse.csc_matrix(
+                (np.ones(len(indices), dtype=bool), indices, data['indptr']), shape=tuple(data['shape'])
+            )
+            return cls(matrix, data['categories'].tolist())
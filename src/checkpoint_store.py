@@ -0,0 +1,287 @@
+import json
+import os
+import sqlite3
+import time
+from typing import List, Dict, Any, Iterable, Optional, Set
+
+import pandas as pd
+
+from dataset_writer import dataset_exists, is_parquet_path, load_dataset
+
+def dataset_key(dataset_path: str) -> str:
+    """
+    Key written question ids by the resolved dataset path, so "../data/x.csv" and
+    its absolute path share ids while the CSV and Parquet datasets do not.
+
+    Args:
+        dataset_path (str): Path to a combined dataset.
+
+    Returns:
+        str: Resolved absolute path.
+    """
+    return os.path.realpath(dataset_path)
+
+class CollectionCheckpoint:
+    """
+    Persistent checkpoint store for data collection, backed by a small SQLite file.
+    It records the last completed page per tag (with the questions from those pages)
+    and the ids of every question already written to each combined dataset, so an
+    interrupted collection resumes where it stopped without duplicating rows.
+    It also keeps a per-tag creation/activity watermark for incremental collection.
+    """
+
+    def __init__(self, db_path: str = "../data/collection_checkpoint.db"):
+        """
+        Open (or create) the checkpoint store.
+
+        Args:
+            db_path (str, optional): Path to the SQLite file. Defaults to "../data/collection_checkpoint.db".
+        """
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(db_path)
+        # Written ids used to be one global set. They cannot be attributed to a dataset,
+        # so drop them; seed_written_ids imports them again from the dataset itself.
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(written_questions)")]
+        if columns and 'dataset' not in columns:
+            self.conn.execute("DROP TABLE written_questions")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS tag_progress (
+                tag TEXT PRIMARY KEY,
+                last_page INTEGER NOT NULL,
+                has_more INTEGER NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS collected_questions (
+                tag TEXT NOT NULL,
+                question_id INTEGER NOT NULL,
+                page INTEGER NOT NULL,
+                data TEXT NOT NULL,
+                PRIMARY KEY (tag, question_id)
+            );
+            CREATE TABLE IF NOT EXISTS written_questions (
+                dataset TEXT NOT NULL,
+                question_id INTEGER NOT NULL,
+                PRIMARY KEY (dataset, question_id)
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS tag_watermarks (
+                tag TEXT PRIMARY KEY,
+                max_creation_date INTEGER,
+                max_activity_date INTEGER,
+                updated_at REAL NOT NULL
+            );
+        """)
+        self.conn.commit()
+
+    def close(self):
+        """Close the underlying database connection."""
+        self.conn.close()
+
+    def get_last_page(self, tag: str) -> int:
+        """
+        Get the last fully collected page for a tag.
+
+        Args:
+            tag (str): Tag being collected.
+
+        Returns:
+            int: Last completed page number, or 0 if collection has not started.
+        """
+        row = self.conn.execute("SELECT last_page FROM tag_progress WHERE tag = ?", (tag,)).fetchone()
+        return row[0] if row else 0
+
+    def has_more(self, tag: str) -> bool:
+        """
+        Check whether the API reported more pages after the last completed one.
+
+        Args:
+            tag (str): Tag being collected.
+
+        Returns:
+            bool: False once the last page for the tag has been collected.
+        """
+        row = self.conn.execute("SELECT has_more FROM tag_progress WHERE tag = ?", (tag,)).fetchone()
+        return bool(row[0]) if row else True
+
+    def save_page(self, tag: str, page: int, items: List[Dict[str, Any]], has_more: bool):
+        """
+        Record a completed page and its questions in a single transaction.
+
+        Args:
+            tag (str): Tag being collected.
+            page (int): Page number that was completed.
+            items (List[Dict[str, Any]]): Questions returned for the page.
+            has_more (bool): The API's has_more flag for the page.
+        """
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO collected_questions (tag, question_id, page, data) VALUES (?, ?, ?, ?)",
+                [(tag, item.get('question_id'), page, json.dumps(item)) for item in items]
+            )
+            self.conn.execute(
+                "INSERT OR REPLACE INTO tag_progress (tag, last_page, has_more, updated_at) VALUES (?, ?, ?, ?)",
+                (tag, page, int(has_more), time.time())
+            )
+
+    def load_questions(self, tag: str) -> List[Dict[str, Any]]:
+        """
+        Load the questions collected so far for a tag, in page order.
+
+        Args:
+            tag (str): Tag being collected.
+
+        Returns:
+            List[Dict[str, Any]]: Previously collected question data dictionaries.
+        """
+        rows = self.conn.execute(
+            "SELECT data FROM collected_questions WHERE tag = ? ORDER BY page, rowid", (tag,)
+        ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def reset_tag(self, tag: str):
+        """
+        Forget page progress for a tag so the next collection starts from page 1.
+        Written question ids are kept, since those rows are still in the dataset;
+        use clear_written to forget those of a dataset.
+
+        Args:
+            tag (str): Tag to reset.
+        """
+        with self.conn:
+            self.conn.execute("DELETE FROM tag_progress WHERE tag = ?", (tag,))
+            self.conn.execute("DELETE FROM collected_questions WHERE tag = ?", (tag,))
+
+    def get_watermark(self, tag: str) -> Optional[int]:
+        """
+        Get the incremental-collection watermark for a tag: the latest creation or
+        last-activity timestamp seen so far.
+
+        Args:
+            tag (str): Tag being collected.
+
+        Returns:
+            Optional[int]: Unix timestamp, or None if the tag has never been collected.
+        """
+        row = self.conn.execute(
+            "SELECT max_creation_date, max_activity_date FROM tag_watermarks WHERE tag = ?", (tag,)
+        ).fetchone()
+        if not row:
+            return None
+        dates = [date for date in row if date is not None]
+        return max(dates) if dates else None
+
+    def update_watermark(self, tag: str, questions: List[Dict[str, Any]], dataset_path: Optional[str] = None):
+        """
+        Advance a tag's watermark to the newest creation/activity dates in `questions`.
+        Incremental runs fetch questions oldest activity first, so this is the last
+        question fetched even when max_questions cut the run short.
+        The watermark never moves backwards.
+
+        Args:
+            tag (str): Tag being collected.
+            questions (List[Dict[str, Any]]): Questions that were fetched for the dataset.
+            dataset_path (str, optional): Combined dataset. If given, the watermark stops at the
+                                          oldest question not written to it (e.g. because its answers
+                                          could not be fetched), so the next run fetches it again.
+                                          Defaults to None.
+        """
+        creation_dates = [int(q['creation_date']) for q in questions if pd.notna(q.get('creation_date'))]
+        activity_dates = [int(q['last_activity_date']) for q in questions if pd.notna(q.get('last_activity_date'))]
+        if not creation_dates and not activity_dates:
+            return
+
+        if dataset_path is not None:
+            written = self.written_ids(dataset_path)
+            pending_dates = []
+            for q in questions:
+                if pd.isna(q.get('question_id')) or int(q['question_id']) in written:
+                    continue
+                date = q.get('last_activity_date') if pd.notna(q.get('last_activity_date')) else q.get('creation_date')
+                if pd.notna(date):
+                    pending_dates.append(int(date))
+            # The API's min bound is inclusive, so a watermark at that date refetches the question
+            if pending_dates:
+                cap = min(pending_dates)
+                creation_dates = [min(date, cap) for date in creation_dates]
+                activity_dates = [min(date, cap) for date in activity_dates]
+
+        row = self.conn.execute(
+            "SELECT max_creation_date, max_activity_date FROM tag_watermarks WHERE tag = ?", (tag,)
+        ).fetchone()
+        max_creation = max(creation_dates + ([row[0]] if row and row[0] is not None else []), default=None)
+        max_activity = max(activity_dates + ([row[1]] if row and row[1] is not None else []), default=None)
+
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO tag_watermarks (tag, max_creation_date, max_activity_date, updated_at) VALUES (?, ?, ?, ?)",
+                (tag, max_creation, max_activity, time.time())
+            )
+
+    def written_ids(self, dataset_path: str) -> Set[int]:
+        """
+        Get the ids of all questions already written to a dataset.
+
+        Args:
+            dataset_path (str): Path to the combined dataset.
+
+        Returns:
+            Set[int]: Written question ids.
+        """
+        return {row[0] for row in self.conn.execute(
+            "SELECT question_id FROM written_questions WHERE dataset = ?", (dataset_key(dataset_path),)
+        )}
+
+    def mark_written(self, dataset_path: str, question_ids: Iterable[int]):
+        """
+        Record question ids as written to a dataset. Call this after the rows have been flushed.
+
+        Args:
+            dataset_path (str): Path to the combined dataset.
+            question_ids (Iterable[int]): Ids of the rows that were written.
+        """
+        dataset = dataset_key(dataset_path)
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO written_questions (dataset, question_id) VALUES (?, ?)",
+                [(dataset, int(question_id)) for question_id in question_ids]
+            )
+
+    def clear_written(self, dataset_path: str):
+        """
+        Forget the written question ids of a dataset, e.g. when it was deleted or is
+        being collected again. The next seed_written_ids call re-imports whatever the
+        dataset still contains.
+
+        Args:
+            dataset_path (str): Path to the combined dataset.
+        """
+        with self.conn:
+            self.conn.execute("DELETE FROM written_questions WHERE dataset = ?", (dataset_key(dataset_path),))
+
+    def seed_written_ids(self, dataset_path: str):
+        """
+        Sync the written ids of a dataset with the dataset itself. Ids of a dataset
+        that no longer exists are cleared. Otherwise, if no ids are recorded for it yet,
+        they are imported from the dataset (CSV or Parquet), so datasets written before
+        the checkpoint store existed are deduplicated too.
+
+        Args:
+            dataset_path (str): Path to the combined dataset.
+        """
+        if not dataset_exists(dataset_path):
+            self.clear_written(dataset_path)
+            return
+        if self.conn.execute("SELECT 1 FROM written_questions WHERE dataset = ? LIMIT 1",
+                             (dataset_key(dataset_path),)).fetchone():
+            return
+
+        try:
+            if is_parquet_path(dataset_path):
+                chunks = [load_dataset(dataset_path, columns=['question_id'])]
+            else:
+                chunks = pd.read_csv(dataset_path, usecols=['question_id'], chunksize=10000)
+            for chunk in chunks:
+                self.mark_written(dataset_path, chunk['question_id'].dropna())
+            print(f"Seeded checkpoint with question ids from {dataset_path}")
+        except Exception as e:
+            print(f"Error seeding checkpoint from {dataset_path}: {e}")
@@ -10,16 +10,10 @@ TAGS=("nlp" "python" "machine-learning" "tensorflow" "pytorch" "nltk")
 # Set the maximum number of questions per tag collection run
 MAX_QUESTIONS=500
 
-# Loop through each tag in the TAGS array
-for TAG in "${TAGS[@]}"
-do
-  echo "=== Starting data collection for tag: $TAG ==="
-  # Execute your main.py script for the current tag
-  python main.py --api-key "$API_KEY" --max-questions "$MAX_QUESTIONS" --tag "$TAG" --force-collection
-
-  # Optional: Add a small delay between collecting data for different tags
-  # This can help avoid hitting API limits if the script finishes very quickly
-  # sleep 5
-done
+# Collect all tags concurrently in a single run. Requests share one rate limiter,
+# and questions tagged with several of these tags are only stored once.
+TAG_LIST=$(IFS=,; echo "${TAGS[*]}")
+echo "=== Starting data collection for tags: $TAG_LIST ==="
+python main.py --api-key "$API_KEY" --max-questions "$MAX_QUESTIONS" --tags "$TAG_LIST" --force-collection
 
 echo "=== Finished data collection for all specified tags ==="
@@ -2,31 +2,66 @@ import requests
 import pandas as pd
 import time
 import os
-from typing import List, Dict, Any
+import sys
+from typing import List, Dict, Any, Optional, Tuple
 import csv # Import the csv library
 
+from checkpoint_store import CollectionCheckpoint
+from http_transport import HttpTransport
+from dataset_writer import open_dataset_writer, write_rows, load_dataset, is_parquet_path
+
+# Root of the Stack Exchange API
+API_BASE_URL = "https://api.stackexchange.com/2.3"
+
+# Question metadata columns saved by the intermediate dumps in get_questions
+INTERMEDIATE_FIELDNAMES = ['question_id', 'title', 'body', 'tags', 'creation_date', 'view_count', 'score', 'answer_count', 'is_answered']
+
+# Retries for a failed batch of answer requests
+ANSWER_RETRIES = 3
+
+# Rows written between flushes of the dataset writer (one Parquet part file each)
+FLUSH_EVERY = 1000
+
+# Columns of the combined dataset CSV, in output order
+DATASET_FIELDNAMES = ['question_id', 'title', 'description', 'tags', 'creation_date', 'view_count', 'score', 'answer_count', 'is_answered', 'accepted_answer', 'other_answers']
+
 class StackOverflowDataCollector:
     """
     A class to collect NLP-related posts from Stack Overflow using the Stack Exchange API.
     """
 
-    def __init__(self, api_key: str = None):
+    def __init__(self, api_key: str = None, checkpoint: Optional[CollectionCheckpoint] = None,
+                 transport: Optional[HttpTransport] = None, base_url: str = API_BASE_URL,
+                 output_format: str = "csv"):
         """
         Initialize the collector with an API key.
         Args:
             api_key (str, optional): Stack Exchange API key. Defaults to None.
+            checkpoint (CollectionCheckpoint, optional): Checkpoint store used to resume interrupted
+                                                         collections and skip already written questions.
+                                                         Defaults to None (no checkpointing).
+            transport (HttpTransport, optional): HTTP layer used for all requests, e.g. to record or
+                                                 replay responses. Defaults to a passthrough transport.
+            base_url (str, optional): API root, e.g. a local stand-in server. Defaults to the live API.
+            output_format (str, optional): Format of the intermediate dumps, "csv" or "parquet". Defaults to "csv".
         """
-        self.base_url = "https://api.stackexchange.com/2.3"
+        self.base_url = base_url
+        self.output_format = output_format
+        self.transport = transport or HttpTransport()
         self.api_key = api_key
         self.backoff_time = 1 # Initial backoff time
+        self.checkpoint = checkpoint
 
-    def get_questions(self, tag: str = "nlp", page_size: int = 100, max_questions: int = 20000) -> List[Dict[str, Any]]:
+    def get_questions(self, tag: str = "nlp", page_size: int = 100, max_questions: int = 20000,
+                      since: Optional[int] = None) -> List[Dict[str, Any]]:
         """
         Collect questions with specified tag from Stack Overflow.
         Args:
             tag (str, optional): Tag to filter questions. Defaults to "nlp".
             page_size (int, optional): Number of items per page. Defaults to 100.
             max_questions (int, optional): Maximum number of questions to retrieve. Defaults to 20000.
+            since (int, optional): Only fetch questions created or edited at or after this Unix
+                                   timestamp, oldest activity first. Defaults to None (newest questions by creation).
 
         Returns:
             List[Dict[str, Any]]: List of question data dictionaries.
@@ -38,31 +73,26 @@ class StackOverflowDataCollector:
         # Create data directory if it doesn't exist
         os.makedirs("../data", exist_ok=True)
 
-        print(f"Collecting questions with tag [{tag}]...")
+        # Resume from the last completed page if a checkpoint exists for this tag.
+        # Incremental (since) runs are short and are always fetched from page 1.
+        if self.checkpoint and since is None:
+            questions, page, has_more = self._resume_questions(tag)
+
+        if since is None:
+            print(f"Collecting questions with tag [{tag}]...")
+        else:
+            print(f"Collecting questions with tag [{tag}] active since {since}...")
 
         while has_more and len(questions) < max_questions:
             # Construct API URL
             url = f"{self.base_url}/questions"
 
             # Define parameters
-            params = {
-                'page': page,
-                'pagesize': page_size,
-                'order': 'desc',
-                'sort': 'creation', # Changed to 'creation'
-                'tagged': tag,
-                'site': 'stackoverflow',
-                'filter': '!-*jbN-o8P3E5', # Default filter with some enhancements
-            }
-
-            if self.api_key:
-                params['key'] = self.api_key
+            params = self._questions_params(tag, page, page_size, since)
 
             # Make API request
             try:
-                response = requests.get(url, params=params)
-                response.raise_for_status()
-                data = response.json()
+                data = self.transport.get_json(url, params)
 
                 # Extract questions
                 items = data.get('items', [])
@@ -73,32 +103,19 @@ class StackOverflowDataCollector:
                 # Check if there are more pages
                 has_more = data.get('has_more', False)
 
+                # Record the completed page so an interrupted run resumes after it
+                if self.checkpoint and since is None:
+                    self.checkpoint.save_page(tag, page, items, has_more)
+
                 # Update page number
                 page += 1
 
                 # Respect API quota and avoid throttling
-                if 'backoff' in data:
-                    self.backoff_time = data['backoff']
-                    print(f"API backoff requested. Waiting for {self.backoff_time} seconds...")
-                    time.sleep(self.backoff_time)
-                else:
-                    time.sleep(1) # Be nice to the API
+                self._respect_rate_limit(data)
 
                 # Save intermediate results every 1000 questions
                 if len(questions) % 1000 == 0:
-                    print(f"Saving intermediate result with {len(questions)} questions...")
-                    intermediate_df = pd.DataFrame({
-                        'question_id': [q.get('question_id') for q in questions],
-                        'title': [q.get('title') for q in questions],
-                        'body': [q.get('body') for q in questions],
-                        'tags': [q.get('tags') for q in questions],
-                        'creation_date': [q.get('creation_date') for q in questions],
-                        'view_count': [q.get('view_count') for q in questions],
-                        'score': [q.get('score') for q in questions],
-                        'answer_count': [q.get('answer_count') for q in questions],
-                        'is_answered': [q.get('is_answered') for q in questions],
-                    })
-                    intermediate_df.to_csv(f"../data/{tag}_questions_intermediate_{len(questions)}.csv", index=False) # Added tag to intermediate filename
+                    self._save_intermediate(questions, tag)
 
 
             except requests.exceptions.RequestException as e:
@@ -113,78 +130,269 @@ class StackOverflowDataCollector:
         print(f"Collected a total of {len(questions)} questions.")
         return questions
 
-    def get_answers_for_question(self, question_id: int) -> List[Dict[str, Any]]:
+    def _respect_rate_limit(self, data: Dict[str, Any], context: str = ""):
         """
-        Get all answers for a specific question.
+        Wait after a request: honor the API's backoff field, otherwise pause for a second.
+        The fixed pause is skipped when responses are replayed from the cache.
+
         Args:
-            question_id (int): ID of the question.
-        Returns:
-            List[Dict[str, Any]]: List of answer data dictionaries.
+            data (Dict[str, Any]): Decoded API response.
+            context (str, optional): Text appended to the backoff message. Defaults to "".
         """
-        url = f"{self.base_url}/questions/{question_id}/answers"
+        if 'backoff' in data:
+            self.backoff_time = data['backoff']
+            print(f"API backoff requested{context}. Waiting for {self.backoff_time} seconds...")
+            time.sleep(self.backoff_time)
+        elif not self.transport.offline:
+            time.sleep(1) # Be nice to the API
+
+    def _questions_params(self, tag: str, page: int, page_size: int, since: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Build the query parameters for one page of /questions.
+
+        Args:
+            tag (str): Tag to filter questions.
+            page (int): Page number.
+            page_size (int): Number of items per page.
+            since (int, optional): Activity watermark (Unix timestamp) for incremental runs. Defaults to None.
 
+        Returns:
+            Dict[str, Any]: Query parameters.
+        """
         params = {
+            'page': page,
+            'pagesize': page_size,
             'order': 'desc',
-            'sort': 'votes',
+            'sort': 'creation', # Changed to 'creation'
+            'tagged': tag,
             'site': 'stackoverflow',
             'filter': '!-*jbN-o8P3E5', # Default filter with some enhancements
         }
 
+        # With sort=activity, min bounds last_activity_date, which covers new and edited questions.
+        # Oldest first, so a run cut off at max_questions leaves only newer changes for the next one.
+        if since is not None:
+            params['sort'] = 'activity'
+            params['order'] = 'asc'
+            params['min'] = int(since)
+
         if self.api_key:
             params['key'] = self.api_key
 
-        try:
-            response = requests.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
+        return params
 
-            # Check for backoff in answer requests and wait
-            if 'backoff' in data:
-                self.backoff_time = data['backoff']
-                print(f"API backoff requested during answer fetching. Waiting for {self.backoff_time} seconds...")
-                time.sleep(self.backoff_time)
-            else:
-                time.sleep(1) # Be nice to the API between answer calls
+    def _resume_questions(self, tag: str):
+        """
+        Load checkpointed progress for a tag.
+
+        Args:
+            tag (str): Tag being collected.
+
+        Returns:
+            Tuple[List[Dict[str, Any]], int, bool]: Questions collected so far, next page to fetch,
+                                                    and whether more pages remain.
+        """
+        questions = self.checkpoint.load_questions(tag)
+        last_page = self.checkpoint.get_last_page(tag)
+        has_more = self.checkpoint.has_more(tag)
+        if last_page:
+            print(f"Resuming tag [{tag}] after page {last_page} with {len(questions)} questions already collected.")
+        return questions, last_page + 1, has_more
+
+    def _save_intermediate(self, questions: List[Dict[str, Any]], tag: str):
+        """
+        Save the question metadata collected so far to an intermediate file, in the
+        collector's output format.
+
+        Args:
+            questions (List[Dict[str, Any]]): Questions collected so far.
+            tag (str): Tag the questions were collected for.
+        """
+        print(f"Saving intermediate result with {len(questions)} questions...")
+        extension = "parquet" if self.output_format == "parquet" else "csv"
+        output_path = f"../data/{tag}_questions_intermediate_{len(questions)}.{extension}" # Added tag to intermediate filename
+        write_rows(output_path, questions, INTERMEDIATE_FIELDNAMES)
+
+    def _get_answers_batch(self, question_ids: List[int]) -> Dict[int, List[Dict[str, Any]]]:
+        """
+        Fetch all answer pages for up to 100 questions with one /questions/{ids}/answers call per page.
+
+        Args:
+            question_ids (List[int]): IDs of the questions (at most 100).
+
+        Returns:
+            Dict[int, List[Dict[str, Any]]]: Answers grouped by question_id, sorted by votes (desc).
+
+        Raises:
+            requests.exceptions.RequestException: If a page request fails.
+        """
+        ids = ';'.join(str(question_id) for question_id in question_ids)
+        url = f"{self.base_url}/questions/{ids}/answers"
+        answers_by_question = {question_id: [] for question_id in question_ids}
+
+        page = 1
+        has_more = True
+        while has_more:
+            params = {
+                'page': page,
+                'pagesize': 100,
+                'order': 'desc',
+                'sort': 'votes',
+                'site': 'stackoverflow',
+                'filter': '!-*jbN-o8P3E5', # Default filter with some enhancements
+            }
+
+            if self.api_key:
+                params['key'] = self.api_key
+
+            data = self.transport.get_json(url, params)
+
+            # Group answers back by the question they belong to.
+            # Items come back sorted by votes, so each group keeps that order.
+            for answer in data.get('items', []):
+                answers_by_question.setdefault(answer.get('question_id'), []).append(answer)
+
+            has_more = data.get('has_more', False)
+            page += 1
+
+            self._respect_rate_limit(data, " during answer fetching")
+
+        return answers_by_question
+
+    def get_answers_for_questions(self, question_ids: List[int],
+                                  batch_size: int = 100) -> Tuple[Dict[int, List[Dict[str, Any]]], List[int]]:
+        """
+        Get answers for many questions using batched /questions/{ids}/answers calls.
+        The API accepts up to 100 semicolon-separated ids per request, so this needs
+        roughly one request per 100 questions instead of one per question.
+        A failed batch is retried up to ANSWER_RETRIES times with a growing wait.
+
+        Args:
+            question_ids (List[int]): IDs of the questions.
+            batch_size (int, optional): Number of ids per request (max 100). Defaults to 100.
+
+        Returns:
+            Tuple[Dict[int, List[Dict[str, Any]]], List[int]]: Answers grouped by question_id, each list
+                sorted by votes (desc), and the ids whose answers could not be fetched.
+        """
+        batch_size = max(1, min(batch_size, 100))
+        answers_by_question = {}
+        failed_ids = []
+
+        for start in range(0, len(question_ids), batch_size):
+            batch = question_ids[start:start + batch_size]
+
+            attempt = 0
+            while True:
+                try:
+                    answers_by_question.update(self._get_answers_batch(batch))
+                    break
+                except Exception as e:
+                    attempt += 1
+                    if attempt > ANSWER_RETRIES:
+                        print(f"Error getting answers for questions {batch[0]}..{batch[-1]}: {e}. Giving up on this batch.")
+                        failed_ids.extend(batch)
+                        break
+                    print(f"Error getting answers for questions {batch[0]}..{batch[-1]}: {e}. "
+                          f"Retrying ({attempt}/{ANSWER_RETRIES})...")
+                    time.sleep(5 * attempt) # Wait before retrying
+
+            print(f"Fetched answers for {min(start + batch_size, len(question_ids))}/{len(question_ids)} questions")
+
+        return answers_by_question, failed_ids
+
+    def _build_row(self, question: Dict[str, Any], answers: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Build a dataset row from a question and its answers.
+        The accepted answer is kept separately; up to 5 other answers are kept in vote order.
+
+        Args:
+            question (Dict[str, Any]): Question data dictionary.
+            answers (List[Dict[str, Any]]): Answers for the question, sorted by votes.
 
+        Returns:
+            Dict[str, Any]: Row data matching the dataset fieldnames.
+        """
+        accepted_answer = None
+        other_answers_list = []
 
-            return data.get('items', [])
+        for answer in answers:
+            if answer.get('is_accepted', False):
+                accepted_answer = answer.get('body', '')
+            else:
+                other_answers_list.append(answer.get('body', ''))
+
+        return {
+            'question_id': question.get('question_id'),
+            'title': question.get('title', ''),
+            'description': question.get('body', ''),
+            'tags': question.get('tags', []),
+            'creation_date': question.get('creation_date'),
+            'view_count': question.get('view_count'),
+            'score': question.get('score'),
+            'answer_count': question.get('answer_count'),
+            'is_answered': question.get('is_answered'),
+            'accepted_answer': accepted_answer,
+            'other_answers': other_answers_list[:5] # Include up to 5 additional answers
+        }
 
-        except requests.exceptions.RequestException as e:
-            print(f"Error getting answers for question {question_id}: {e}")
-            # Implement retry logic or return empty list on failure
-            return []
+    def _filter_written(self, questions: List[Dict[str, Any]], output_path: str) -> List[Dict[str, Any]]:
+        """
+        Drop questions that are already in the dataset according to the checkpoint,
+        as well as duplicate ids within the list itself.
 
-        except Exception as e:
-            print(f"Unexpected error getting answers for question {question_id}: {e}")
-            return []
+        Args:
+            questions (List[Dict[str, Any]]): Questions to be written.
+            output_path (str): Path of the dataset. Call this before the writer creates it,
+                               so the ids of a deleted dataset are cleared instead of trusted.
 
+        Returns:
+            List[Dict[str, Any]]: Questions that still need to be written.
+        """
+        if not self.checkpoint:
+            return questions
+
+        self.checkpoint.seed_written_ids(output_path)
+        seen = self.checkpoint.written_ids(output_path)
+        remaining = []
+        for question in questions:
+            question_id = question.get('question_id')
+            if question_id in seen:
+                continue
+            seen.add(question_id)
+            remaining.append(question)
+
+        if len(remaining) < len(questions):
+            print(f"Skipping {len(questions) - len(remaining)} questions already in the dataset.")
+        return remaining
 
     # Modified create_dataset to accept filename and save incrementally
-    def create_dataset(self, questions: List[Dict[str, Any]], filename: str = "nlp_stackoverflow_dataset.csv"):
+    def create_dataset(self, questions: List[Dict[str, Any]], filename: str = "nlp_stackoverflow_dataset.csv",
+                       batch_answers: bool = True, batch_size: int = 100):
         """
         Create a DataFrame with questions and their accepted answers and save incrementally to a CSV file.
         Args:
             questions (List[Dict[str, Any]]): List of question data dictionaries.
             filename (str, optional): Output filename to save the dataset. Defaults to "nlp_stackoverflow_dataset.csv".
+            batch_answers (bool, optional): Fetch answers for up to batch_size questions per request.
+                                            False sends one request per question, through the same
+                                            batched call with retries. Defaults to True.
+            batch_size (int, optional): Number of questions per batched answer request. Defaults to 100.
         """
         output_path = f"../data/{filename}"
         total_questions = len(questions)
         # Define the fieldnames for the CSV, including the new fields from API
-        fieldnames = ['question_id', 'title', 'description', 'tags', 'creation_date', 'view_count', 'score', 'answer_count', 'is_answered', 'accepted_answer', 'other_answers']
+        fieldnames = DATASET_FIELDNAMES
 
 
-        # Check if file exists to decide whether to write header
-        # Write header if the file does not exist or is empty
-        write_header = not os.path.exists(output_path) or os.path.getsize(output_path) == 0
-
-        # Open the file in append mode ('a')
-        # use newline='' to prevent extra blank rows in CSV
-        # use encoding='utf-8' to handle various characters
-        with open(output_path, 'a', newline='', encoding='utf-8') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+        # The writer appends to the dataset, creating it (and the CSV header) if needed.
+        # A ".parquet" filename streams Arrow record batches into a Parquet dataset instead.
+        # Skip questions already written by an earlier (possibly interrupted) run
+        questions = self._filter_written(questions, output_path)
+        total_questions = len(questions)
 
-            if write_header:
-                writer.writeheader()
+        with open_dataset_writer(output_path, fieldnames) as writer:
+            if writer.created:
                 print(f"Created new dataset file: {output_path}")
             else:
                 print(f"Appending to existing dataset file: {output_path}")
@@ -192,58 +400,163 @@ class StackOverflowDataCollector:
 
             print(f"Starting to process questions and save incrementally to {output_path}")
 
-            # Optional: Add logic here to skip questions already in the file if rerunning
-            # This is more complex as it requires reading the existing file's IDs first.
-            # For now, it will process all questions and append, which might create duplicates
-            # if you rerun after an interruption without clearing the file.
-
-            for i, question in enumerate(questions):
-                question_id = question.get('question_id')
-                # You could add a check here if question_id is already in the CSV
-                # For example, load existing IDs into a set before the loop.
-
-                print(f"Processing question {i+1}/{total_questions}: {question_id}")
-
-                # Get answers for this question
-                answers = self.get_answers_for_question(question_id)
-
-                accepted_answer = None
-                other_answers_list = []
-
-                for answer in answers:
-                    if answer.get('is_accepted', False):
-                        accepted_answer = answer.get('body', '')
-                    else:
-                        other_answers_list.append(answer.get('body', ''))
-
-                # Prepare the data row as a dictionary
-                row_data = {
-                    'question_id': question_id,
-                    'title': question.get('title', ''),
-                    'description': question.get('body', ''),
-                    'tags': question.get('tags', []),
-                    'creation_date': question.get('creation_date'),
-                    'view_count': question.get('view_count'),
-                    'score': question.get('score'),
-                    'answer_count': question.get('answer_count'),
-                    'is_answered': question.get('is_answered'),
-                    'accepted_answer': accepted_answer,
-                    'other_answers': other_answers_list[:5] # Include up to 5 additional answers
-                }
-
-                # Write the row to the CSV
-                try:
-                    writer.writerow(row_data)
-                    # Optional: Flush the buffer to ensure data is written to disk more frequently
-                    # This can be useful if you are worried about losing data on sudden interruption
-                    # csvfile.flush()
-                except Exception as e:
-                    print(f"Error writing row for question {question_id}: {e}")
+            # Batched mode fetches answers one chunk of questions at a time and writes
+            # that chunk before moving on, so progress is still saved incrementally.
+            chunk_size = batch_size if batch_answers else 1
+            unflushed_ids = []
+            skipped = 0
 
+            for chunk_start in range(0, total_questions, chunk_size):
+                chunk = questions[chunk_start:chunk_start + chunk_size]
 
+                if batch_answers:
+                    print(f"Processing questions {chunk_start+1}-{chunk_start+len(chunk)}/{total_questions}")
+                else:
+                    print(f"Processing question {chunk_start+1}/{total_questions}: {chunk[0].get('question_id')}")
+                answers_by_question, failed_ids = self.get_answers_for_questions(
+                    [question.get('question_id') for question in chunk], batch_size=chunk_size
+                )
+                skipped += len(failed_ids)
+
+                for question in chunk:
+                    question_id = question.get('question_id')
+
+                    # Rows are only written once their answers were fetched, so the next run retries them
+                    if question_id not in answers_by_question:
+                        continue
+
+                    # Prepare the data row as a dictionary
+                    row_data = self._build_row(question, answers_by_question[question_id])
+
+                    # Write the row to the dataset
+                    try:
+                        writer.write_row(row_data)
+                        unflushed_ids.append(question_id)
+                    except Exception as e:
+                        print(f"Error writing row for question {question_id}: {e}")
+
+                if len(unflushed_ids) >= FLUSH_EVERY or chunk_start + chunk_size >= total_questions:
+                    self._flush_written(writer, unflushed_ids)
+                    unflushed_ids = []
+
+        if skipped:
+            print(f"Skipped {skipped} questions whose answers could not be fetched. They will be retried on the next run.")
         print(f"Finished processing questions. Data saved to {output_path}")
 
 
+    def _flush_written(self, writer, question_ids: List[int]):
+        """
+        Make written rows durable, then record them in the checkpoint.
+        Ids are only marked once their rows are on disk.
+
+        Args:
+            writer (CsvRowWriter or ParquetRowWriter): Dataset writer.
+            question_ids (List[int]): Ids of the rows written since the last flush.
+        """
+        writer.flush()
+        if self.checkpoint and question_ids:
+            self.checkpoint.mark_written(writer.path, question_ids)
+
+    def upsert_dataset(self, questions: List[Dict[str, Any]], filename: str = "nlp_stackoverflow_dataset.csv",
+                       batch_size: int = 100):
+        """
+        Fetch answers for new or changed questions and upsert them into the dataset CSV.
+        Rows with an existing question_id are replaced in place; new ones are appended.
+        Questions whose answers could not be fetched are left out.
+
+        Args:
+            questions (List[Dict[str, Any]]): New or changed question data dictionaries.
+            filename (str, optional): Dataset filename. Defaults to "nlp_stackoverflow_dataset.csv".
+            batch_size (int, optional): Number of questions per batched answer request. Defaults to 100.
+
+        Returns:
+            List[int]: Ids of the questions that were left out.
+        """
+        answers_by_question, failed_ids = self.get_answers_for_questions(
+            [question.get('question_id') for question in questions], batch_size=batch_size
+        )
+        rows = [self._build_row(question, answers_by_question[question.get('question_id')])
+                for question in questions if question.get('question_id') in answers_by_question]
+        if failed_ids:
+            print(f"Skipped {len(failed_ids)} questions whose answers could not be fetched.")
+        self._upsert_rows(rows, f"../data/{filename}")
+        return failed_ids
+
+    def _upsert_rows(self, rows: List[Dict[str, Any]], output_path: str):
+        """
+        Stream the dataset CSV into a temporary file, replacing rows whose question_id
+        is in `rows` and appending the rest, then atomically swap it into place.
+        Parquet datasets are rewritten the same way through a DataFrame.
+
+        Args:
+            rows (List[Dict[str, Any]]): Dataset rows to upsert.
+            output_path (str): Path to the dataset CSV or Parquet dataset.
+        """
+        if is_parquet_path(output_path):
+            self._upsert_parquet_rows(rows, output_path)
+            return
+
+        # Post bodies can exceed the csv module's default field size limit
+        csv.field_size_limit(min(sys.maxsize, 2**31 - 1))
+
+        if self.checkpoint:
+            self.checkpoint.seed_written_ids(output_path)
+
+        pending = {str(row['question_id']): row for row in rows}
+        updated = 0
+        tmp_path = output_path + ".tmp"
+
+        with open(tmp_path, 'w', newline='', encoding='utf-8') as outfile:
+            writer = csv.DictWriter(outfile, fieldnames=DATASET_FIELDNAMES)
+            writer.writeheader()
+
+            if os.path.exists(output_path) and os.path.getsize(output_path) > 0:
+                with open(output_path, 'r', newline='', encoding='utf-8') as infile:
+                    for existing in csv.DictReader(infile):
+                        replacement = pending.pop(existing.get('question_id'), None)
+                        if replacement is not None:
+                            updated += 1
+                        writer.writerow(replacement if replacement is not None else existing)
+
+            # Whatever is left did not exist in the dataset yet
+            for row in pending.values():
+                writer.writerow(row)
+
+        os.replace(tmp_path, output_path)
+
+        if self.checkpoint:
+            self.checkpoint.mark_written(output_path, (row['question_id'] for row in rows))
+
+        print(f"Upserted {len(rows)} questions into {output_path} ({updated} updated, {len(rows) - updated} new)")
+
+    def _upsert_parquet_rows(self, rows: List[Dict[str, Any]], output_path: str):
+        """
+        Replace or append rows in a Parquet dataset.
+
+        Args:
+            rows (List[Dict[str, Any]]): Dataset rows to upsert.
+            output_path (str): Path to the Parquet dataset.
+        """
+        if self.checkpoint:
+            self.checkpoint.seed_written_ids(output_path)
+
+        new_df = pd.DataFrame(rows, columns=DATASET_FIELDNAMES)
+        if os.path.isdir(output_path):
+            existing_df = load_dataset(output_path)
+            updated = int(existing_df['question_id'].isin(new_df['question_id']).sum())
+            existing_df = existing_df[~existing_df['question_id'].isin(new_df['question_id'])]
+            new_df = pd.concat([existing_df, new_df], ignore_index=True)
+        else:
+            updated = 0
+
+        # Rows go through the streaming writer so list columns keep their native type
+        write_rows(output_path, new_df.to_dict('records'), DATASET_FIELDNAMES)
+
+        if self.checkpoint:
+            self.checkpoint.mark_written(output_path, (row['question_id'] for row in rows))
+
+        print(f"Upserted {len(rows)} questions into {output_path} ({updated} updated, {len(rows) - updated} new)")
+
     def save_dataset(self, df: pd.DataFrame, filename: str = "nlp_dataset.csv"):
         """
         Save a full DataFrame to a CSV file.
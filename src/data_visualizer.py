@@ -3,11 +3,13 @@ import numpy as np
 import matplotlib.pyplot as plt
 from wordcloud import WordCloud
 import seaborn as sns
-from collections import Counter
 from datetime import datetime
 import os
 from typing import List, Dict, Any, Union, Tuple
 
+from dataset_writer import load_dataset
+from tag_index import load_tag_index
+
 plt.style.use('ggplot')
 
 class DataVisualizer:
@@ -20,10 +22,10 @@ class DataVisualizer:
         Initialize the visualizer with dataset path.
         
         Args:
-            data_path (str): Path to the preprocessed dataset.
+            data_path (str): Path to the preprocessed dataset (CSV or Parquet).
         """
         self.data_path = data_path
-        self.df = pd.read_csv(data_path)
+        self.df = load_dataset(data_path)
         
         # Create output directory for visualizations
         os.makedirs("../data/visualizations", exist_ok=True)
@@ -87,24 +89,8 @@ class DataVisualizer:
             print("Tags column not found.")
             return
         
-        # Get all tags and count them
-        all_tags = []
-        for tag_list in self.df['tags']:
-            try:
-                if isinstance(tag_list, str):
-                    # Convert string representation of list to actual list
-                    if tag_list.startswith('[') and tag_list.endswith(']'):
-                        tag_list = eval(tag_list)
-                    else:
-                        tag_list = tag_list.split()
-                
-                if isinstance(tag_list, list):
-                    all_tags.extend(tag_list)
-            except:
-                continue
-        
-        # Count tags
-        tag_counts = Counter(all_tags)
+        # Count tags, parsed once and cached next to the dataset
+        tag_counts = load_tag_index(self.data_path, self.df['tags']).counts()
         
         # Get top N tags
         top_tags = tag_counts.most_common(n)
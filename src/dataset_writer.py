@@ -0,0 +1,396 @@
+import ast
+import csv
+import glob
+import hashlib
+import os
+import shutil
+import time
+from typing import List, Dict, Any, Optional, Iterable, Iterator
+
+import pandas as pd
+
+# pyarrow is only needed for the Parquet format
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+# Columns holding lists of strings. Parquet stores them as native list columns;
+# CSV stores their Python repr, which load_dataset parses back safely.
+LIST_COLUMNS = ('tags', 'other_answers', 'processed_other_answers', 'processed_tags')
+
+# Arrow types of the known collector columns; anything else is stored as a string
+_INT_COLUMNS = ('question_id', 'creation_date', 'last_activity_date', 'view_count', 'score', 'answer_count')
+_BOOL_COLUMNS = ('is_answered',)
+
+
+def is_parquet_path(path: str) -> bool:
+    """
+    Check whether a dataset path refers to the Parquet format.
+
+    Args:
+        path (str): Dataset path.
+
+    Returns:
+        bool: True for ".parquet" paths (a directory of part files or a single file).
+    """
+    return path.rstrip('/').endswith('.parquet')
+
+
+def dataset_exists(path: str) -> bool:
+    """
+    Check whether a dataset exists and contains data.
+
+    Args:
+        path (str): Dataset path.
+
+    Returns:
+        bool: True if the CSV file is non-empty or the Parquet dataset has at least one part file.
+    """
+    if is_parquet_path(path) and os.path.isdir(path):
+        return bool(glob.glob(os.path.join(path, '*.parquet')))
+    return os.path.exists(path) and os.path.getsize(path) > 0
+
+
+def dataset_fingerprint(dataset_path: str) -> str:
+    """
+    Identify the current contents of a dataset by file sizes and modification times.
+
+    Args:
+        dataset_path (str): Dataset path (CSV file or Parquet dataset).
+
+    Returns:
+        str: Fingerprint that changes whenever the dataset is rewritten.
+    """
+    files = _parquet_files(dataset_path) if is_parquet_path(dataset_path) else [dataset_path]
+    digest = hashlib.sha256()
+    for path in files:
+        stat = os.stat(path)
+        digest.update(f"{os.path.basename(path)}:{stat.st_size}:{stat.st_mtime_ns}\n".encode('utf-8'))
+    return digest.hexdigest()
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError("The Parquet format requires pyarrow. Install it with `pip install pyarrow`.")
+
+
+def arrow_schema(fieldnames: List[str]):
+    """
+    Build the Arrow schema for a list of dataset columns.
+
+    Args:
+        fieldnames (List[str]): Column names in output order.
+
+    Returns:
+        pyarrow.Schema: Schema with native list columns for LIST_COLUMNS.
+    """
+    _require_pyarrow()
+    fields = []
+    for name in fieldnames:
+        if name in LIST_COLUMNS:
+            fields.append(pa.field(name, pa.list_(pa.string())))
+        elif name in _INT_COLUMNS:
+            fields.append(pa.field(name, pa.int64()))
+        elif name in _BOOL_COLUMNS:
+            fields.append(pa.field(name, pa.bool_()))
+        else:
+            fields.append(pa.field(name, pa.string()))
+    return pa.schema(fields)
+
+
+def parse_list_value(value: Any) -> List[Any]:
+    """
+    Convert a stored list value back into a Python list without eval.
+
+    Args:
+        value (Any): A list, a repr string such as "['nlp', 'python']", a
+                     space-separated string, or a missing value.
+
+    Returns:
+        List[Any]: The parsed list (empty for missing values).
+    """
+    if isinstance(value, list):
+        return value
+    if hasattr(value, 'tolist'):  # numpy arrays from Parquet
+        return value.tolist()
+    if not isinstance(value, str) or not value:
+        return []
+    if value.startswith('[') and value.endswith(']'):
+        try:
+            parsed = ast.literal_eval(value)
+            return list(parsed) if isinstance(parsed, (list, tuple)) else [parsed]
+        except (ValueError, SyntaxError):
+            return [item.strip(" '\"") for item in value.strip('[]').split(',') if item.strip(" '\"")]
+    return value.split()
+
+
+class CsvRowWriter:
+    """
+    Appends dataset rows to a CSV file, writing the header for new files.
+    """
+
+    def __init__(self, path: str, fieldnames: List[str]):
+        self.path = path
+        self.created = not dataset_exists(path)
+        self._file = open(path, 'a', newline='', encoding='utf-8')
+        self._writer = csv.DictWriter(self._file, fieldnames=fieldnames, extrasaction='ignore')
+        if self.created:
+            self._writer.writeheader()
+
+    def write_row(self, row: Dict[str, Any]):
+        self._writer.writerow(row)
+
+    def flush(self):
+        """Make every row written so far durable."""
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class ParquetRowWriter:
+    """
+    Buffers dataset rows into Arrow record batches and streams them into a Parquet
+    dataset directory. Every flush() publishes the rows written so far as a new part
+    file, so appending to an existing dataset never rewrites earlier data and a crash
+    only loses rows that were not flushed yet.
+    """
+
+    def __init__(self, path: str, fieldnames: List[str], batch_size: int = 1000):
+        """
+        Initialize the writer.
+
+        Args:
+            path (str): Dataset directory (ending in ".parquet").
+            fieldnames (List[str]): Column names in output order.
+            batch_size (int, optional): Rows buffered per record batch. Defaults to 1000.
+        """
+        self.path = path
+        self.fieldnames = fieldnames
+        self.batch_size = batch_size
+        self.schema = arrow_schema(fieldnames)
+        self.created = not dataset_exists(path)
+        os.makedirs(path, exist_ok=True)
+
+        self._writer = None
+        self._part_path = None
+        self._tmp_path = None
+        self._buffer = []
+
+    def _normalize(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        normalized = {}
+        for name in self.fieldnames:
+            value = row.get(name)
+            if name in LIST_COLUMNS:
+                value = [str(item) for item in parse_list_value(value) if item is not None]
+            elif value is not None and pd.isna(value):
+                value = None
+            elif value is not None and name not in _INT_COLUMNS and name not in _BOOL_COLUMNS:
+                value = str(value)
+            normalized[name] = value
+        return normalized
+
+    def _write_buffer(self):
+        if not self._buffer:
+            return
+        if self._writer is None:
+            self._part_path = os.path.join(self.path, f"part-{time.time_ns()}.parquet")
+            # Hidden until published: dataset readers skip files starting with "."
+            self._tmp_path = os.path.join(self.path, f".{os.path.basename(self._part_path)}.tmp")
+            self._writer = pq.ParquetWriter(self._tmp_path, self.schema)
+        self._writer.write_batch(pa.RecordBatch.from_pylist(self._buffer, schema=self.schema))
+        self._buffer = []
+
+    def write_row(self, row: Dict[str, Any]):
+        self._buffer.append(self._normalize(row))
+        if len(self._buffer) >= self.batch_size:
+            self._write_buffer()
+
+    def flush(self):
+        """Publish every row written so far as a complete part file."""
+        self._write_buffer()
+        if self._writer is not None:
+            self._writer.close()
+            os.replace(self._tmp_path, self._part_path)
+            self._writer = None
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def open_dataset_writer(path: str, fieldnames: List[str], batch_size: int = 1000):
+    """
+    Open a streaming row writer for the format implied by the path.
+
+    Args:
+        path (str): Dataset path (".parquet" for Parquet, anything else for CSV).
+        fieldnames (List[str]): Column names in output order.
+        batch_size (int, optional): Rows per Parquet record batch. Defaults to 1000.
+
+    Returns:
+        CsvRowWriter or ParquetRowWriter: Writer with write_row, flush and close methods.
+                                          Rows are only durable once flush() or close() returns.
+    """
+    if is_parquet_path(path):
+        return ParquetRowWriter(path, fieldnames, batch_size=batch_size)
+    return CsvRowWriter(path, fieldnames)
+
+
+def write_rows(path: str, rows: List[Dict[str, Any]], fieldnames: List[str]):
+    """
+    Write a complete set of rows, atomically replacing any existing dataset at the path.
+
+    Args:
+        path (str): Dataset path.
+        rows (List[Dict[str, Any]]): Rows to write.
+        fieldnames (List[str]): Column names in output order.
+    """
+    tmp_path = path.rstrip('/') + ".tmp"
+    if is_parquet_path(path):
+        shutil.rmtree(tmp_path, ignore_errors=True)
+    elif os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    with ParquetRowWriter(tmp_path, fieldnames) if is_parquet_path(path) else CsvRowWriter(tmp_path, fieldnames) as writer:
+        for row in rows:
+            writer.write_row(row)
+
+    if is_parquet_path(path):
+        shutil.rmtree(path, ignore_errors=True)
+    os.replace(tmp_path, path)
+
+
+def load_dataset(path: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Load a dataset written by the collector or preprocessor. List columns come back
+    as Python lists for both formats.
+
+    Args:
+        path (str): Dataset path (CSV file or Parquet dataset).
+        columns (List[str], optional): Only load these columns. Defaults to None (all).
+
+    Returns:
+        pd.DataFrame: Loaded dataset.
+    """
+    if is_parquet_path(path):
+        _require_pyarrow()
+        df = pd.read_parquet(path, columns=columns)
+    else:
+        df = pd.read_csv(path, usecols=columns)
+
+    return _parse_list_columns(df)
+
+
+def _parse_list_columns(df: pd.DataFrame) -> pd.DataFrame:
+    for column in LIST_COLUMNS:
+        if column in df.columns:
+            df[column] = df[column].map(parse_list_value)
+    return df
+
+
+def _parquet_files(path: str) -> List[str]:
+    if os.path.isdir(path):
+        # Part names carry their creation time, so name order is write order
+        return sorted(glob.glob(os.path.join(path, '*.parquet')))
+    return [path]
+
+
+def iter_dataset(path: str, chunksize: int = 5000, columns: Optional[List[str]] = None) -> Iterator[pd.DataFrame]:
+    """
+    Read a dataset in chunks of at most `chunksize` rows, so only one chunk is held
+    in memory at a time. List columns come back as Python lists for both formats.
+
+    Args:
+        path (str): Dataset path (CSV file or Parquet dataset).
+        chunksize (int, optional): Maximum rows per chunk. Defaults to 5000.
+        columns (List[str], optional): Only load these columns. Defaults to None (all).
+
+    Yields:
+        pd.DataFrame: Consecutive chunks in file order, indexed by row position in the dataset.
+    """
+    if not is_parquet_path(path):
+        for chunk in pd.read_csv(path, usecols=columns, chunksize=chunksize):
+            yield _parse_list_columns(chunk)
+        return
+
+    _require_pyarrow()
+    offset = 0
+    for part_path in _parquet_files(path):
+        for batch in pq.ParquetFile(part_path).iter_batches(batch_size=chunksize, columns=columns):
+            chunk = batch.to_pandas()
+            chunk.index = pd.RangeIndex(offset, offset + len(chunk))
+            offset += len(chunk)
+            yield _parse_list_columns(chunk)
+
+
+def write_chunks(path: str, chunks: Iterable[pd.DataFrame]) -> int:
+    """
+    Stream DataFrame chunks into a new dataset, atomically replacing any existing
+    dataset at the path once every chunk has been written. Each chunk is written
+    as soon as it arrives, so memory use is bounded by the chunk size.
+
+    Args:
+        path (str): Output path (".parquet" for a Parquet dataset, anything else for CSV).
+        chunks (Iterable[pd.DataFrame]): Chunks with the same columns, in output order.
+
+    Returns:
+        int: Number of rows written.
+    """
+    tmp_path = path.rstrip('/') + ".tmp"
+    if is_parquet_path(path):
+        _require_pyarrow()
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        os.makedirs(tmp_path)
+    else:
+        open(tmp_path, 'w').close()
+
+    rows = 0
+    for number, chunk in enumerate(chunks):
+        if is_parquet_path(path):
+            # Pin the schema so chunks with all-missing values still match the others
+            table = pa.Table.from_pandas(chunk, schema=arrow_schema(list(chunk.columns)), preserve_index=False)
+            pq.write_table(table, os.path.join(tmp_path, f"part-{number:06d}.parquet"))
+        else:
+            chunk.to_csv(tmp_path, mode='a', header=(number == 0), index=False)
+        rows += len(chunk)
+
+    if is_parquet_path(path):
+        shutil.rmtree(path, ignore_errors=True)
+    os.replace(tmp_path, path)
+    return rows
+
+
+def save_dataframe(df: pd.DataFrame, path: str):
+    """
+    Save a full DataFrame in the format implied by the path.
+
+    Args:
+        df (pd.DataFrame): DataFrame to save.
+        path (str): Output path (".parquet" for a Parquet dataset, anything else for CSV).
+    """
+    if not is_parquet_path(path):
+        df.to_csv(path, index=False)
+        return
+
+    _require_pyarrow()
+    tmp_path = path.rstrip('/') + ".tmp"
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)
+    df.to_parquet(os.path.join(tmp_path, "part-0.parquet"), index=False)
+    shutil.rmtree(path, ignore_errors=True)
+    os.replace(tmp_path, path)
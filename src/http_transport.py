@@ -0,0 +1,198 @@
+import hashlib
+import json
+import os
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+
+# Transport modes
+PASSTHROUGH = "passthrough"  # Always use the network, never touch the cache
+RECORD = "record"            # Use the network and store every successful response
+REPLAY = "replay"            # Serve responses from the cache only, never use the network
+MODES = (PASSTHROUGH, RECORD, REPLAY)
+
+# Parameters that do not change the response and must not end up on disk
+IGNORED_PARAMS = {'key', 'access_token'}
+
+
+class CacheMissError(Exception):
+    """
+    Raised in replay mode when no recorded response exists for a request.
+    """
+
+
+def cache_key(url: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Build the content address of a request from its URL path and parameters.
+    The host is left out so fixtures recorded against the live API can be
+    served by the local stand-in server.
+
+    Args:
+        url (str): Request URL.
+        params (Dict[str, Any], optional): Query parameters. Defaults to None.
+
+    Returns:
+        str: Hex SHA-256 digest identifying the request.
+    """
+    path = urlsplit(url).path
+    canonical = sorted((str(k), str(v)) for k, v in (params or {}).items() if k not in IGNORED_PARAMS)
+    return hashlib.sha256(json.dumps([path, canonical]).encode('utf-8')).hexdigest()
+
+
+class ResponseCache:
+    """
+    Content-addressed on-disk cache of API responses, one JSON file per request.
+    """
+
+    def __init__(self, cache_dir: str = "../data/http_cache"):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir (str, optional): Directory holding cached responses. Defaults to "../data/http_cache".
+        """
+        self.cache_dir = cache_dir
+
+    def _path(self, key: str) -> str:
+        # Fan out into subdirectories so large recordings don't end up in one directory
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached response.
+
+        Args:
+            key (str): Cache key from cache_key().
+
+        Returns:
+            Optional[Dict[str, Any]]: Entry with 'status' and 'body', or None on a miss.
+        """
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def put(self, key: str, url: str, params: Dict[str, Any], status: int, body: Dict[str, Any]):
+        """
+        Store a response. The file is written atomically.
+
+        Args:
+            key (str): Cache key from cache_key().
+            url (str): Request URL (stored for inspection only).
+            params (Dict[str, Any]): Query parameters (secrets are dropped).
+            status (int): HTTP status code.
+            body (Dict[str, Any]): Decoded JSON body.
+        """
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        entry = {
+            'path': urlsplit(url).path,
+            'params': {k: v for k, v in params.items() if k not in IGNORED_PARAMS},
+            'status': status,
+            'body': body,
+        }
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, path)
+
+
+class HttpTransport:
+    """
+    Pluggable HTTP layer used by the data collectors, with record, replay and
+    passthrough modes backed by a ResponseCache.
+    """
+
+    def __init__(self, mode: str = PASSTHROUGH, cache: Optional[ResponseCache] = None):
+        """
+        Initialize the transport.
+
+        Args:
+            mode (str, optional): One of "passthrough", "record" or "replay". Defaults to "passthrough".
+            cache (ResponseCache, optional): Response cache. Defaults to one in "../data/http_cache".
+        """
+        if mode not in MODES:
+            raise ValueError(f"Unknown transport mode: {mode}. Expected one of {', '.join(MODES)}")
+        self.mode = mode
+        self.cache = cache or ResponseCache()
+        self.session = requests.Session()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def offline(self) -> bool:
+        """bool: Whether requests are served without the network."""
+        return self.mode == REPLAY
+
+    def _replay(self, url: str, params: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        entry = self.cache.get(cache_key(url, params))
+        if entry is None:
+            self.misses += 1
+            raise CacheMissError(f"No recorded response for {url} with params {params}")
+        self.hits += 1
+        return entry['status'], entry['body']
+
+    def _record(self, url: str, params: Dict[str, Any], status: int, body: Dict[str, Any]):
+        if self.mode == RECORD and status < 400:
+            self.cache.put(cache_key(url, params), url, params, status, body)
+
+    def fetch(self, url: str, params: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        """
+        Send a blocking GET request.
+
+        Args:
+            url (str): Request URL.
+            params (Dict[str, Any]): Query parameters.
+
+        Returns:
+            Tuple[int, Dict[str, Any]]: HTTP status code and decoded JSON body.
+        """
+        if self.offline:
+            return self._replay(url, params)
+
+        response = self.session.get(url, params=params)
+        body = response.json()
+        self._record(url, params, response.status_code, body)
+        return response.status_code, body
+
+    def get_json(self, url: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Send a blocking GET request and return the JSON body.
+
+        Args:
+            url (str): Request URL.
+            params (Dict[str, Any]): Query parameters.
+
+        Returns:
+            Dict[str, Any]: Decoded JSON body.
+
+        Raises:
+            requests.exceptions.HTTPError: If the response status is 400 or above.
+            CacheMissError: In replay mode, if the request was never recorded.
+        """
+        status, body = self.fetch(url, params)
+        if status >= 400:
+            raise requests.exceptions.HTTPError(f"{status} error for {url}: {body.get('error_message', '')}")
+        return body
+
+    async def fetch_async(self, session, url: str, params: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        """
+        Send a GET request through an aiohttp session.
+
+        Args:
+            session (aiohttp.ClientSession): Pooled session of the async collector.
+            url (str): Request URL.
+            params (Dict[str, Any]): Query parameters.
+
+        Returns:
+            Tuple[int, Dict[str, Any]]: HTTP status code and decoded JSON body.
+        """
+        if self.offline:
+            return self._replay(url, params)
+
+        async with session.get(url, params=params) as response:
+            body = await response.json(content_type=None)
+            self._record(url, params, response.status, body)
+            return response.status, body
@@ -0,0 +1,84 @@
+import re
+from typing import Dict, FrozenSet, Iterable, List, Set, Tuple
+
+# A label names one category of one categorization method, e.g. ("task_based", "Stemming")
+Label = Tuple[str, str]
+
+def _trie_pattern(keywords: Iterable[str]) -> str:
+    """
+    Build a regex matching any of the keywords, shaped like a trie so the regex
+    engine follows one branch per character instead of trying every keyword.
+
+    Args:
+        keywords (Iterable[str]): Keywords to match.
+
+    Returns:
+        str: Regex that matches the longest keyword starting at a position.
+    """
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = {}  # End of a keyword
+
+    def build(node: dict) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        pattern = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        # Greedy, so the longer keyword wins whenever both match
+        return f'(?:{pattern})?' if '' in node else pattern
+
+    return build(trie)
+
+
+class KeywordMatcher:
+    """
+    Compiled multi-pattern substring matcher. Keywords from several categorization
+    methods are merged into one trie-shaped regex, so a text is scanned once to find
+    every category of every method whose keywords occur in it. Matching follows
+    `keyword in text`: keywords match anywhere, including inside other words and
+    overlapping each other.
+    """
+
+    def __init__(self, keyword_sets: Dict[str, Dict[str, List[str]]]):
+        """
+        Compile the matcher.
+
+        Args:
+            keyword_sets (Dict[str, Dict[str, List[str]]]): Keywords per category, per method,
+                                                            e.g. {"task_based": {"Stemming": ["stem", ...]}}.
+        """
+        labels_by_keyword: Dict[str, Set[Label]] = {}
+        for method, categories in keyword_sets.items():
+            for category, keywords in categories.items():
+                for keyword in keywords:
+                    labels_by_keyword.setdefault(keyword, set()).add((method, category))
+
+        # The scan only reports the longest keyword starting at each position; every
+        # keyword that is a prefix of it starts there too
+        self._labels: Dict[str, FrozenSet[Label]] = {
+            keyword: frozenset().union(*(
+                labels for prefix, labels in labels_by_keyword.items() if keyword.startswith(prefix)
+            ))
+            for keyword in labels_by_keyword
+        }
+
+        # A zero-width lookahead is tried at every position, so overlapping keywords are all found
+        self._pattern = re.compile(f"(?=({_trie_pattern(labels_by_keyword)}))")
+
+    def match(self, text: str) -> Set[Label]:
+        """
+        Find every category whose keywords occur in a text.
+
+        Args:
+            text (str): Lowercased text to scan.
+
+        Returns:
+            Set[Label]: (method, category) pairs with at least one keyword in the text.
+        """
+        labels = set()
+        for keyword in set(self._pattern.findall(text)):
+            labels |= self._labels[keyword]
+        return labels
@@ -0,0 +1,193 @@
+import json
+import os
+import sqlite3
+from typing import Dict
+
+import pandas as pd
+
+from category_membership import CategoryMembership, category_slug
+from dataset_writer import parse_list_value
+from post_store import post_record
+from search_index import field_text
+
+KNOWLEDGE_BASE_VERSION = 1
+
+# Rows inserted per executemany call
+INSERT_BATCH_SIZE = 5000
+
+KNOWLEDGE_BASE_SCHEMA = """
+    CREATE TABLE metadata (
+        key TEXT PRIMARY KEY,
+        value TEXT NOT NULL
+    );
+    CREATE TABLE posts (
+        id INTEGER PRIMARY KEY,  -- row position in the dataset and the post store
+        question_id INTEGER,
+        title TEXT NOT NULL,
+        record TEXT NOT NULL     -- the post as the web app renders it (JSON)
+    );
+    CREATE TABLE answers (
+        post_id INTEGER NOT NULL,
+        rank INTEGER NOT NULL,   -- 0 for the accepted answer, then the other answers in order
+        is_accepted INTEGER NOT NULL,
+        body TEXT NOT NULL,
+        PRIMARY KEY (post_id, rank)
+    ) WITHOUT ROWID;
+    CREATE TABLE tags (
+        id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL UNIQUE
+    );
+    CREATE TABLE post_tags (
+        tag_id INTEGER NOT NULL,
+        post_id INTEGER NOT NULL,
+        PRIMARY KEY (tag_id, post_id)
+    ) WITHOUT ROWID;
+    CREATE TABLE categories (
+        id INTEGER PRIMARY KEY,
+        method TEXT NOT NULL,
+        name TEXT NOT NULL,
+        slug TEXT NOT NULL,
+        name_key TEXT NOT NULL,  -- normalized name and slug, for URL lookups
+        slug_key TEXT NOT NULL,
+        post_count INTEGER NOT NULL
+    );
+    CREATE TABLE category_posts (
+        category_id INTEGER NOT NULL,
+        post_id INTEGER NOT NULL,
+        PRIMARY KEY (category_id, post_id)
+    ) WITHOUT ROWID;
+    -- Tokens are runs of word characters; quoted phrases are matched here
+    CREATE VIRTUAL TABLE posts_fts USING fts5(
+        title, description, tags,
+        tokenize = "unicode61 remove_diacritics 0 tokenchars '_'"
+    );
+"""
+
+KNOWLEDGE_BASE_INDEXES = """
+    CREATE INDEX post_tags_post ON post_tags (post_id);
+    CREATE INDEX categories_method ON categories (method, post_count DESC);
+    CREATE INDEX categories_name_key ON categories (method, name_key);
+    CREATE INDEX categories_slug_key ON categories (method, slug_key);
+"""
+
+def category_key(name: str) -> str:
+    """
+    Normalize a category name or slug the way the web app does for URLs.
+
+    Args:
+        name (str): Category name or slug.
+
+    Returns:
+        str: Lowercased name with underscores as spaces.
+    """
+    return name.replace('_', ' ').strip().lower()
+
+def _question_id(value: str):
+    """Parse a stored question id ("123" or "123.0"), or None."""
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return None
+
+def _insert_batches(conn: sqlite3.Connection, sql: str, rows):
+    """Insert rows from an iterable in batches of INSERT_BATCH_SIZE."""
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= INSERT_BATCH_SIZE:
+            conn.executemany(sql, batch)
+            batch = []
+    if batch:
+        conn.executemany(sql, batch)
+
+def write_knowledge_base(df: pd.DataFrame, memberships: Dict[str, CategoryMembership], db_path: str) -> str:
+    """
+    Export posts, answers, tags and category memberships into one SQLite database,
+    with an FTS5 full-text index over the title, description and tags. The web app
+    reads pages, counts, search results and tag counts from it with indexed queries.
+    The database is built next to db_path and moved into place when complete.
+
+    Args:
+        df (pd.DataFrame): Dataset, in the row order membership positions refer to.
+        memberships (Dict[str, CategoryMembership]): Categories of each method.
+        db_path (str): Output path.
+
+    Returns:
+        str: Path to the database.
+    """
+    os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+    tmp_path = f"{db_path}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    columns = [column for column in df.columns if not str(column).startswith('processed_')]
+    conn = sqlite3.connect(tmp_path)
+    try:
+        # Nothing reads the file until it is complete, so skip the journal
+        conn.execute("PRAGMA journal_mode = OFF")
+        conn.execute("PRAGMA synchronous = OFF")
+        conn.executescript(KNOWLEDGE_BASE_SCHEMA)
+
+        records = [post_record(dict(zip(columns, values)))
+                   for values in df[columns].itertuples(index=False, name=None)]
+
+        with conn:
+            _insert_batches(conn, "INSERT INTO posts (id, question_id, title, record) VALUES (?, ?, ?, ?)", (
+                (post, _question_id(record.get('question_id')), record.get('title', ''), json.dumps(record, ensure_ascii=False))
+                for post, record in enumerate(records)
+            ))
+
+            def answer_rows():
+                for post, values in enumerate(df.reindex(columns=['accepted_answer', 'other_answers'])
+                                              .itertuples(index=False, name=None)):
+                    accepted, others = values
+                    if isinstance(accepted, str) and accepted:
+                        yield post, 0, 1, accepted
+                    for rank, body in enumerate(parse_list_value(others), start=1):
+                        yield post, rank, 0, str(body)
+            _insert_batches(conn, "INSERT INTO answers (post_id, rank, is_accepted, body) VALUES (?, ?, ?, ?)",
+                            answer_rows())
+
+            tag_ids = {}
+            for record in records:
+                for tag in record.get('tags', []):
+                    tag_ids.setdefault(tag, len(tag_ids) + 1)
+            conn.executemany("INSERT INTO tags (id, name) VALUES (?, ?)",
+                             ((tag_id, tag) for tag, tag_id in tag_ids.items()))
+            _insert_batches(conn, "INSERT OR IGNORE INTO post_tags (tag_id, post_id) VALUES (?, ?)", (
+                (tag_ids[tag], post) for post, record in enumerate(records) for tag in record.get('tags', [])
+            ))
+
+            category_id = 0
+            for method, categories in memberships.items():
+                for name, count in categories.counts().items():
+                    category_id += 1
+                    slug = category_slug(name)
+                    conn.execute(
+                        "INSERT INTO categories (id, method, name, slug, name_key, slug_key, post_count) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        (category_id, method, name, slug, category_key(name), category_key(slug), count)
+                    )
+                    _insert_batches(conn, "INSERT INTO category_posts (category_id, post_id) VALUES (?, ?)",
+                                    ((category_id, int(post)) for post in categories[name]))
+
+            _insert_batches(conn, "INSERT INTO posts_fts (rowid, title, description, tags) VALUES (?, ?, ?, ?)", (
+                (post, field_text('title', record.get('title')), field_text('description', record.get('description')),
+                 " ".join(record.get('tags', [])))
+                for post, record in enumerate(records)
+            ))
+
+            conn.execute("INSERT INTO posts_fts (posts_fts) VALUES ('optimize')")
+            conn.executemany("INSERT INTO metadata (key, value) VALUES (?, ?)", [
+                ('version', str(KNOWLEDGE_BASE_VERSION)),
+                ('total_posts', str(len(df))),
+            ])
+
+        # Indexes are cheaper to build once the tables are filled
+        conn.executescript(KNOWLEDGE_BASE_INDEXES)
+        conn.execute("ANALYZE")
+    finally:
+        conn.close()
+
+    os.replace(tmp_path, db_path)
+    return db_path
@@ -1,13 +1,19 @@
 #!/usr/bin/env python3
 import os
 import argparse
+import asyncio
 import time
 import pandas as pd
 from typing import List, Dict, Any, Union, Tuple
 
 # Import our modules
-from data_collector import StackOverflowDataCollector
-from preprocessor import DataPreprocessor
+from data_collector import StackOverflowDataCollector, API_BASE_URL
+from async_data_collector import AsyncStackOverflowDataCollector, collect_tag, collect_tags
+from checkpoint_store import CollectionCheckpoint
+from http_transport import HttpTransport, ResponseCache, MODES as HTTP_MODES
+from dataset_writer import dataset_exists, load_dataset, save_dataframe, write_chunks
+from preprocessor import DataPreprocessor, TOKENIZERS
+from preprocess_cache import PreprocessCache
 from data_visualizer import DataVisualizer
 from categorizer import PostCategorizer
 
@@ -17,7 +23,9 @@ def ensure_directories():
     os.makedirs("../data/visualizations", exist_ok=True)
     os.makedirs("../data/categories", exist_ok=True)
 
-def run_data_collection(api_key: str = None, max_questions: int = 20000, tag: str = "nlp", force_collection: bool = False):
+def run_data_collection(api_key: str = None, max_questions: int = 20000, tag: str = "nlp", force_collection: bool = False,
+                        use_async: bool = False, concurrency: int = 8, incremental: bool = False,
+                        transport: HttpTransport = None, base_url: str = API_BASE_URL, output_format: str = "csv"):
     """
     Run the data collection step.
     Collects questions for a specific tag and appends to a combined dataset file.
@@ -27,6 +35,13 @@ def run_data_collection(api_key: str = None, max_questions: int = 20000, tag: st
         max_questions (int, optional): Maximum number of questions to retrieve. Defaults to 20000.
         tag (str, optional): Tag to filter questions. Defaults to "nlp".
         force_collection (bool, optional): Whether to force initial data collection for this tag even if intermediate files exist. Defaults to False.
+        use_async (bool, optional): Use the async collector with concurrent, rate-limited requests. Defaults to False.
+        concurrency (int, optional): Maximum number of requests in flight when use_async is set. Defaults to 8.
+        incremental (bool, optional): Only fetch questions created or edited since the tag's last collection
+                                      and upsert them into the combined dataset. Defaults to False.
+        transport (HttpTransport, optional): HTTP layer for record/replay. Defaults to passthrough.
+        base_url (str, optional): API root, e.g. a local stand-in server. Defaults to the live API.
+        output_format (str, optional): Format of the combined dataset, "csv" or "parquet". Defaults to "csv".
 
     Returns:
         str: Path to the *combined* dataset file where data was appended.
@@ -38,27 +53,67 @@ def run_data_collection(api_key: str = None, max_questions: int = 20000, tag: st
     tag_specific_intermediate_file = f"../data/{tag}_questions_initial_collection.csv"
 
     # Define the path for the *combined* dataset file where all tags' data will be appended
-    combined_output_file = "../data/nlp_stackoverflow_dataset.csv"
+    combined_output_file = f"../data/nlp_stackoverflow_dataset.{output_format}"
 
     questions_list = []
 
+    # The checkpoint store lets an interrupted collection resume from its last completed page
+    # and keeps questions that are already in the combined file from being written twice
+    checkpoint = CollectionCheckpoint()
+    if force_collection:
+        # Written ids are re-imported from the combined file itself on the next write
+        checkpoint.reset_tag(tag)
+        checkpoint.clear_written(combined_output_file)
+
+    # Incremental runs only need the questions that changed since the stored watermark.
+    # Without a watermark (first run for the tag) fall through to a full collection.
+    watermark = checkpoint.get_watermark(tag) if incremental and not force_collection else None
+    if watermark is not None:
+        start_time = time.time()
+        questions_list = run_incremental_collection(
+            tag, watermark, combined_output_file, api_key=api_key, max_questions=max_questions,
+            checkpoint=checkpoint, use_async=use_async, concurrency=concurrency,
+            transport=transport, base_url=base_url
+        )
+        checkpoint.update_watermark(tag, questions_list, combined_output_file)
+        checkpoint.close()
+
+        elapsed_time = time.time() - start_time
+        print(f"Incremental data collection for tag [{tag}] completed in {elapsed_time:.2f} seconds.")
+        return combined_output_file
+    elif incremental:
+        print(f"No watermark recorded for tag [{tag}]. Running a full collection first.")
+
     # Check if the intermediate collection file for this tag already exists
     # We only skip the initial collection for this tag if the intermediate file exists and force_collection is False
     if os.path.exists(tag_specific_intermediate_file) and not force_collection:
         print(f"Intermediate dataset for tag [{tag}] already exists at {tag_specific_intermediate_file}. Skipping initial collection for this tag.")
         # Load questions from the intermediate file to proceed to create_dataset
-        try:
-            # Ensure correct dtypes if loading from CSV
-            questions_df = pd.read_csv(tag_specific_intermediate_file)
-            questions_list = questions_df.to_dict('records')
-            print(f"Loaded {len(questions_list)} questions from intermediate file.")
-        except Exception as e:
-            print(f"Error loading intermediate file {tag_specific_intermediate_file}: {e}")
-            questions_list = [] # Proceed with empty list if loading fails or file is corrupt
+        questions_list = load_intermediate_questions(tag_specific_intermediate_file)
+
+    elif use_async:
+        # The async collector fetches questions and answers in one session
+        start_time = time.time()
+        questions_list = asyncio.run(collect_tag(
+            tag, api_key=api_key, max_questions=max_questions, concurrency=concurrency,
+            filename=os.path.basename(combined_output_file), checkpoint=checkpoint,
+            transport=transport, base_url=base_url, output_format=output_format
+        ))
+
+        if questions_list:
+             pd.DataFrame(questions_list).to_csv(tag_specific_intermediate_file, index=False)
+             print(f"Saved intermediate dataset for tag [{tag}] to {tag_specific_intermediate_file}")
+
+        elapsed_time = time.time() - start_time
+        print(f"Async data collection for tag [{tag}] completed in {elapsed_time:.2f} seconds.")
+        checkpoint.update_watermark(tag, questions_list, combined_output_file)
+        checkpoint.close()
+        return combined_output_file
 
     else:
         # Create collector for the initial question list collection
-        collector = StackOverflowDataCollector(api_key=api_key)
+        collector = StackOverflowDataCollector(api_key=api_key, checkpoint=checkpoint, transport=transport, base_url=base_url,
+                                               output_format=output_format)
 
         # Collect questions for the current tag
         start_time = time.time()
@@ -75,17 +130,158 @@ def run_data_collection(api_key: str = None, max_questions: int = 20000, tag: st
 
     # Now, process the collected questions (fetch answers) and append to the *combined* dataset file
     # This step uses the create_dataset function which appends to the specified filename
-    if questions_list: # Only run create_dataset if there are questions to process
+    if questions_list and use_async:
+        async def create_dataset_async():
+            async with AsyncStackOverflowDataCollector(api_key=api_key, concurrency=concurrency, checkpoint=checkpoint,
+                                                       transport=transport, base_url=base_url) as collector:
+                await collector.create_dataset(questions_list, filename=os.path.basename(combined_output_file))
+
+        asyncio.run(create_dataset_async())
+
+    elif questions_list: # Only run create_dataset if there are questions to process
         # Create a new collector instance for this phase if needed,
         # ensuring it has the API key for answer fetching
-        collector = StackOverflowDataCollector(api_key=api_key)
+        collector = StackOverflowDataCollector(api_key=api_key, checkpoint=checkpoint, transport=transport, base_url=base_url)
         # Use the combined_output_file name for the create_dataset function
         collector.create_dataset(questions_list, filename=os.path.basename(combined_output_file))
 
+    checkpoint.update_watermark(tag, questions_list, combined_output_file)
+    checkpoint.close()
+
     # Return the path to the combined dataset file for subsequent steps
     return combined_output_file
 
-def run_preprocessing(input_file: str, remove_code: bool = True, force_collection: bool = False):
+def load_intermediate_questions(intermediate_file: str) -> List[Dict[str, Any]]:
+    """
+    Load question metadata saved by an earlier collection run.
+
+    Args:
+        intermediate_file (str): Path to a tag's intermediate collection file.
+
+    Returns:
+        List[Dict[str, Any]]: Loaded questions, or an empty list if the file cannot be read.
+    """
+    try:
+        # Ensure correct dtypes if loading from CSV
+        questions_df = pd.read_csv(intermediate_file)
+        questions_list = questions_df.to_dict('records')
+        print(f"Loaded {len(questions_list)} questions from intermediate file.")
+        return questions_list
+    except Exception as e:
+        print(f"Error loading intermediate file {intermediate_file}: {e}")
+        return [] # Proceed with empty list if loading fails or file is corrupt
+
+def run_multi_tag_collection(tags: List[str], api_key: str = None, max_questions: int = 20000, force_collection: bool = False,
+                             concurrency: int = 8, incremental: bool = False,
+                             transport: HttpTransport = None, base_url: str = API_BASE_URL, output_format: str = "csv"):
+    """
+    Run the data collection step for several tags concurrently in one process.
+    All tags share one session and rate limiter, and questions are deduplicated across
+    tags before answers are fetched.
+
+    Args:
+        tags (List[str]): Tags to collect.
+        api_key (str, optional): Stack Exchange API key. Defaults to None.
+        max_questions (int, optional): Maximum number of questions to retrieve per tag. Defaults to 20000.
+        force_collection (bool, optional): Whether to force initial data collection even if intermediate files exist. Defaults to False.
+        concurrency (int, optional): Maximum number of requests in flight across all tags. Defaults to 8.
+        incremental (bool, optional): Collect tags with a stored watermark incrementally. Defaults to False.
+        transport (HttpTransport, optional): HTTP layer for record/replay. Defaults to passthrough.
+        base_url (str, optional): API root, e.g. a local stand-in server. Defaults to the live API.
+        output_format (str, optional): Format of the combined dataset, "csv" or "parquet". Defaults to "csv".
+
+    Returns:
+        str: Path to the *combined* dataset file.
+    """
+    print(f"\n=== Step 1: Data Collection for tags [{', '.join(tags)}] ===")
+
+    combined_output_file = f"../data/nlp_stackoverflow_dataset.{output_format}"
+    checkpoint = CollectionCheckpoint()
+    if force_collection:
+        # Written ids are re-imported from the combined file itself on the next write
+        checkpoint.clear_written(combined_output_file)
+
+    since = {}
+    preloaded = {}
+    for tag in tags:
+        tag_specific_intermediate_file = f"../data/{tag}_questions_initial_collection.csv"
+        if force_collection:
+            checkpoint.reset_tag(tag)
+            continue
+
+        watermark = checkpoint.get_watermark(tag) if incremental else None
+        if watermark is not None:
+            since[tag] = watermark
+        elif os.path.exists(tag_specific_intermediate_file):
+            print(f"Intermediate dataset for tag [{tag}] already exists. Skipping initial collection for this tag.")
+            preloaded[tag] = load_intermediate_questions(tag_specific_intermediate_file)
+
+    start_time = time.time()
+    questions_by_tag = asyncio.run(collect_tags(
+        tags, api_key=api_key, max_questions=max_questions, concurrency=concurrency,
+        filename=os.path.basename(combined_output_file), checkpoint=checkpoint,
+        since=since, preloaded=preloaded, transport=transport, base_url=base_url,
+        output_format=output_format
+    ))
+
+    for tag, questions_list in questions_by_tag.items():
+        # Save intermediate results for freshly collected (non-incremental) tags
+        if tag not in since and tag not in preloaded and questions_list:
+            pd.DataFrame(questions_list).to_csv(f"../data/{tag}_questions_initial_collection.csv", index=False)
+        checkpoint.update_watermark(tag, questions_list, combined_output_file)
+
+    checkpoint.close()
+
+    elapsed_time = time.time() - start_time
+    print(f"Data collection for {len(tags)} tags completed in {elapsed_time:.2f} seconds.")
+    return combined_output_file
+
+def run_incremental_collection(tag: str, since: int, output_file: str, api_key: str = None, max_questions: int = 20000,
+                               checkpoint: CollectionCheckpoint = None, use_async: bool = False, concurrency: int = 8,
+                               transport: HttpTransport = None, base_url: str = API_BASE_URL):
+    """
+    Fetch questions created or edited since a watermark and upsert them into the combined dataset.
+
+    Args:
+        tag (str): Tag to filter questions.
+        since (int): Watermark (Unix timestamp) of the previous collection.
+        output_file (str): Path to the combined dataset file.
+        api_key (str, optional): Stack Exchange API key. Defaults to None.
+        max_questions (int, optional): Maximum number of questions to retrieve. Defaults to 20000.
+        checkpoint (CollectionCheckpoint, optional): Checkpoint store. Defaults to None.
+        use_async (bool, optional): Use the async collector. Defaults to False.
+        concurrency (int, optional): Maximum number of requests in flight when use_async is set. Defaults to 8.
+        transport (HttpTransport, optional): HTTP layer for record/replay. Defaults to passthrough.
+        base_url (str, optional): API root, e.g. a local stand-in server. Defaults to the live API.
+
+    Returns:
+        List[Dict[str, Any]]: The new or changed questions.
+    """
+    print(f"Incremental collection for tag [{tag}] since {since}...")
+    filename = os.path.basename(output_file)
+
+    if use_async:
+        async def collect_async():
+            async with AsyncStackOverflowDataCollector(api_key=api_key, concurrency=concurrency, checkpoint=checkpoint,
+                                                       transport=transport, base_url=base_url) as collector:
+                questions = await collector.get_questions(tag=tag, max_questions=max_questions, since=since)
+                if questions:
+                    await collector.upsert_dataset(questions, filename=filename)
+                return questions
+
+        questions_list = asyncio.run(collect_async())
+    else:
+        collector = StackOverflowDataCollector(api_key=api_key, checkpoint=checkpoint, transport=transport, base_url=base_url)
+        questions_list = collector.get_questions(tag=tag, max_questions=max_questions, since=since)
+        if questions_list:
+            collector.upsert_dataset(questions_list, filename=filename)
+
+    if not questions_list:
+        print(f"No new or changed questions for tag [{tag}].")
+    return questions_list
+
+def run_preprocessing(input_file: str, remove_code: bool = True, force_collection: bool = False, n_jobs: int = 1,
+                      use_cache: bool = True, chunksize: int = 0, tokenizer: str = "regex"):
     """
     Run the preprocessing step.
     Processes the combined dataset file.
@@ -95,6 +291,14 @@ def run_preprocessing(input_file: str, remove_code: bool = True, force_collectio
         remove_code (bool, optional): Whether to remove code blocks from text. Defaults to True.
         force_collection (bool, optional): Whether the previous collection step was forced for *any* tag.
                                            This is used to decide if reprocessing is needed. Defaults to False.
+        n_jobs (int, optional): Number of worker processes for preprocessing (-1 for every CPU). Defaults to 1.
+        use_cache (bool, optional): Reuse preprocessed texts from ../data/preprocess_cache.db, so only
+                                    new or changed posts are processed. Defaults to True.
+        chunksize (int, optional): Stream the dataset through preprocessing in chunks of this many rows,
+                                   keeping memory bounded for datasets larger than RAM. 0 loads the
+                                   whole dataset at once. Defaults to 0.
+        tokenizer (str, optional): "regex" for the batch tokenizer or "nltk" for per-document
+                                   word_tokenize. Defaults to "regex".
 
     Returns:
         str: Path to the preprocessed dataset file.
@@ -102,7 +306,8 @@ def run_preprocessing(input_file: str, remove_code: bool = True, force_collectio
     print("\n=== Step 2: Data Preprocessing ===")
 
     # Define the output filename for the preprocessed combined dataset
-    output_file = input_file.replace(".csv", "_preprocessed.csv")
+    root, extension = os.path.splitext(input_file)
+    output_file = f"{root}_preprocessed{extension}"
 
     # Check if preprocessed dataset already exists
     # Reprocess only if the input file is newer than the output file,
@@ -117,24 +322,36 @@ def run_preprocessing(input_file: str, remove_code: bool = True, force_collectio
 
     if reprocess_needed:
         # Check if input file exists
-        if not os.path.exists(input_file):
+        if not dataset_exists(input_file):
             # This could happen if collection was skipped and the combined file doesn't exist yet
             print(f"Input file for preprocessing not found: {input_file}. Skipping preprocessing.")
             return None # Or raise an error
 
-        print(f"Loading data from {input_file} for preprocessing...")
-        # Load dataset
-        df = pd.read_csv(input_file)
-
         # Create preprocessor
-        preprocessor = DataPreprocessor(remove_code=remove_code)
-
-        # Preprocess data
+        cache = PreprocessCache() if use_cache else None
+        preprocessor = DataPreprocessor(remove_code=remove_code, cache=cache, tokenizer=tokenizer)
         start_time = time.time()
-        processed_df = preprocessor.preprocess_dataframe(df)
 
-        # Save preprocessed data
-        processed_df.to_csv(output_file, index=False)
+        if chunksize:
+            # Stream chunks from the input straight into the output file
+            print(f"Streaming data from {input_file} for preprocessing in chunks of {chunksize} rows...")
+            write_chunks(output_file, preprocessor.iter_preprocess(input_file, chunksize=chunksize, n_jobs=n_jobs))
+        else:
+            print(f"Loading data from {input_file} for preprocessing...")
+            # Load dataset
+            df = load_dataset(input_file)
+
+            # Preprocess data
+            processed_df = preprocessor.preprocess_dataframe(df, n_jobs=n_jobs)
+
+            # Save preprocessed data
+            save_dataframe(processed_df, output_file)
+
+        if cache is not None:
+            stats = cache.stats()
+            print(f"Preprocess cache: {stats['hits']} hits, {stats['misses']} misses "
+                  f"({stats['hit_rate']:.1%} hit rate, {stats['entries']} entries)")
+            cache.close()
 
         elapsed_time = time.time() - start_time
         print(f"Preprocessing completed in {elapsed_time:.2f} seconds. Output saved to {output_file}")
@@ -171,13 +388,14 @@ def run_visualization(input_file: str):
     elapsed_time = time.time() - start_time
     print(f"Visualization completed in {elapsed_time:.2f} seconds.")
 
-def run_categorization(input_file: str):
+def run_categorization(input_file: str, n_jobs: int = 1):
     """
     Run the post categorization step.
     Uses the preprocessed combined dataset file.
 
     Args:
         input_file (str): Path to the preprocessed dataset.
+        n_jobs (int, optional): Categorization methods to run concurrently (-1 for one per CPU). Defaults to 1.
     """
     print("\n=== Step 4: Post Categorization ===")
 
@@ -192,7 +410,7 @@ def run_categorization(input_file: str):
 
     # Perform categorization
     start_time = time.time()
-    categorizer.categorize_all()
+    categorizer.categorize_all(n_jobs=n_jobs)
 
     elapsed_time = time.time() - start_time
     print(f"Categorization completed in {elapsed_time:.2f} seconds.")
@@ -209,12 +427,25 @@ def parse_arguments():
     parser.add_argument("--api-key", type=str, help="Stack Exchange API key")
     parser.add_argument("--max-questions", type=int, default=20000, help="Maximum number of questions to retrieve per tag collection run") # Clarified help text
     parser.add_argument("--tag", type=str, default="nlp", help="Tag to filter questions for the current collection run") # Clarified help text
+    parser.add_argument("--tags", type=str, help="Comma-separated tags to collect concurrently in one run (e.g. nlp,spacy,nltk). Overrides --tag")
     parser.add_argument("--skip-collection", action="store_true", help="Skip initial data collection for the specified tag")
     parser.add_argument("--skip-preprocessing", action="store_true", help="Skip preprocessing step on the combined dataset")
     parser.add_argument("--skip-visualization", action="store_true", help="Skip visualization step")
     parser.add_argument("--skip-categorization", action="store_true", help="Skip categorization step")
     parser.add_argument("--remove-code", action="store_true", help="Remove code blocks from text during preprocessing")
-    parser.add_argument("--force-collection", action="store_true", help="Force initial data collection for the specified tag, overwriting intermediate files")
+    parser.add_argument("--n-jobs", type=int, default=1, help="Worker processes for preprocessing (-1 uses every CPU)")
+    parser.add_argument("--categorization-jobs", type=int, default=1, help="Categorization methods to run concurrently in threads sharing the dataset (-1 uses every CPU)")
+    parser.add_argument("--no-preprocess-cache", action="store_true", help="Preprocess every post again instead of reusing cached results")
+    parser.add_argument("--tokenizer", type=str, choices=TOKENIZERS, default="regex", help="Batch regex tokenizer, or NLTK word_tokenize per document (same tokens, slower)")
+    parser.add_argument("--chunksize", type=int, default=0, help="Stream preprocessing in chunks of this many rows to bound memory (0 loads the whole dataset)")
+    parser.add_argument("--force-collection", action="store_true", help="Force initial data collection for the specified tag, overwriting intermediate files and resetting its checkpoint")
+    parser.add_argument("--async-collection", action="store_true", help="Collect with concurrent, rate-limited async requests")
+    parser.add_argument("--incremental", action="store_true", help="Only collect questions created or edited since the last run for the tag and upsert them")
+    parser.add_argument("--http-mode", type=str, choices=HTTP_MODES, default="passthrough", help="Record API responses to the HTTP cache, replay them offline, or pass through to the network")
+    parser.add_argument("--http-cache-dir", type=str, default="../data/http_cache", help="Directory of the recorded API responses")
+    parser.add_argument("--api-base-url", type=str, default=API_BASE_URL, help="API root, e.g. http://127.0.0.1:8000/2.3 for mock_api_server.py")
+    parser.add_argument("--concurrency", type=int, default=8, help="Maximum number of API requests in flight with --async-collection or --tags")
+    parser.add_argument("--output-format", type=str, choices=["csv", "parquet"], default="csv", help="Format of the combined and preprocessed datasets (parquet needs pyarrow)")
 
 
     return parser.parse_args()
@@ -233,20 +464,43 @@ def main():
     print("=" * 80)
 
     # Define the fixed path for the combined raw dataset file
-    combined_raw_dataset_file = "../data/nlp_stackoverflow_dataset.csv"
+    combined_raw_dataset_file = f"../data/nlp_stackoverflow_dataset.{args.output_format}"
     # Define the path for the preprocessed combined dataset file
-    preprocessed_combined_dataset_file = combined_raw_dataset_file.replace(".csv", "_preprocessed.csv")
+    preprocessed_combined_dataset_file = f"../data/nlp_stackoverflow_dataset_preprocessed.{args.output_format}"
 
 
+    # HTTP layer shared by every collector in this run (record/replay/passthrough)
+    transport = HttpTransport(mode=args.http_mode, cache=ResponseCache(args.http_cache_dir))
+
     # Step 1: Data Collection
     # run_data_collection will collect for the specified tag and append to the combined raw dataset file
-    if not args.skip_collection:
+    if not args.skip_collection and args.tags:
+        # Collect every tag concurrently under one shared rate limiter
+        run_multi_tag_collection(
+            tags=[tag.strip() for tag in args.tags.split(',') if tag.strip()],
+            api_key=args.api_key,
+            max_questions=args.max_questions,
+            force_collection=args.force_collection,
+            concurrency=args.concurrency,
+            incremental=args.incremental,
+            transport=transport,
+            base_url=args.api_base_url,
+            output_format=args.output_format
+        )
+        input_file_for_subsequent_steps = combined_raw_dataset_file
+    elif not args.skip_collection:
         # run_data_collection now returns the path to the combined file
         run_data_collection(
             api_key=args.api_key,
             max_questions=args.max_questions,
             tag=args.tag,
-            force_collection=args.force_collection
+            force_collection=args.force_collection,
+            use_async=args.async_collection,
+            concurrency=args.concurrency,
+            incremental=args.incremental,
+            transport=transport,
+            base_url=args.api_base_url,
+            output_format=args.output_format
         )
         # After collection, the combined_raw_dataset_file is the one to use for subsequent steps
         input_file_for_subsequent_steps = combined_raw_dataset_file
@@ -263,7 +517,11 @@ def main():
         preprocessed_file_output = run_preprocessing(
             input_file=input_file_for_subsequent_steps, # Use the combined file as input
             remove_code=args.remove_code,
-            force_collection=args.force_collection # Rerun preprocessing if collection was forced
+            force_collection=args.force_collection, # Rerun preprocessing if collection was forced
+            n_jobs=args.n_jobs,
+            use_cache=not args.no_preprocess_cache,
+            chunksize=args.chunksize,
+            tokenizer=args.tokenizer
         )
     else:
         print("\n=== Step 2: Data Preprocessing [SKIPPED] ===")
@@ -281,7 +539,7 @@ def main():
     # Step 4: Post Categorization
     if not args.skip_categorization:
         # Categorize the preprocessed combined dataset
-        run_categorization(input_file=preprocessed_file_output)
+        run_categorization(input_file=preprocessed_file_output, n_jobs=args.categorization_jobs)
     else:
         print("\n=== Step 4: Post Categorization [SKIPPED] ===")
 
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+from http_transport import ResponseCache, cache_key
+
+class StandInRequestHandler(BaseHTTPRequestHandler):
+    """
+    Serves recorded Stack Exchange API responses from a ResponseCache.
+    """
+
+    def do_GET(self):
+        server = self.server
+        split = urlsplit(self.path)
+        params = dict(parse_qsl(split.query))
+
+        request_number = server.next_request_number()
+        if server.latency:
+            time.sleep(server.latency)
+
+        # Behave like the real API once the quota is spent
+        if request_number > server.quota:
+            self._send_json(400, {
+                'error_id': 502,
+                'error_name': 'throttle_violation',
+                'error_message': 'too many requests from this IP, more requests available in 60 seconds',
+            })
+            return
+
+        entry = server.cache.get(cache_key(split.path, params))
+        if entry is None:
+            self._send_json(404, {
+                'error_id': 404,
+                'error_name': 'no_method',
+                'error_message': f'no recorded response for {split.path}',
+            })
+            return
+
+        body = dict(entry['body'])
+        body['quota_remaining'] = server.quota - request_number
+        body['quota_max'] = server.quota
+        if server.backoff_every and request_number % server.backoff_every == 0:
+            body['backoff'] = server.backoff
+        self._send_json(entry.get('status', 200), body)
+
+    def _send_json(self, status: int, body: dict):
+        payload = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class StandInServer(ThreadingHTTPServer):
+    """
+    Local stand-in for the Stack Exchange API that serves recorded fixtures with
+    configurable latency, backoff injection and a request quota. Point a collector's
+    base_url at it (e.g. http://127.0.0.1:8000/2.3) to load-test throughput and
+    backoff handling without the network.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], cache: ResponseCache, latency: float = 0.0,
+                 backoff_every: int = 0, backoff: int = 1, quota: int = 10000, verbose: bool = False):
+        """
+        Initialize the stand-in server.
+
+        Args:
+            address (Tuple[str, int]): Host and port to bind.
+            cache (ResponseCache): Recorded responses to serve.
+            latency (float, optional): Seconds to wait before each response. Defaults to 0.0.
+            backoff_every (int, optional): Add a `backoff` field to every Nth response (0 disables). Defaults to 0.
+            backoff (int, optional): Backoff value in seconds. Defaults to 1.
+            quota (int, optional): Requests served before throttle errors are returned. Defaults to 10000.
+            verbose (bool, optional): Log every request. Defaults to False.
+        """
+        super().__init__(address, StandInRequestHandler)
+        self.cache = cache
+        self.latency = latency
+        self.backoff_every = backoff_every
+        self.backoff = backoff
+        self.quota = quota
+        self.verbose = verbose
+        self.requests_served = 0
+        self._lock = threading.Lock()
+
+    def next_request_number(self) -> int:
+        """
+        Count a request.
+
+        Returns:
+            int: 1-based number of this request, used for deterministic backoff injection.
+        """
+        with self._lock:
+            self.requests_served += 1
+            return self.requests_served
+
+    def start_in_background(self) -> threading.Thread:
+        """
+        Serve requests from a daemon thread, e.g. inside a benchmark script.
+
+        Returns:
+            threading.Thread: The serving thread. Call shutdown() to stop it.
+        """
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+        return thread
+
+
+def parse_arguments():
+    """
+    Parse command line arguments.
+
+    Returns:
+        argparse.Namespace: Parsed arguments.
+    """
+    parser = argparse.ArgumentParser(description="Local stand-in for the Stack Exchange API serving recorded responses")
+
+    parser.add_argument("--cache-dir", type=str, default="../data/http_cache", help="Directory of recorded responses (see main.py --http-mode record)")
+    parser.add_argument("--host", type=str, default="127.0.0.1", help="Host to bind")
+    parser.add_argument("--port", type=int, default=8000, help="Port to bind")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds to wait before each response")
+    parser.add_argument("--backoff-every", type=int, default=0, help="Inject a backoff field into every Nth response (0 disables)")
+    parser.add_argument("--backoff", type=int, default=1, help="Backoff value in seconds for injected backoffs")
+    parser.add_argument("--quota", type=int, default=10000, help="Requests served before throttle errors are returned")
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_arguments()
+    server = StandInServer(
+        (args.host, args.port), ResponseCache(args.cache_dir), latency=args.latency,
+        backoff_every=args.backoff_every, backoff=args.backoff, quota=args.quota, verbose=args.verbose
+    )
+    print(f"Serving recorded responses from {args.cache_dir} at http://{args.host}:{args.port}/2.3")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\nStopped after {server.requests_served} requests.")
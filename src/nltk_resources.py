@@ -0,0 +1,97 @@
+from typing import Callable, Dict, FrozenSet, List, Optional
+
+# Fallback for machines without the NLTK stopwords corpus (e.g. offline build boxes).
+# Same words as NLTK's English list. The preprocessor strips punctuation before
+# removing stopwords, so the entries with apostrophes never match there anyway.
+ENGLISH_STOPWORDS = frozenset("""
+a about above after again against ain all am an and any are aren aren't as at
+be because been before being below between both but by can couldn couldn't d did
+didn didn't do does doesn doesn't doing don don't down during each few for from
+further had hadn hadn't has hasn hasn't have haven haven't having he he'd he'll
+he's her here hers herself him himself his how i i'd i'll i'm i've if in into is
+isn isn't it it'd it'll it's its itself just ll m ma me mightn mightn't more most
+mustn mustn't my myself needn needn't no nor not now o of off on once only or
+other our ours ourselves out over own re s same shan shan't she she'd she'll
+she's should should've shouldn shouldn't so some such t than that that'll the
+their theirs them themselves then there these they they'd they'll they're
+they've this those through to too under until up ve very was wasn wasn't we we'd
+we'll we're we've were weren weren't what when where which while who whom why
+will with won won't wouldn wouldn't y you you'd you'll you're you've your yours
+yourself yourselves
+""".split())
+
+# Results of the local nltk_data lookups, so each resource is only checked once
+_stopwords: Dict[str, FrozenSet[str]] = {}
+_word_tokenize: Optional[Callable[[str], List[str]]] = None
+
+def has_nltk_resource(resource: str) -> bool:
+    """
+    Check whether an NLTK resource is installed locally. Never downloads anything.
+
+    Args:
+        resource (str): Resource path, e.g. "corpora/stopwords".
+
+    Returns:
+        bool: True if the resource is in one of NLTK's data directories.
+    """
+    import nltk
+
+    try:
+        nltk.data.find(resource)
+        return True
+    except LookupError:
+        return False
+
+def get_stopwords(language: str = "english") -> FrozenSet[str]:
+    """
+    Get the stopword list for a language, loaded on first use. The local NLTK
+    stopwords corpus is preferred; for English the bundled list is used when the
+    corpus is not installed.
+
+    Args:
+        language (str, optional): Stopword list to load. Defaults to "english".
+
+    Returns:
+        FrozenSet[str]: Stopwords.
+
+    Raises:
+        LookupError: If the corpus is missing and no bundled list exists for the language.
+    """
+    if language not in _stopwords:
+        if has_nltk_resource("corpora/stopwords"):
+            from nltk.corpus import stopwords
+            _stopwords[language] = frozenset(stopwords.words(language))
+        elif language == "english":
+            print("NLTK stopwords corpus not found locally; using the bundled English stopword list. "
+                  "Run `python -m nltk.downloader stopwords` to install it.")
+            _stopwords[language] = ENGLISH_STOPWORDS
+        else:
+            raise LookupError(f"NLTK stopwords corpus not found and no bundled list for {language}")
+    return _stopwords[language]
+
+def word_tokenize(text: str) -> List[str]:
+    """
+    NLTK's word_tokenize, loaded on first use. Without the Punkt models it falls back
+    to NLTK's word tokenizer on the whole text, which only differs from word_tokenize
+    at sentence-final periods.
+
+    Args:
+        text (str): Input text.
+
+    Returns:
+        List[str]: Tokens.
+    """
+    global _word_tokenize
+    if _word_tokenize is None:
+        from nltk.tokenize import word_tokenize as nltk_word_tokenize
+
+        try:
+            nltk_word_tokenize("Probe.")
+            _word_tokenize = nltk_word_tokenize
+        except LookupError:
+            from nltk.tokenize import NLTKWordTokenizer
+
+            print("NLTK Punkt models not found locally; tokenizing without sentence splitting. "
+                  "Run `python -m nltk.downloader punkt_tab` to install them.")
+            _word_tokenize = NLTKWordTokenizer().tokenize
+    return _word_tokenize(text)
@@ -0,0 +1,160 @@
+import json
+import os
+import re
+import shutil
+import time
+from typing import Any, Dict, Iterable, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from dataset_writer import parse_list_value
+
+# Post store files inside the categories directory, as posts-<version>.jsonl and
+# posts-<version>.offsets.npy. The category manifest names the current pair.
+POST_STORE_NAME = "posts"
+POST_STORE_SUFFIX = ".jsonl"
+POST_OFFSETS_SUFFIX = ".offsets.npy"
+
+def versioned_name(name: str, suffix: str = "") -> str:
+    """
+    Get a new, unique name for one version of a pipeline output. Outputs are written
+    under a new name and then listed in the manifest, so readers never see a file
+    that is being replaced.
+
+    Args:
+        name (str): Base name, e.g. "posts".
+        suffix (str, optional): File extension. Defaults to "".
+
+    Returns:
+        str: Name of the form <name>-<version><suffix>, ordered by write time.
+    """
+    return f"{name}-{time.time_ns()}{suffix}"
+
+def remove_old_versions(directory: str, name: str, suffixes: Iterable[str] = ("",)):
+    """
+    Delete all but the two newest versions of an output written with versioned_name():
+    the one just written, and the previous one, which readers of the current manifest
+    may still have open. The unversioned name used by earlier runs is removed too,
+    once a versioned previous version exists.
+
+    Args:
+        directory (str): Directory containing the versions.
+        name (str): Base name passed to versioned_name().
+        suffixes (Iterable[str], optional): Suffixes of the files (or directories) making up
+                                            one version. Defaults to ("",).
+    """
+    suffixes = list(suffixes)
+    pattern = re.compile(rf"{re.escape(name)}-(\d+){re.escape(suffixes[0])}")
+    versions = sorted(int(match.group(1)) for match in map(pattern.fullmatch, os.listdir(directory)) if match)
+    if len(versions) < 2:
+        return
+
+    for stem in [f"{name}-{version}" for version in versions[:-2]] + [name]:
+        for suffix in suffixes:
+            path = os.path.join(directory, stem + suffix)
+            if os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+            elif os.path.exists(path):
+                os.remove(path)
+
+def post_record(row: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convert a dataset row into the record the web app renders: tags as a list of
+    strings, every other value as a string ("" when missing).
+
+    Args:
+        row (Dict[str, Any]): Column values of one post.
+
+    Returns:
+        Dict[str, Any]: JSON-serializable post.
+    """
+    record = {}
+    for column, value in row.items():
+        if column == 'tags':
+            record[column] = [str(tag) for tag in parse_list_value(value)]
+        elif isinstance(value, (list, tuple, np.ndarray)):
+            record[column] = str(list(value))
+        else:
+            record[column] = '' if pd.isna(value) else str(value)
+    return record
+
+def write_post_store(df: pd.DataFrame, directory: str) -> Tuple[str, str]:
+    """
+    Write every post once to a JSON-lines store with a byte-offset index, so any
+    post can be read with one seek. Category outputs refer to posts by their row
+    position in the store instead of copying them. The processed_* columns are left
+    out; they are only inputs to categorization.
+
+    Both files get new versioned names, so a reader holding the previous manifest keeps
+    a matching store and offsets pair. List the returned names in the manifest.
+
+    Args:
+        df (pd.DataFrame): Dataset, in the row order category positions refer to.
+        directory (str): Directory for the store and offsets files.
+
+    Returns:
+        Tuple[str, str]: Paths to the post store and its offsets.
+    """
+    os.makedirs(directory, exist_ok=True)
+    version = versioned_name(POST_STORE_NAME)
+    store_path = os.path.join(directory, version + POST_STORE_SUFFIX)
+    offsets_path = os.path.join(directory, version + POST_OFFSETS_SUFFIX)
+    columns = [column for column in df.columns if not str(column).startswith('processed_')]
+
+    # offsets[i] is where post i starts; offsets[-1] is the file size
+    offsets = np.zeros(len(df) + 1, dtype=np.int64)
+    tmp_store_path = f"{store_path}.tmp"
+    with open(tmp_store_path, 'wb') as f:
+        for i, values in enumerate(df[columns].itertuples(index=False, name=None)):
+            # json.dumps escapes newlines, so each post is exactly one line
+            line = (json.dumps(post_record(dict(zip(columns, values))), ensure_ascii=False) + "\n").encode('utf-8')
+            f.write(line)
+            offsets[i + 1] = offsets[i] + len(line)
+
+    tmp_offsets_path = f"{offsets_path}.tmp.npy"
+    np.save(tmp_offsets_path, offsets)
+    os.replace(tmp_store_path, store_path)
+    os.replace(tmp_offsets_path, offsets_path)
+
+    remove_old_versions(directory, POST_STORE_NAME, (POST_STORE_SUFFIX, POST_OFFSETS_SUFFIX))
+    return store_path, offsets_path
+
+
+class PostStore:
+    """
+    Reader for a post store written by write_post_store(). The offsets are memory-mapped,
+    so opening the store is cheap and reading a page costs one seek per post.
+    """
+
+    def __init__(self, store_path: str, offsets_path: str):
+        """
+        Open the store.
+
+        Args:
+            store_path (str): Path to the post store, as returned by write_post_store().
+            offsets_path (str): Path to its offsets.
+        """
+        self.path = store_path
+        self.offsets = np.load(offsets_path, mmap_mode='r')
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def read(self, positions: Iterable[int]) -> List[Dict[str, Any]]:
+        """
+        Read posts by row position.
+
+        Args:
+            positions (Iterable[int]): Row positions in the store.
+
+        Returns:
+            List[Dict[str, Any]]: Posts, in the order of the positions.
+        """
+        posts = []
+        with open(self.path, 'rb') as f:
+            for position in positions:
+                start, end = int(self.offsets[position]), int(self.offsets[position + 1])
+                f.seek(start)
+                posts.append(json.loads(f.read(end - start)))
+        return posts
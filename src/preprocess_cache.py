@@ -0,0 +1,107 @@
+import hashlib
+import json
+import os
+import sqlite3
+from typing import Dict, Iterable, Tuple
+
+# SQLite limits the number of bound parameters per statement
+LOOKUP_BATCH_SIZE = 500
+
+def preprocess_cache_key(text: str, remove_code: bool, remove_stopwords: bool, version: str) -> str:
+    """
+    Build the content address of one preprocess_text call.
+
+    Args:
+        text (str): Raw input text.
+        remove_code (bool): The preprocessor's remove_code setting.
+        remove_stopwords (bool): Whether stopwords are removed.
+        version (str): Preprocessor version; bumping it invalidates every entry.
+
+    Returns:
+        str: Hex SHA-256 digest identifying the result.
+    """
+    header = json.dumps([version, bool(remove_code), bool(remove_stopwords)])
+    return hashlib.sha256(f"{header}\n{text}".encode('utf-8')).hexdigest()
+
+
+class PreprocessCache:
+    """
+    Persistent key-value store of preprocessed texts, backed by a small SQLite file.
+    Keys are content hashes from preprocess_cache_key(), so unchanged posts are never
+    preprocessed twice across pipeline runs. Hits and misses are counted per instance.
+    """
+
+    def __init__(self, db_path: str = "../data/preprocess_cache.db"):
+        """
+        Open (or create) the cache.
+
+        Args:
+            db_path (str, optional): Path to the SQLite file. Defaults to "../data/preprocess_cache.db".
+        """
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        # Worker processes of a parallel run share the file, so wait for locks instead of failing
+        self.conn = sqlite3.connect(db_path, timeout=60)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS preprocessed_texts (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            )
+        """)
+        self.conn.commit()
+        self.hits = 0
+        self.misses = 0
+
+    def close(self):
+        """Close the underlying database connection."""
+        self.conn.close()
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, str]:
+        """
+        Look up several cached results at once.
+
+        Args:
+            keys (Iterable[str]): Cache keys.
+
+        Returns:
+            Dict[str, str]: Cached results for the keys that were found.
+        """
+        keys = list(dict.fromkeys(keys))
+        found = {}
+        for start in range(0, len(keys), LOOKUP_BATCH_SIZE):
+            batch = keys[start:start + LOOKUP_BATCH_SIZE]
+            placeholders = ','.join('?' * len(batch))
+            found.update(self.conn.execute(
+                f"SELECT key, value FROM preprocessed_texts WHERE key IN ({placeholders})", batch
+            ).fetchall())
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, items: Iterable[Tuple[str, str]]):
+        """
+        Store several results in a single transaction.
+
+        Args:
+            items (Iterable[Tuple[str, str]]): (key, preprocessed text) pairs.
+        """
+        with self.conn:
+            self.conn.executemany("INSERT OR REPLACE INTO preprocessed_texts (key, value) VALUES (?, ?)", items)
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM preprocessed_texts").fetchone()[0]
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Get the hit/miss statistics of this instance.
+
+        Returns:
+            Dict[str, float]: hits, misses, hit_rate and the number of stored entries.
+        """
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'entries': len(self),
+        }
@@ -1,36 +1,222 @@
 import pandas as pd
+import numpy as np
+import os
 import re
 import string
-import nltk
-from bs4 import BeautifulSoup
 import html
-from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
-from typing import List, Dict, Any, Union
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Union, Optional, Iterator, Iterable
+
+from dataset_writer import iter_dataset
+from nltk_resources import get_stopwords, word_tokenize
+from preprocess_cache import PreprocessCache, preprocess_cache_key
+
+# lxml's event-driven parser backs the fast clean_html path; without it the
+# preprocessor falls back to building a BeautifulSoup tree per document.
+# NLTK and BeautifulSoup themselves are only imported on first use.
+try:
+    from lxml import etree
+except ImportError:
+    etree = None
+
+# Version of the preprocessing pipeline. Bump it whenever the output of
+# preprocess_text or of the processed_* columns changes, so results cached
+# by earlier versions are not reused.
+PREPROCESSOR_VERSION = "3"
+
+# Compiled once at import, so every worker process gets its own copy for free
+URL_PATTERN = re.compile(r'https?://\S+|www\.\S+')
+PUNCTUATION_TABLE = str.maketrans('', '', string.punctuation)
+
+# Tokenizer modes: "nltk" runs word_tokenize on every document; "regex" runs the
+# batch engine below over a whole column at once
+TOKENIZERS = ("regex", "nltk")
+
+# Once ASCII punctuation is stripped, the only word_tokenize rules that can still
+# fire are the ones splitting off unicode quotes and dashes, and the contractions
+# written without an apostrophe. Applied in word_tokenize's order they reproduce
+# its output exactly (Punkt only splits sentences at ".", "?" and "!").
+SPLIT_OFF_PATTERN = re.compile("([«“‘„»”’\u2012-\u2015])")
+# The contractions (cannot, gimme, gonna, gotta, lemme, wanna) are matched in one pass
+CONTRACTION_PATTERN = re.compile(r"(?i)\b(?:(can)(not)|(gim)(me)|(gon)(na)|(got)(ta)|(lem)(me))\b|\b(wan)(na)(?=\s)")
+
+# Separates the documents of a batch; the rules above never touch it
+DOCUMENT_SEPARATOR = "\x00"
+
+# Tags whose whole subtree is dropped when remove_code is set
+CODE_TAGS = frozenset(['code', 'pre'])
+
+# Tags whose text BeautifulSoup's get_text() leaves out (scripts, styles, templates, ruby annotations)
+NON_TEXT_TAGS = frozenset(['script', 'style', 'template', 'rt', 'rp'])
+
+# Tags inside which BeautifulSoup keeps whitespace-only text as is
+PRESERVE_WHITESPACE_TAGS = frozenset(['pre', 'textarea'])
+ASCII_SPACES = '\x20\x0a\x09\x0c\x0d'
+
+# Shards per worker process; more shards than workers keeps the pool busy
+# when some shards hold much longer posts than others
+SHARDS_PER_JOB = 4
+
+# Preprocessor of the current worker process, created once by _init_worker
+_worker_preprocessor = None
+
+
+class _TextExtractor:
+    """
+    lxml parser target that collects the text of a document as it is parsed,
+    without building a tree. It follows BeautifulSoup's get_text() rules: text
+    inside NON_TEXT_TAGS is skipped, and whitespace-only text between two tags
+    collapses to a single space or newline outside pre/textarea. Text inside
+    code/pre elements is skipped as well when skip_code is set.
+    """
+
+    def __init__(self, skip_code: bool):
+        self.skipped_tags = NON_TEXT_TAGS | CODE_TAGS if skip_code else NON_TEXT_TAGS
+        self.parts = []
+        self.pending = []
+        self.skip_depth = 0
+        self.preserve_depth = 0
+
+    def _end_data(self):
+        # lxml may report one run of text in several pieces; BeautifulSoup
+        # treats everything between two markup events as one string
+        if not self.pending:
+            return
+        data = ''.join(self.pending)
+        self.pending = []
+        if self.skip_depth:
+            return
+        if not self.preserve_depth and not data.strip(ASCII_SPACES):
+            data = '\n' if '\n' in data else ' '
+        self.parts.append(data)
+
+    def start(self, tag, attrib):
+        self._end_data()
+        if self.skip_depth or tag in self.skipped_tags:
+            self.skip_depth += 1
+        if tag in PRESERVE_WHITESPACE_TAGS:
+            self.preserve_depth += 1
+
+    def end(self, tag):
+        self._end_data()
+        if self.skip_depth:
+            self.skip_depth -= 1
+        if tag in PRESERVE_WHITESPACE_TAGS and self.preserve_depth:
+            self.preserve_depth -= 1
+
+    def data(self, data):
+        self.pending.append(data)
+
+    def comment(self, text):
+        self._end_data()
+
+    def pi(self, target, data=None):
+        self._end_data()
+
+    def doctype(self, *args):
+        self._end_data()
+
+    def close(self):
+        self._end_data()
+        text = ''.join(self.parts)
+        self.parts = []
+        self.skip_depth = 0
+        self.preserve_depth = 0
+        return text
+
+
+def _split_contraction(match) -> str:
+    first, second = (group for group in match.groups() if group is not None)
+    return f" {first} {second} "
+
+
+def _init_worker(remove_code: bool, cache_path: Optional[str], tokenizer: str, stop_words: frozenset):
+    global _worker_preprocessor
+    cache = PreprocessCache(cache_path) if cache_path else None
+    _worker_preprocessor = DataPreprocessor(remove_code=remove_code, cache=cache, tokenizer=tokenizer,
+                                            stop_words=stop_words)
+
+
+def _preprocess_shard(shard: pd.DataFrame):
+    cache = _worker_preprocessor.cache
+    hits, misses = (cache.hits, cache.misses) if cache else (0, 0)
+    processed = _worker_preprocessor._preprocess_columns(shard, verbose=False)
+    if cache:
+        hits, misses = cache.hits - hits, cache.misses - misses
+    return processed, hits, misses
 
-# Download necessary NLTK resources
-nltk.download('punkt', quiet=True)
-nltk.download('stopwords', quiet=True)
 
 class DataPreprocessor:
     """
     Preprocessor for Stack Overflow NLP dataset.
     """
     
-    def __init__(self, remove_code: bool = False):
+    def __init__(self, remove_code: bool = False, cache: Optional[PreprocessCache] = None, tokenizer: str = "regex",
+                 stop_words: Optional[Iterable[str]] = None):
         """
         Initialize the preprocessor.
         
         Args:
             remove_code (bool, optional): Whether to remove code blocks from text. Defaults to False.
+            cache (PreprocessCache, optional): Persistent cache of preprocess_text results, looked up
+                                               before any text is processed. Defaults to None (no caching).
+            tokenizer (str, optional): "regex" tokenizes whole columns with the batch regex engine,
+                                       "nltk" calls word_tokenize per document. Both produce the same
+                                       tokens; "nltk" is the reference. Defaults to "regex".
+            stop_words (Iterable[str], optional): Stopwords to remove. Defaults to None, which loads
+                                                  NLTK's English list (or the bundled copy) on first use.
         """
+        if tokenizer not in TOKENIZERS:
+            raise ValueError(f"Unknown tokenizer: {tokenizer}. Expected one of {', '.join(TOKENIZERS)}")
         self.remove_code = remove_code
-        self.stop_words = set(stopwords.words('english'))
+        self.cache = cache
+        self.tokenizer = tokenizer
+        self._stop_words = frozenset(stop_words) if stop_words is not None else None
+        self._html_parser = None
+    
+    @property
+    def stop_words(self) -> frozenset:
+        """frozenset: Stopwords, loaded on first use."""
+        if self._stop_words is None:
+            self._stop_words = get_stopwords('english')
+        return self._stop_words
         
     def clean_html(self, text: str) -> str:
         """
         Remove HTML tags and decode HTML entities.
         
+        Args:
+            text (str): Text containing HTML.
+            
+        Returns:
+            str: Cleaned text.
+        """
+        if not isinstance(text, str):
+            return ""
+        
+        if etree is None:
+            return self._clean_html_soup(text)
+        
+        # Decode HTML entities (the parser decodes the ones this produces once more,
+        # matching the BeautifulSoup path)
+        text = html.unescape(text)
+        
+        # Stream the document through lxml's parser, collecting text from parse events.
+        # The parser is reusable: close() resets it and returns the extracted text.
+        if self._html_parser is None:
+            self._html_parser = etree.HTMLParser(target=_TextExtractor(self.remove_code))
+        try:
+            self._html_parser.feed(text)
+            return self._html_parser.close()
+        except etree.LxmlError:
+            self._html_parser = None
+            return self._clean_html_soup(text)
+    
+    def _clean_html_soup(self, text: str) -> str:
+        """
+        Reference clean_html implementation that builds a full BeautifulSoup tree.
+        Used when lxml is unavailable and as the baseline for benchmark_preprocessing.py.
+        
         Args:
             text (str): Text containing HTML.
             
@@ -44,6 +230,7 @@ class DataPreprocessor:
         text = html.unescape(text)
         
         # Remove HTML tags
+        from bs4 import BeautifulSoup
         soup = BeautifulSoup(text, "lxml")
         
         # Optionally remove code blocks
@@ -69,8 +256,7 @@ class DataPreprocessor:
         if not isinstance(text, str):
             return ""
         
-        url_pattern = re.compile(r'https?://\S+|www\.\S+')
-        return url_pattern.sub('', text)
+        return URL_PATTERN.sub('', text)
     
     def remove_punctuation(self, text: str) -> str:
         """
@@ -85,8 +271,7 @@ class DataPreprocessor:
         if not isinstance(text, str):
             return ""
         
-        translator = str.maketrans('', '', string.punctuation)
-        return text.translate(translator)
+        return text.translate(PUNCTUATION_TABLE)
     
     def tokenize(self, text: str) -> List[str]:
         """
@@ -115,6 +300,38 @@ class DataPreprocessor:
         """
         return [word for word in tokens if word.lower() not in self.stop_words]
     
+    def tokenize_batch(self, texts: List[str]) -> List[List[str]]:
+        """
+        Tokenize many lowercased texts with ASCII punctuation already removed, as
+        preprocess_text produces them. In "regex" mode the whole batch is joined and
+        tokenized with a handful of regex passes instead of one word_tokenize call
+        per document.
+        
+        Args:
+            texts (List[str]): Lowercased texts without ASCII punctuation.
+            
+        Returns:
+            List[List[str]]: Tokens of each text, identical to word_tokenize's.
+        """
+        if self.tokenizer == "nltk":
+            return [self.tokenize(text) for text in texts]
+        
+        # A text containing the separator itself would be split in two
+        if any(DOCUMENT_SEPARATOR in text for text in texts):
+            return [self._regex_tokenize(text) for text in texts]
+        
+        joined = self._regex_tokenize_text(f" {DOCUMENT_SEPARATOR} ".join(texts))
+        return [part.split() for part in joined.split(DOCUMENT_SEPARATOR)] if texts else []
+    
+    def _regex_tokenize(self, text: str) -> List[str]:
+        return self._regex_tokenize_text(text).split()
+    
+    def _regex_tokenize_text(self, text: str) -> str:
+        text = SPLIT_OFF_PATTERN.sub(r" \1 ", text)
+        # word_tokenize pads the text with spaces, which the "wanna" lookahead relies on
+        text = f" {text} "
+        return CONTRACTION_PATTERN.sub(_split_contraction, text)
+    
     def preprocess_text(self, text: str, remove_stopwords: bool = True) -> str:
         """
         Apply full preprocessing pipeline to text.
@@ -129,75 +346,196 @@ class DataPreprocessor:
         if not isinstance(text, str):
             return ""
         
-        # Clean HTML
-        text = self.clean_html(text)
-        
-        # Remove URLs
-        text = self.remove_urls(text)
-        
-        # Convert to lowercase
-        text = text.lower()
-        
-        # Remove punctuation
-        text = self.remove_punctuation(text)
+        return self.preprocess_texts([text], remove_stopwords=remove_stopwords)[0]
+    
+    def _preprocess_batch(self, texts: List[str], remove_stopwords: bool) -> List[str]:
+        cleaned_texts = []
+        for text in texts:
+            # Clean HTML
+            text = self.clean_html(text)
+            
+            # Remove URLs
+            text = self.remove_urls(text)
+            
+            # Convert to lowercase
+            text = text.lower()
+            
+            # Remove punctuation
+            cleaned_texts.append(self.remove_punctuation(text))
         
-        # Tokenize
-        tokens = self.tokenize(text)
+        # Tokenize the whole batch at once
+        token_lists = self.tokenize_batch(cleaned_texts)
         
-        # Remove stopwords if requested
+        # Remove stopwords if requested. The tokens are lowercase already (lower() is
+        # idempotent), so each one is a single set lookup.
         if remove_stopwords:
-            tokens = self.remove_stopwords(tokens)
+            stop_words = self.stop_words
+            token_lists = [[word for word in tokens if word not in stop_words] for tokens in token_lists]
         
         # Join tokens back into text
-        preprocessed_text = ' '.join(tokens)
+        return [' '.join(tokens) for tokens in token_lists]
+    
+    def preprocess_texts(self, texts: List[Any], remove_stopwords: bool = True) -> List[str]:
+        """
+        Apply the full preprocessing pipeline to many texts, resolving them against the
+        cache in one batch so only texts that were never seen before are processed.
         
-        return preprocessed_text
+        Args:
+            texts (List[Any]): Input texts (non-string values become "").
+            remove_stopwords (bool, optional): Whether to remove stopwords. Defaults to True.
+            
+        Returns:
+            List[str]: Preprocessed texts in input order.
+        """
+        if self.cache is None:
+            strings = [text for text in texts if isinstance(text, str)]
+            processed = iter(self._preprocess_batch(strings, remove_stopwords))
+            return [next(processed) if isinstance(text, str) else "" for text in texts]
+        
+        keys = [
+            preprocess_cache_key(text, self.remove_code, remove_stopwords, PREPROCESSOR_VERSION)
+            if isinstance(text, str) else None
+            for text in texts
+        ]
+        results = self.cache.get_many(key for key in keys if key is not None)
+        
+        missing = {}
+        for text, key in zip(texts, keys):
+            if key is not None and key not in results:
+                missing[key] = text
+        if missing:
+            new_results = dict(zip(missing, self._preprocess_batch(list(missing.values()), remove_stopwords)))
+            self.cache.put_many(new_results.items())
+            results.update(new_results)
+        
+        return [results[key] if key is not None else "" for key in keys]
     
-    def preprocess_dataframe(self, df: pd.DataFrame) -> pd.DataFrame:
+    def preprocess_dataframe(self, df: pd.DataFrame, n_jobs: int = 1) -> pd.DataFrame:
         """
         Preprocess all text columns in the DataFrame.
         
         Args:
             df (pd.DataFrame): Input DataFrame.
+            n_jobs (int, optional): Number of worker processes. The rows are split into
+                                    shards that are preprocessed in parallel and reassembled
+                                    in their original order; the output is identical to the
+                                    serial path. -1 uses every CPU. Defaults to 1 (serial).
             
         Returns:
             pd.DataFrame: Preprocessed DataFrame.
         """
+        n_jobs = self._resolve_n_jobs(n_jobs)
+        if n_jobs <= 1 or len(df) < 2:
+            return self._preprocess_columns(df)
+        
+        print(f"Preprocessing {len(df)} rows across {n_jobs} processes...")
+        with self._worker_pool(n_jobs) as executor:
+            processed_df = self._preprocess_sharded(df, executor, n_jobs)
+        
+        print("Preprocessing complete.")
+        return processed_df
+    
+    def iter_preprocess(self, path: str, chunksize: int = 5000, n_jobs: int = 1) -> Iterator[pd.DataFrame]:
+        """
+        Stream a raw dataset from disk and preprocess it chunk by chunk. Only one chunk
+        is held in memory at a time, so memory use stays bounded by the chunk size
+        however large the dataset is.
+        
+        Args:
+            path (str): Path to the raw dataset (CSV or Parquet).
+            chunksize (int, optional): Rows per chunk. Defaults to 5000.
+            n_jobs (int, optional): Number of worker processes; one pool is shared by all
+                                    chunks. -1 uses every CPU. Defaults to 1 (serial).
+            
+        Yields:
+            pd.DataFrame: Preprocessed chunks in file order.
+        """
+        n_jobs = self._resolve_n_jobs(n_jobs)
+        executor = self._worker_pool(n_jobs) if n_jobs > 1 else None
+        rows = 0
+        try:
+            for chunk in iter_dataset(path, chunksize=chunksize):
+                if executor is not None and len(chunk) > 1:
+                    processed_chunk = self._preprocess_sharded(chunk, executor, n_jobs)
+                else:
+                    processed_chunk = self._preprocess_columns(chunk, verbose=False)
+                rows += len(chunk)
+                print(f"Preprocessed {rows} rows...")
+                yield processed_chunk
+        finally:
+            if executor is not None:
+                executor.shutdown()
+    
+    def _resolve_n_jobs(self, n_jobs: Optional[int]) -> int:
+        if n_jobs is None or n_jobs < 0:
+            return os.cpu_count() or 1
+        return n_jobs
+    
+    def _worker_pool(self, n_jobs: int) -> ProcessPoolExecutor:
+        cache_path = self.cache.db_path if self.cache is not None else None
+        return ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_worker,
+                                   initargs=(self.remove_code, cache_path, self.tokenizer, self.stop_words))
+    
+    def _preprocess_sharded(self, df: pd.DataFrame, executor: ProcessPoolExecutor, n_jobs: int) -> pd.DataFrame:
+        n_shards = min(len(df), n_jobs * SHARDS_PER_JOB)
+        bounds = np.linspace(0, len(df), n_shards + 1, dtype=int)
+        shards = [df.iloc[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
+        
+        # map() yields results in submission order, so the rows stay in place
+        results = list(executor.map(_preprocess_shard, shards))
+        
+        # Workers use their own cache connections; fold their statistics into ours
+        if self.cache is not None:
+            self.cache.hits += sum(hits for _, hits, _ in results)
+            self.cache.misses += sum(misses for _, _, misses in results)
+        
+        return pd.concat([processed for processed, _, _ in results])
+    
+    def _preprocess_columns(self, df: pd.DataFrame, verbose: bool = True) -> pd.DataFrame:
+        """
+        Preprocess all text columns of a DataFrame in the current process.
+        
+        Args:
+            df (pd.DataFrame): Input DataFrame (or one shard of it).
+            verbose (bool, optional): Print progress for each column. Defaults to True.
+            
+        Returns:
+            pd.DataFrame: Preprocessed DataFrame.
+        """
+        log = print if verbose else (lambda *args: None)
+        
         # Create a copy to avoid modifying the original
         processed_df = df.copy()
         
         # Process title column
-        print("Preprocessing titles...")
-        processed_df['processed_title'] = processed_df['title'].apply(
-            lambda x: self.preprocess_text(x, remove_stopwords=False)
+        log("Preprocessing titles...")
+        processed_df['processed_title'] = self.preprocess_texts(
+            processed_df['title'].tolist(), remove_stopwords=False
         )
         
         # Process description column
-        print("Preprocessing descriptions...")
-        processed_df['processed_description'] = processed_df['description'].apply(
-            lambda x: self.preprocess_text(x)
-        )
+        log("Preprocessing descriptions...")
+        processed_df['processed_description'] = self.preprocess_texts(processed_df['description'].tolist())
         
         # Process accepted_answer column
-        print("Preprocessing accepted answers...")
-        processed_df['processed_accepted_answer'] = processed_df['accepted_answer'].apply(
-            lambda x: self.preprocess_text(x)
-        )
+        log("Preprocessing accepted answers...")
+        processed_df['processed_accepted_answer'] = self.preprocess_texts(processed_df['accepted_answer'].tolist())
         
         # Process other_answers column (if it's a list of strings)
         if 'other_answers' in processed_df.columns:
-            print("Preprocessing other answers...")
+            log("Preprocessing other answers...")
             
-            def process_answers(answers_list):
-                if isinstance(answers_list, list):
-                    return [self.preprocess_text(answer) for answer in answers_list]
-                return []
-            
-            processed_df['processed_other_answers'] = processed_df['other_answers'].apply(process_answers)
+            # Flatten the answer lists so every answer is resolved in one batch
+            answer_lists = [answers if isinstance(answers, list) else [] for answers in processed_df['other_answers']]
+            processed_answers = iter(self.preprocess_texts([answer for answers in answer_lists for answer in answers]))
+            processed_df['processed_other_answers'] = pd.Series(
+                [[next(processed_answers) for _ in answers] for answers in answer_lists],
+                index=processed_df.index, dtype=object
+            )
         
         # Process tags column (if it's a list of strings)
         if 'tags' in processed_df.columns:
-            print("Preprocessing tags...")
+            log("Preprocessing tags...")
             
             def process_tags(tags_list):
                 if isinstance(tags_list, list):
@@ -206,7 +544,7 @@ class DataPreprocessor:
             
             processed_df['processed_tags'] = processed_df['tags'].apply(process_tags)
         
-        print("Preprocessing complete.")
+        log("Preprocessing complete.")
         return processed_df
 
 
@@ -0,0 +1,107 @@
+import asyncio
+import time
+from typing import Any, Dict, Optional
+
+
+class QuotaExhaustedError(Exception):
+    """
+    Raised when the Stack Exchange API quota drops to the configured reserve.
+    """
+
+
+class TokenBucketRateLimiter:
+    """
+    Token-bucket rate limiter shared by every request of an async collection run.
+    It also honors the API's `backoff` field and stops issuing requests once
+    `quota_remaining` reaches the configured reserve.
+    """
+
+    def __init__(self, rate: float = 10.0, capacity: Optional[float] = None, min_quota: int = 0):
+        """
+        Initialize the rate limiter.
+
+        Args:
+            rate (float, optional): Tokens (requests) added per second. Defaults to 10.0.
+            capacity (float, optional): Maximum burst size. Defaults to the rate.
+            min_quota (int, optional): Stop once quota_remaining drops to this value. Defaults to 0.
+        """
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self.tokens = self.capacity
+        self.min_quota = min_quota
+        self.quota_remaining = None
+        self.quota_max = None
+        self.requests_made = 0
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        # Created lazily so the limiter can be built outside of a running event loop
+        self._lock = None
+
+    @property
+    def exhausted(self) -> bool:
+        """bool: Whether the reported quota has reached the reserve."""
+        return self.quota_remaining is not None and self.quota_remaining <= self.min_quota
+
+    def _refill(self, now: float):
+        """
+        Add tokens for the time elapsed since the last refill.
+
+        Args:
+            now (float): Current monotonic time.
+        """
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self):
+        """
+        Wait until a request may be sent, then consume one token.
+
+        Raises:
+            QuotaExhaustedError: If the API quota has reached the reserve.
+        """
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            while True:
+                if self.exhausted:
+                    raise QuotaExhaustedError(f"API quota exhausted ({self.quota_remaining} requests remaining)")
+
+                now = time.monotonic()
+                if now < self._blocked_until:
+                    await asyncio.sleep(self._blocked_until - now)
+                    continue
+
+                self._refill(now)
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    self.requests_made += 1
+                    return
+
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def update(self, data: Dict[str, Any]):
+        """
+        Update limiter state from the wrapper fields of an API response.
+
+        Args:
+            data (Dict[str, Any]): Decoded API response.
+        """
+        if 'backoff' in data:
+            backoff = data['backoff']
+            print(f"API backoff requested. Pausing all requests for {backoff} seconds...")
+            self.backoff(backoff)
+
+        if 'quota_remaining' in data:
+            self.quota_remaining = data['quota_remaining']
+        if 'quota_max' in data:
+            self.quota_max = data['quota_max']
+
+    def backoff(self, seconds: float):
+        """
+        Block every request for the given number of seconds.
+
+        Args:
+            seconds (float): Time to wait before the next request.
+        """
+        self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
@@ -0,0 +1,209 @@
+import html
+import json
+import os
+import re
+import shutil
+import string
+from array import array
+from typing import Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from dataset_writer import parse_list_value
+from nltk_resources import get_stopwords
+from post_store import remove_old_versions, versioned_name
+from preprocessor import CONTRACTION_PATTERN, PUNCTUATION_TABLE, SPLIT_OFF_PATTERN, URL_PATTERN, _split_contraction
+
+# Longer tokens (base64, hashes, minified code) are not indexed
+MAX_TOKEN_LENGTH = 40
+
+HTML_TAG_PATTERN = re.compile(r"<[^>]*>")
+
+RANKED_INDEX_VERSION = 1
+
+# Ranked fields: the preprocessed column each is read from, and its BM25F weight
+RANKED_FIELDS = {
+    'title': ('processed_title', 3.0),
+    'description': ('processed_description', 1.5),
+    'tags': ('tags', 1.0),
+}
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Characters of each description kept for result snippets
+SNIPPET_SOURCE_LENGTH = 1000
+
+def field_text(column: str, value) -> str:
+    """
+    Get the searchable text of one field value: tags joined by spaces, HTML tags
+    removed and entities decoded.
+
+    Args:
+        column (str): Field name.
+        value: Stored value.
+
+    Returns:
+        str: Plain text.
+    """
+    if column == 'tags':
+        return " ".join(str(tag) for tag in parse_list_value(value))
+    if not isinstance(value, str):
+        return ""
+    return html.unescape(HTML_TAG_PATTERN.sub(" ", value))
+
+def preprocessed_terms(text: str) -> List[str]:
+    """
+    Tokenize text the way DataPreprocessor does after HTML cleaning: URLs removed,
+    lowercased, ASCII punctuation removed, and unicode quotes, dashes and contractions
+    split off. Stopwords are kept. The web app applies the same rules to queries,
+    from the patterns saved in the ranked index.
+
+    Args:
+        text (str): Plain text.
+
+    Returns:
+        List[str]: Tokens.
+    """
+    if not isinstance(text, str):
+        return []
+    text = URL_PATTERN.sub('', text).lower().translate(PUNCTUATION_TABLE)
+    text = SPLIT_OFF_PATTERN.sub(r" \1 ", text)
+    return CONTRACTION_PATTERN.sub(_split_contraction, f" {text} ").split()
+
+def ranked_field_terms(df: pd.DataFrame, field: str) -> Iterable[List[str]]:
+    """
+    Get the tokens of one ranked field for every post. Preprocessed columns are
+    already tokenized; tags, and raw columns of datasets that were not preprocessed,
+    go through preprocessed_terms().
+
+    Args:
+        df (pd.DataFrame): Dataset.
+        field (str): Key of RANKED_FIELDS.
+
+    Returns:
+        Iterable[List[str]]: Tokens per post.
+    """
+    column = RANKED_FIELDS[field][0]
+    if column == 'tags':
+        return (preprocessed_terms(field_text('tags', value)) for value in df['tags']) \
+            if 'tags' in df.columns else ([] for _ in range(len(df)))
+    if column in df.columns:
+        return (value.split() if isinstance(value, str) else [] for value in df[column])
+    if field in df.columns:
+        return (preprocessed_terms(field_text(field, value)) for value in df[field])
+    return ([] for _ in range(len(df)))
+
+def write_ranked_index(df: pd.DataFrame, directory: str, stop_words: Optional[Iterable[str]] = None) -> str:
+    """
+    Build a BM25F relevance index over the preprocessed title, description and tags
+    and save it as numpy arrays that the web app memory-maps:
+
+    - terms.npy / term_offsets.npy: sorted vocabulary and each term's slice of the postings
+    - postings.npy / impacts.npy: post positions and their score contribution for the
+      term, ordered by descending impact, so the best posts for a term come first
+    - snippets.bin / snippet_offsets.npy: the start of every description as plain
+      text (UTF-8), for highlighted result snippets
+    - meta.json: field weights, BM25 parameters, and the tokenization rules and
+      stopwords the web app needs to tokenize queries like DataPreprocessor
+
+    An impact is the full BM25F score of one term in one post, idf included, so a
+    query's score is the sum of the impacts of its terms.
+
+    Args:
+        df (pd.DataFrame): Dataset, in post store row order.
+        directory (str): Base path of the output. Each build goes to a new <directory>-<version>
+                         directory, so a reader of the previous one is never left without it.
+        stop_words (Optional[Iterable[str]], optional): Stopwords the query tokenizer treats as
+            optional terms. Defaults to None, which uses DataPreprocessor's English list.
+
+    Returns:
+        str: Path to the index directory, to be listed in the manifest.
+    """
+    n_posts = len(df)
+    fields = list(RANKED_FIELDS)
+    stop_words = sorted(stop_words if stop_words is not None else get_stopwords('english'))
+
+    # Flat (term id, post, field) triples and the token count of every field
+    vocabulary = {}
+    term_ids, posts, field_ids = array('i'), array('i'), array('b')
+    lengths = np.zeros((len(fields), n_posts), dtype=np.float64)
+    for f, field in enumerate(fields):
+        for post, tokens in enumerate(ranked_field_terms(df, field)):
+            lengths[f, post] = len(tokens)
+            for token in tokens:
+                if len(token) <= MAX_TOKEN_LENGTH:
+                    term_ids.append(vocabulary.setdefault(token, len(vocabulary)))
+                    posts.append(post)
+                    field_ids.append(f)
+
+    terms = np.array(sorted(vocabulary), dtype=f"<U{MAX_TOKEN_LENGTH}")
+    rank = np.empty(len(vocabulary), dtype=np.int64)
+    rank[[vocabulary[term] for term in terms.tolist()]] = np.arange(len(vocabulary))
+
+    term_ids = rank[np.frombuffer(term_ids, dtype=np.int32)] if len(term_ids) else np.array([], dtype=np.int64)
+    posts = np.frombuffer(posts, dtype=np.int32).astype(np.int64)
+    field_ids = np.frombuffer(field_ids, dtype=np.int8).astype(np.int64)
+
+    # Term frequency of each (term, post, field)
+    keys, tf = np.unique((term_ids * n_posts + posts) * len(fields) + field_ids, return_counts=True)
+    field_ids = keys % len(fields)
+    pairs = keys // len(fields)
+    posts = pairs % n_posts
+
+    # BM25F: length-normalized, weighted frequencies summed over the fields first
+    average_lengths = np.maximum(lengths.mean(axis=1), 1e-9) if n_posts else np.ones(len(fields))
+    weights = np.array([RANKED_FIELDS[field][1] for field in fields])
+    norms = 1 - BM25_B + BM25_B * lengths[field_ids, posts] / average_lengths[field_ids]
+    pairs, pair_index = np.unique(pairs, return_inverse=True)
+    weighted_tf = np.bincount(pair_index, weights=weights[field_ids] * tf / norms, minlength=len(pairs))
+
+    term_ids = pairs // n_posts if n_posts else pairs
+    posts = (pairs % n_posts if n_posts else pairs).astype(np.int32)
+    document_frequency = np.bincount(term_ids, minlength=len(terms))
+    idf = np.log(1 + (n_posts - document_frequency + 0.5) / (document_frequency + 0.5))
+    impacts = (idf[term_ids] * weighted_tf * (BM25_K1 + 1) / (BM25_K1 + weighted_tf)).astype(np.float32)
+
+    # Within each term: highest impact first, ties in post order
+    order = np.lexsort((posts, -impacts, term_ids))
+    term_ids, posts, impacts = term_ids[order], posts[order], impacts[order]
+    term_offsets = np.searchsorted(term_ids, np.arange(len(terms) + 1)).astype(np.int64)
+
+    snippets = [" ".join(field_text('description', value).split())[:SNIPPET_SOURCE_LENGTH].encode('utf-8')
+                for value in (df['description'] if 'description' in df.columns else [""] * n_posts)]
+    snippet_offsets = np.zeros(n_posts + 1, dtype=np.int64)
+    np.cumsum([len(snippet) for snippet in snippets], out=snippet_offsets[1:])
+
+    parent, name = os.path.split(directory.rstrip('/'))
+    index_directory = os.path.join(parent, versioned_name(name))
+    tmp_directory = f"{index_directory}.tmp"
+    shutil.rmtree(tmp_directory, ignore_errors=True)
+    os.makedirs(tmp_directory)
+    np.save(os.path.join(tmp_directory, "terms.npy"), terms)
+    np.save(os.path.join(tmp_directory, "term_offsets.npy"), term_offsets)
+    np.save(os.path.join(tmp_directory, "postings.npy"), posts)
+    np.save(os.path.join(tmp_directory, "impacts.npy"), impacts)
+    np.save(os.path.join(tmp_directory, "snippet_offsets.npy"), snippet_offsets)
+    with open(os.path.join(tmp_directory, "snippets.bin"), "wb") as f:
+        f.write(b"".join(snippets))
+    with open(os.path.join(tmp_directory, "meta.json"), "w") as f:
+        json.dump({
+            "version": RANKED_INDEX_VERSION,
+            "fields": {field: {"column": column, "weight": weight} for field, (column, weight) in RANKED_FIELDS.items()},
+            "k1": BM25_K1,
+            "b": BM25_B,
+            "total_posts": n_posts,
+            "terms": len(terms),
+            "postings": len(posts),
+            "max_token_length": MAX_TOKEN_LENGTH,
+            # Query tokenization, as in preprocessed_terms()
+            "url_pattern": URL_PATTERN.pattern,
+            "punctuation": string.punctuation,
+            "split_off_pattern": SPLIT_OFF_PATTERN.pattern,
+            "contraction_pattern": CONTRACTION_PATTERN.pattern,
+            "stop_words": stop_words,
+        }, f, indent=2)
+
+    os.replace(tmp_directory, index_directory)
+    remove_old_versions(parent, name)
+    return index_directory
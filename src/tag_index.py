@@ -0,0 +1,181 @@
+import os
+from collections import Counter
+from typing import Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from dataset_writer import dataset_fingerprint, load_dataset, parse_list_value
+
+def tag_index_path(dataset_path: str) -> str:
+    """
+    Get the path of the parsed-tags sidecar of a dataset.
+
+    Args:
+        dataset_path (str): Dataset path (CSV file or Parquet dataset).
+
+    Returns:
+        str: Sidecar path, e.g. "../data/dataset.csv.tags.npz".
+    """
+    return dataset_path.rstrip('/') + ".tags.npz"
+
+
+class TagIndex:
+    """
+    Tags of every post in a dataset, parsed once and stored categorical-coded: a
+    vocabulary of distinct tags (in order of first appearance) plus, per post, a
+    slice of codes into it (CSR layout). Counting tags or matching something against
+    every tag only needs to look at each distinct tag once.
+    """
+
+    def __init__(self, vocabulary: List[str], indptr: np.ndarray, codes: np.ndarray):
+        """
+        Wrap parsed tags.
+
+        Args:
+            vocabulary (List[str]): Distinct tags.
+            indptr (np.ndarray): Post i has the codes codes[indptr[i]:indptr[i + 1]].
+            codes (np.ndarray): Positions in the vocabulary.
+        """
+        self.vocabulary = list(vocabulary)
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.codes = np.asarray(codes, dtype=np.int32)
+
+    @classmethod
+    def from_values(cls, values: Iterable) -> "TagIndex":
+        """
+        Parse a tags column.
+
+        Args:
+            values (Iterable): Stored tag values, one per post (lists, repr strings,
+                               space-separated strings or missing values).
+
+        Returns:
+            TagIndex: Parsed tags.
+        """
+        tag_lists = [[str(tag) for tag in parse_list_value(value)] for value in values]
+        lengths = np.fromiter((len(tags) for tags in tag_lists), dtype=np.int64, count=len(tag_lists))
+        indptr = np.zeros(len(tag_lists) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=indptr[1:])
+
+        flat = [tag for tags in tag_lists for tag in tags]
+        codes, vocabulary = pd.factorize(pd.Series(flat, dtype=object), sort=False)
+        return cls(vocabulary.tolist(), indptr, codes)
+
+    def __len__(self) -> int:
+        return len(self.indptr) - 1
+
+    def post_tags(self, post: int) -> List[str]:
+        """
+        Get the tags of one post.
+
+        Args:
+            post (int): Post position.
+
+        Returns:
+            List[str]: Tags.
+        """
+        return [self.vocabulary[code] for code in self.codes[self.indptr[post]:self.indptr[post + 1]]]
+
+    def lists(self) -> List[List[str]]:
+        """
+        Get the tags of every post as Python lists.
+
+        Returns:
+            List[List[str]]: Tags per post.
+        """
+        tags = np.array(self.vocabulary, dtype=object)[self.codes].tolist()
+        return [tags[start:end] for start, end in zip(self.indptr[:-1].tolist(), self.indptr[1:].tolist())]
+
+    def counts(self) -> Counter:
+        """
+        Count how many times each tag is used.
+
+        Returns:
+            Counter: Tag counts; ties keep the order of first appearance.
+        """
+        counts = np.bincount(self.codes, minlength=len(self.vocabulary))
+        return Counter(dict(zip(self.vocabulary, counts.tolist())))
+
+    def posts_with_tags(self, codes: Iterable[int]) -> np.ndarray:
+        """
+        Find the posts that have at least one of the given tags.
+
+        Args:
+            codes (Iterable[int]): Vocabulary positions.
+
+        Returns:
+            np.ndarray: Sorted post positions.
+        """
+        wanted = np.zeros(len(self.vocabulary), dtype=bool)
+        wanted[list(codes)] = True
+        hits = np.flatnonzero(wanted[self.codes])
+        # Map each matching code back to its post
+        return np.unique(np.searchsorted(self.indptr, hits, side='right') - 1)
+
+    def save(self, path: str, fingerprint: str = ""):
+        """
+        Save the index as a compressed .npz file (readable with numpy alone).
+
+        Args:
+            path (str): Output path.
+            fingerprint (str, optional): dataset_fingerprint() of the dataset it was built from.
+        """
+        tmp_path = f"{path}.tmp.npz"
+        np.savez_compressed(
+            tmp_path,
+            vocabulary=np.array(self.vocabulary, dtype=str),
+            indptr=self.indptr,
+            codes=self.codes,
+            fingerprint=np.array(fingerprint),
+        )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str, fingerprint: Optional[str] = None) -> Optional["TagIndex"]:
+        """
+        Load an index saved with save().
+
+        Args:
+            path (str): Path to the .npz file.
+            fingerprint (Optional[str], optional): Expected dataset fingerprint. Defaults to None (no check).
+
+        Returns:
+            Optional[TagIndex]: The index, or None if it is missing or was built from other data.
+        """
+        if not os.path.exists(path):
+            return None
+        with np.load(path) as data:
+            if fingerprint is not None and str(data['fingerprint']) != fingerprint:
+                return None
+            return cls(data['vocabulary'].tolist(), data['indptr'], data['codes'])
+
+def load_tag_index(dataset_path: str, tags: Optional[pd.Series] = None) -> TagIndex:
+    """
+    Get the parsed tags of a dataset, from its sidecar when that is up to date.
+    Otherwise the tags are parsed (from the given column, or by reading only the
+    tags column of the dataset) and the sidecar is rewritten.
+
+    Args:
+        dataset_path (str): Dataset path (CSV file or Parquet dataset).
+        tags (Optional[pd.Series], optional): Already loaded tags column of the dataset. Defaults to None.
+
+    Returns:
+        TagIndex: Parsed tags, one entry per dataset row.
+    """
+    sidecar_path = tag_index_path(dataset_path)
+    fingerprint = dataset_fingerprint(dataset_path)
+
+    index = TagIndex.load(sidecar_path, fingerprint)
+    if index is not None and (tags is None or len(index) == len(tags)):
+        return index
+
+    if tags is None:
+        tags = load_dataset(dataset_path, columns=['tags'])['tags']
+    index = TagIndex.from_values(tags)
+
+    try:
+        index.save(sidecar_path, fingerprint)
+    except OSError as e:
+        print(f"Could not save parsed tags to {sidecar_path}: {e}")
+    return index
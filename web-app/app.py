@@ -1,4 +1,13 @@
 import os
+import re
+import ast
+import html
+import sqlite3
+import queue
+import threading
+import contextlib
+import io
+import numpy as np
 import pandas as pd
 import json
 from flask import Flask, render_template, request, jsonify, redirect, url_for
@@ -6,31 +15,11 @@ from datetime import datetime
 import logging
 import urllib.parse
 import functools
+import inspect
+import sys
 import gc
 import time
-
-# Handle different cache implementations
-try:
-    from werkzeug.contrib.cache import SimpleCache
-except ImportError:
-    try:
-        from cachelib import SimpleCache
-    except ImportError:
-        # Create a simple in-memory cache implementation if dependencies not available
-        class SimpleCache:
-            def __init__(self, threshold=500, default_timeout=300):
-                self._cache = {}
-                self.default_timeout = default_timeout
-                self.threshold = threshold
-            
-            def get(self, key):
-                return self._cache.get(key)
-                
-            def set(self, key, value, timeout=None):
-                self._cache[key] = value
-                
-            def clear(self):
-                self._cache.clear()
+from collections import OrderedDict
 
 logging.basicConfig(level=logging.INFO)  # Changed from DEBUG to INFO to reduce log volume
 logger = logging.getLogger(__name__)
@@ -48,14 +37,154 @@ else:
     DATA_DIR = os.path.join(PARENT_DIR, 'data')  # data directory in parent
 
 CATEGORIES_DIR = os.path.join(DATA_DIR, 'categories')
+KNOWLEDGE_BASE_DB = os.path.join(DATA_DIR, 'knowledge_base.db')  # Exported by the categorizer
 VISUALIZATIONS_DIR = os.path.join(DATA_DIR, 'visualizations')
 API_KEY = os.environ.get('STACK_API_KEY', "rl_QSELmsmpZPK2JvKfEHYZ8Pa9e")
 
 # Memory management settings
 MAX_SEARCH_RESULTS = 100     # Limit search results
+SNIPPET_LENGTH = 240         # Characters of description shown with a search result
+SNIPPET_CONTEXT = 60         # Characters shown before the first highlighted term
+FTS_FIELD_WEIGHTS = (3.0, 1.5, 1.0)  # BM25 weights of title, description and tags in the knowledge base
 CACHE_TIMEOUT = 3600         # Cache expiration in seconds (1 hour)
+PAGE_CACHE_TIMEOUT = 600     # Cache expiration of post and search result pages (10 minutes)
+CACHE_MAX_BYTES = int(os.environ.get('CACHE_MAX_BYTES', 64 * 1024 * 1024))  # Approximate cache size limit
 CHUNK_SIZE = 1000            # Number of rows to process at a time
-cache = SimpleCache(threshold=10, default_timeout=CACHE_TIMEOUT)  # In-memory cache limited to 10 items
+
+def approximate_size(value):
+    """Estimate the memory held by a cached value, including what its containers hold."""
+    if isinstance(value, np.ndarray):
+        return sys.getsizeof(value) + value.nbytes
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(approximate_size(k) + approximate_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sys.getsizeof(value) + sum(approximate_size(item) for item in value)
+    return sys.getsizeof(value)
+
+class LRUCache:
+    """
+    Thread-safe in-process cache. Entries expire after their timeout, and the least
+    recently used ones are evicted once the approximate size of all values would
+    exceed max_bytes. Hits, misses, evictions and expirations are counted.
+    """
+    
+    def __init__(self, max_bytes=CACHE_MAX_BYTES, default_timeout=CACHE_TIMEOUT):
+        self.max_bytes = max_bytes
+        self.default_timeout = default_timeout
+        self._entries = OrderedDict()  # key -> (value, size, expiry time)
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+    
+    def get(self, key):
+        """Get a value, or None if it is missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[2] <= time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+    
+    def set(self, key, value, timeout=None):
+        """Store a value for timeout seconds (default_timeout if None). Values larger than the whole cache are not stored."""
+        size = approximate_size(value)
+        expires = time.monotonic() + (self.default_timeout if timeout is None else timeout)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            if size > self.max_bytes:
+                return False
+            while self.current_bytes + size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+            self._entries[key] = (value, size, expires)
+            self.current_bytes += size
+            return True
+    
+    def _remove(self, key):
+        _, size, _ = self._entries.pop(key)
+        self.current_bytes -= size
+    
+    def clear(self):
+        """Remove every entry. The counters are kept."""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+    
+    def stats(self):
+        """Get the size and counters of the cache."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self.current_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations
+            }
+
+cache = LRUCache()
+DB_POOL_SIZE = 4             # Idle database connections kept open
+
+class ConnectionPool:
+    """
+    Small pool of read-only SQLite connections. The pipeline replaces the database file
+    when it exports again, so connections to the old file are dropped when it changes.
+    """
+    
+    def __init__(self, db_path, size=DB_POOL_SIZE):
+        self.db_path = db_path
+        self.size = size
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._mtime = None
+    
+    def available(self):
+        """Check whether the database has been exported."""
+        return os.path.exists(self.db_path)
+    
+    def _connect(self):
+        uri = f"file:{urllib.parse.quote(self.db_path)}?mode=ro"
+        return sqlite3.connect(uri, uri=True, check_same_thread=False)
+    
+    @contextlib.contextmanager
+    def connection(self):
+        """Borrow a connection for the duration of a with block."""
+        mtime = os.path.getmtime(self.db_path)
+        with self._lock:
+            if mtime != self._mtime:
+                while not self._idle.empty():
+                    self._idle.get_nowait().close()
+                self._mtime = mtime
+        
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = self._connect()
+        
+        try:
+            yield conn
+        finally:
+            with self._lock:
+                keep = mtime == self._mtime and self._idle.qsize() < self.size
+                if keep:
+                    self._idle.put(conn)
+            if not keep:
+                conn.close()
+
+db_pool = ConnectionPool(KNOWLEDGE_BASE_DB)
 
 # Run setup script in deployment environments
 if os.environ.get('VERCEL', False):
@@ -78,39 +207,191 @@ os.makedirs(os.path.join(app.static_folder, 'css'), exist_ok=True)
 os.makedirs(os.path.join(app.static_folder, 'js'), exist_ok=True)
 
 # Helper functions
-def cached(key_prefix, timeout=None):
-    """Function decorator for caching results"""
+def data_version():
+    """
+    Identify the current output of the pipeline by the modification times of the files
+    it rewrites. Cache keys include it, so a new run is served without clearing the cache.
+    """
+    paths = [
+        KNOWLEDGE_BASE_DB,
+        os.path.join(CATEGORIES_DIR, 'manifest.json'),
+        os.path.join(DATA_DIR, 'preprocessed_nlp_dataset.csv'),
+        os.path.join(DATA_DIR, 'nlp_stackoverflow_dataset.csv'),
+    ]
+    return tuple(os.stat(path).st_mtime_ns if os.path.exists(path) else 0 for path in paths)
+
+def cached(key_prefix, timeout=None, unless=None):
+    """
+    Function decorator for caching results. The key is the prefix, the data version
+    and the call's arguments with defaults filled in, so f(1) and f(x=1) share an entry.
+    None is never cached, nor are results for which unless(result) is true.
+    """
     def decorator(f):
+        signature = inspect.signature(f)
+        
         @functools.wraps(f)
         def decorated_function(*args, **kwargs):
-            cache_key = f"{key_prefix}:{':'.join(str(arg) for arg in args)}:{':'.join(f'{k}={v}' for k, v in kwargs.items())}"
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            cache_key = (key_prefix, data_version(), tuple(bound.arguments.items()))
             rv = cache.get(cache_key)
             if rv is not None:
                 return rv
             rv = f(*args, **kwargs)
-            cache.set(cache_key, rv, timeout=timeout)
+            if rv is not None and not (unless and unless(rv)):
+                cache.set(cache_key, rv, timeout=timeout)
             return rv
         return decorated_function
     return decorator
 
+def parse_tags(value):
+    """Parse a stored tags value (list repr, space-separated string or missing) without eval."""
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return [str(tag) for tag in value]
+    if not isinstance(value, str) or not value.strip():
+        return []
+    value = value.strip()
+    if value.startswith('[') and value.endswith(']'):
+        try:
+            tags = ast.literal_eval(value)
+            return [str(tag) for tag in tags] if isinstance(tags, (list, tuple)) else [str(tags)]
+        except (ValueError, SyntaxError):
+            return [tag.strip(" '\"") for tag in value.strip('[]').split(',') if tag.strip(" '\"")]
+    return value.split()
+
+def load_tag_counts(dataset_path):
+    """Count tags from the parsed-tags sidecar the pipeline writes next to the dataset, if it is current."""
+    sidecar_path = dataset_path.rstrip('/') + '.tags.npz'
+    if not os.path.exists(sidecar_path) or os.path.getmtime(sidecar_path) < os.path.getmtime(dataset_path):
+        return None
+    
+    try:
+        with np.load(sidecar_path) as data:
+            vocabulary = data['vocabulary'].tolist()
+            counts = np.bincount(data['codes'], minlength=len(vocabulary)).tolist()
+    except Exception as e:
+        logger.error(f"Error loading {sidecar_path}: {e}")
+        return None
+    
+    return dict(zip(vocabulary, counts))
+
 @cached('category_types', timeout=3600)
 def load_category_types():
     """Load all category types."""
     logger.info(f"Looking for categories in: {CATEGORIES_DIR}")
+    if db_pool.available():
+        try:
+            with db_pool.connection() as conn:
+                return [row[0] for row in conn.execute(
+                    "SELECT method FROM categories GROUP BY method ORDER BY MIN(id)")]
+        except sqlite3.Error as e:
+            logger.error(f"Error reading category types from {KNOWLEDGE_BASE_DB}: {e}")
+    
     if os.path.exists(CATEGORIES_DIR):
+        # The search indexes live next to the category directories, as <name>-<version>
+        manifest = load_category_manifest()
+        index_names = {index_name(manifest['ranked_index'])} if manifest and 'ranked_index' in manifest else set()
         types = [d for d in os.listdir(CATEGORIES_DIR) 
-                if os.path.isdir(os.path.join(CATEGORIES_DIR, d))]
+                if os.path.isdir(os.path.join(CATEGORIES_DIR, d))
+                and index_name(d) not in index_names]
         logger.info(f"Found category types: {types}")
         return types
     logger.info(f"Categories directory not found at: {CATEGORIES_DIR}")
     return []
 
+def index_name(directory):
+    """Get the base name of a (possibly versioned or temporary) index directory."""
+    return re.sub(r'-\d+$', '', directory.replace('.tmp', ''))
+
+@cached('category_manifest', timeout=3600)
+def load_category_manifest():
+    """Load the category manifest written by the categorizer, if there is one."""
+    manifest_path = os.path.join(CATEGORIES_DIR, 'manifest.json')
+    if not os.path.exists(manifest_path):
+        return None
+    
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception as e:
+        logger.error(f"Error loading {manifest_path}: {e}")
+        return None
+
+def normalize_category_name(name):
+    """Normalize a category name from a URL, manifest or file name for comparison."""
+    return urllib.parse.unquote(name).replace('_', ' ').strip().lower()
+
+def find_manifest_category(category_type, category_name):
+    """Find a category in the manifest. Returns (method entry, category entry), or (None, None)."""
+    manifest = load_category_manifest()
+    if manifest is None:
+        return None, None
+    
+    method = manifest['methods'].get(category_type) or manifest['methods'].get(category_type.lower().replace(' ', '_'))
+    if method is None:
+        return None, None
+    
+    wanted = normalize_category_name(category_name)
+    for name, category in method['categories'].items():
+        if wanted in (normalize_category_name(name), normalize_category_name(category['slug'])):
+            return method, category
+    return None, None
+
+@cached('category_positions', timeout=3600)
+def load_category_positions(membership_path):
+    """Load the post positions of every category of one method (column offsets and positions)."""
+    with np.load(os.path.join(CATEGORIES_DIR, membership_path)) as data:
+        return data['indptr'], data['indices']
+
+def read_store_posts(positions):
+    """Read posts from the shared post store by row position, with one seek per post."""
+    manifest = load_category_manifest()
+    offsets = np.load(os.path.join(CATEGORIES_DIR, manifest['post_offsets']), mmap_mode='r')
+    
+    posts = []
+    with open(os.path.join(CATEGORIES_DIR, manifest['post_store']), 'rb') as f:
+        for position in positions:
+            start, end = int(offsets[position]), int(offsets[position + 1])
+            f.seek(start)
+            posts.append(json.loads(f.read(end - start)))
+    return posts
+
+def load_manifest_posts(method, category, page, per_page):
+    """Load one page of a category listed in the manifest."""
+    indptr, indices = load_category_positions(method['membership'])
+    column = category['column']
+    start, end = int(indptr[column]), int(indptr[column + 1])
+    
+    offset = start + max(page - 1, 0) * per_page
+    positions = indices[offset:min(offset + per_page, end)]
+    return read_store_posts(positions), end - start
+
 @cached('categories', timeout=3600)
 def load_categories(category_type):
     """Load categories for a specific type."""
     categories_path = os.path.join(CATEGORIES_DIR, category_type)
     logger.info(f"Loading categories from: {categories_path}")
     
+    if db_pool.available():
+        try:
+            with db_pool.connection() as conn:
+                rows = conn.execute(
+                    "SELECT name, post_count, slug FROM categories WHERE method = ? ORDER BY post_count DESC, id",
+                    (category_type,)
+                ).fetchall()
+            if rows:
+                return [{'name': name, 'count': count, 'file': slug} for name, count, slug in rows]
+        except sqlite3.Error as e:
+            logger.error(f"Error reading categories from {KNOWLEDGE_BASE_DB}: {e}")
+    
+    # Categories saved by the categorizer are listed in the manifest with their counts
+    manifest = load_category_manifest()
+    if manifest is not None and category_type in manifest['methods']:
+        categories = [{'name': name, 'count': category['count'], 'file': category['slug']}
+                      for name, category in manifest['methods'][category_type]['categories'].items()]
+        logger.info(f"Found {len(categories)} categories in the manifest")
+        return sorted(categories, key=lambda x: x['count'], reverse=True)
+    
     if os.path.exists(categories_path):
         categories = []
         for filename in os.listdir(categories_path):
@@ -118,20 +399,9 @@ def load_categories(category_type):
                 category_name = filename.replace('.csv', '').replace('.json', '').replace('_', ' ')
                 file_path = os.path.join(categories_path, filename)
                 
-                # Count items in the file - more efficiently
+                # The row index of the file holds its count
                 try:
-                    count = 0
-                    if filename.endswith('.csv'):
-                        # Get count without loading entire file
-                        with open(file_path, 'r', encoding='utf-8') as f:
-                            # Count header + lines
-                            for i, _ in enumerate(f):
-                                pass
-                            count = i  # i will be the last line index
-                    else:  # JSON file
-                        with open(file_path, 'r', encoding='utf-8') as f:
-                            data = json.load(f)
-                            count = len(data if isinstance(data, list) else data.get('posts', []))
+                    count = len(load_row_index(file_path))
                 except Exception as e:
                     logger.error(f"Error loading {filename}: {e}")
                     count = 0
@@ -148,6 +418,167 @@ def load_categories(category_type):
     logger.info(f"Category path not found: {categories_path}")
     return []
 
+def load_database_posts(category_type, category_name, page, per_page):
+    """Load one page of a category from the knowledge base. Returns (posts, total count), or None if it is not there."""
+    wanted = normalize_category_name(category_name)
+    methods = (category_type, category_type.lower().replace(' ', '_'))
+    with db_pool.connection() as conn:
+        category = conn.execute(
+            "SELECT id, post_count FROM categories WHERE method IN (?, ?) AND (name_key = ? OR slug_key = ?) "
+            "ORDER BY id LIMIT 1",
+            methods + (wanted, wanted)
+        ).fetchone()
+        if category is None:
+            return None
+        
+        category_id, total_count = category
+        rows = conn.execute(
+            "SELECT p.record FROM category_posts c JOIN posts p ON p.id = c.post_id "
+            "WHERE c.category_id = ? ORDER BY c.post_id LIMIT ? OFFSET ?",
+            (category_id, per_page, max(page - 1, 0) * per_page)
+        ).fetchall()
+    return [json.loads(record) for record, in rows], total_count
+
+# Row index sidecars of per-category files, by file path: (file mtime, row spans)
+row_index_state = {}
+row_index_lock = threading.Lock()
+
+def csv_row_spans(file_path):
+    """Find the byte span of every data row of a CSV file. Newlines inside quoted fields do not end a row."""
+    if os.path.getsize(file_path) == 0:
+        return np.zeros((0, 2), dtype=np.int64)
+    
+    data = np.memmap(file_path, dtype=np.uint8, mode='r')
+    newlines = np.flatnonzero(data == ord('\n'))
+    quotes = np.flatnonzero(data == ord('"'))
+    # A newline ends a row when the quotes before it are balanced
+    ends = newlines[np.searchsorted(quotes, newlines) % 2 == 0] + 1
+    if not len(ends) or ends[-1] < len(data):
+        ends = np.append(ends, len(data))
+    starts = np.concatenate(([0], ends[:-1]))
+    spans = np.column_stack((starts, ends))[1:]  # Without the header
+    
+    # pandas skips blank lines
+    blank = (spans[:, 1] - spans[:, 0] <= 2) & np.isin(data[spans[:, 0]], (ord('\n'), ord('\r')))
+    return spans[~blank].astype(np.int64)
+
+def json_row_spans(file_path):
+    """Find the byte span of every post of a JSON category file (a list, or an object with a "posts" list)."""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        text = f.read()
+    decoder = json.JSONDecoder()
+    whitespace = re.compile(r'\s*')
+    
+    def skip(i, char=None):
+        i = whitespace.match(text, i).end()
+        if char is not None and text.startswith(char, i):
+            i = whitespace.match(text, i + 1).end()
+        return i
+    
+    i = skip(0)
+    if text.startswith('{', i):
+        i = skip(i, '{')
+        while not text.startswith('}', i):
+            key, i = decoder.raw_decode(text, i)
+            i = skip(i, ':')
+            if key == 'posts':
+                break
+            _, i = decoder.raw_decode(text, i)
+            i = skip(i, ',')
+    
+    spans = []
+    if text.startswith('[', i):
+        i = skip(i, '[')
+        while not text.startswith(']', i):
+            _, end = decoder.raw_decode(text, i)
+            spans.append((i, end))
+            i = skip(end, ',')
+    
+    # Character positions to byte positions
+    if not text.isascii():
+        positions = sorted({position for span in spans for position in span})
+        byte_positions, last, total = {}, 0, 0
+        for position in positions:
+            total += len(text[last:position].encode('utf-8'))
+            byte_positions[position] = total
+            last = position
+        spans = [(byte_positions[start], byte_positions[end]) for start, end in spans]
+    return np.array(spans, dtype=np.int64).reshape(-1, 2)
+
+def load_row_index(file_path):
+    """
+    Get the byte span of every post of a per-category CSV or JSON file, from the
+    .rows.npy sidecar next to it (memory-mapped). The sidecar is built on first use
+    and rebuilt when the file changes; its length is the post count.
+    """
+    mtime = os.path.getmtime(file_path)
+    state = row_index_state.get(file_path)
+    if state is not None and state[0] == mtime:
+        return state[1]
+    
+    with row_index_lock:
+        sidecar_path = file_path + '.rows.npy'
+        spans = None
+        if os.path.exists(sidecar_path) and os.path.getmtime(sidecar_path) >= mtime:
+            spans = np.load(sidecar_path, mmap_mode='r')
+            # A file rewritten within the same mtime tick shows in its size
+            if len(spans) and spans[-1, 1] > os.path.getsize(file_path):
+                spans = None
+        
+        if spans is None:
+            spans = csv_row_spans(file_path) if file_path.endswith('.csv') else json_row_spans(file_path)
+            try:
+                np.save(sidecar_path + '.tmp.npy', spans)
+                os.replace(sidecar_path + '.tmp.npy', sidecar_path)
+                spans = np.load(sidecar_path, mmap_mode='r')
+            except OSError as e:
+                # Read-only deployments keep the index in memory
+                logger.warning(f"Could not save row index {sidecar_path}: {e}")
+        
+        row_index_state[file_path] = (mtime, spans)
+        return spans
+
+def read_file_posts(file_path, offset, per_page):
+    """Read one page of a per-category CSV or JSON file with one seek and a bounded read."""
+    spans = load_row_index(file_path)
+    total_count = len(spans)
+    if offset >= total_count:
+        return [], total_count
+    
+    last = min(offset + per_page, total_count) - 1
+    start, end = int(spans[offset, 0]), int(spans[last, 1])
+    with open(file_path, 'rb') as f:
+        header = f.readline() if file_path.endswith('.csv') else b''
+        f.seek(start)
+        chunk = f.read(end - start)
+    
+    if file_path.endswith('.csv'):
+        posts_df = pd.read_csv(io.BytesIO(header + chunk))
+        
+        # Convert DataFrame to list of dictionaries
+        posts = []
+        for _, row in posts_df.iterrows():
+            post = {}
+            for col in row.index:
+                if col == 'tags':
+                    post[col] = parse_tags(row[col])
+                else:
+                    # Handle other fields
+                    post[col] = '' if pd.isna(row[col]) else str(row[col])
+            posts.append(post)
+        return posts, total_count
+    
+    # The posts and the separators between them form a JSON list
+    posts = json.loads(b'[' + chunk + b']')
+    
+    # Ensure tags is always a list
+    for post in posts:
+        if 'tags' not in post:
+            post['tags'] = []
+        elif not isinstance(post['tags'], list):
+            post['tags'] = [str(post['tags'])] if post['tags'] else []
+    return posts, total_count
+
 def get_file_path_for_category(category_type, category_name):
     """Helper to find the correct file path for a category with different naming variations."""
     normalized_type = category_type.lower().replace(' ', '_')
@@ -176,6 +607,7 @@ def get_file_path_for_category(category_type, category_name):
     
     return None, f"No matching file found for category: {category_name}"
 
+@cached('posts', timeout=PAGE_CACHE_TIMEOUT, unless=lambda rv: rv[2] is not None)  # Errors are not cached
 def load_posts(category_type, category_name, page=1, per_page=50):
     """Load posts with pagination to reduce memory usage."""
     logger.info(f"Loading posts for {category_type}/{category_name} (page {page})")
@@ -184,7 +616,22 @@ def load_posts(category_type, category_name, page=1, per_page=50):
         # URL decode the category name
         category_name = urllib.parse.unquote(category_name)
         
-        # Find the file path
+        # Categories exported to the knowledge base are paged with an indexed query
+        if db_pool.available():
+            try:
+                result = load_database_posts(category_type, category_name, page, per_page)
+                if result is not None:
+                    return result[0], result[1], None
+            except sqlite3.Error as e:
+                logger.error(f"Error reading posts from {KNOWLEDGE_BASE_DB}: {e}")
+        
+        # Categories in the manifest are read from the shared post store
+        method, category = find_manifest_category(category_type, category_name)
+        if category is not None:
+            posts, total_count = load_manifest_posts(method, category, page, per_page)
+            return posts, total_count, None
+        
+        # Otherwise find the per-category file written by older categorizer runs
         file_path, error = get_file_path_for_category(category_type, category_name)
         if error:
             return [], 0, error
@@ -192,69 +639,12 @@ def load_posts(category_type, category_name, page=1, per_page=50):
         logger.info(f"Found file: {file_path}")
         
         # Calculate pagination offsets
-        offset = (page - 1) * per_page
+        offset = max(page - 1, 0) * per_page
         
-        # Process based on file type
-        if file_path.endswith('.csv'):
-            # Get total row count first
-            total_count = 0
-            with open(file_path, 'r', encoding='utf-8') as f:
-                for i, _ in enumerate(f):
-                    pass
-                total_count = i  # i will be the last line index
-            
-            # Read only the necessary chunk
-            if offset >= total_count:
-                return [], total_count, None
-                
-            # Read only the needed chunk of data using skiprows and nrows
-            posts_df = pd.read_csv(file_path, skiprows=range(1, offset+1), nrows=per_page)
-            
-            # Convert DataFrame to list of dictionaries
-            posts = []
-            for _, row in posts_df.iterrows():
-                post = {}
-                for col in row.index:
-                    if col == 'tags':
-                        # Handle tags field
-                        tags_value = row[col]
-                        if pd.isna(tags_value) or tags_value == '':
-                            post[col] = []
-                        elif isinstance(tags_value, str):
-                            if tags_value.startswith('[') and tags_value.endswith(']'):
-                                try:
-                                    tags = eval(tags_value)
-                                    post[col] = tags if isinstance(tags, list) else [tags_value]
-                                except:
-                                    post[col] = [tag.strip() for tag in tags_value.strip('[]').split(',') if tag.strip()]
-                            else:
-                                post[col] = [tag.strip() for tag in tags_value.split(',') if tag.strip()]
-                        else:
-                            post[col] = []
-                    else:
-                        # Handle other fields
-                        post[col] = '' if pd.isna(row[col]) else str(row[col])
-                posts.append(post)
-            
+        # Pages are read through the file's row index
+        if file_path.endswith(('.csv', '.json')):
+            posts, total_count = read_file_posts(file_path, offset, per_page)
             return posts, total_count, None
-            
-        elif file_path.endswith('.json'):
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                all_posts = data if isinstance(data, list) else data.get('posts', [])
-                total_count = len(all_posts)
-                
-                # Apply pagination
-                posts = all_posts[offset:offset+per_page]
-                
-                # Ensure tags is always a list
-                for post in posts:
-                    if 'tags' not in post:
-                        post['tags'] = []
-                    elif not isinstance(post['tags'], list):
-                        post['tags'] = [str(post['tags'])] if post['tags'] else []
-                
-                return posts, total_count, None
         
         return [], 0, "Unsupported file format"
             
@@ -271,23 +661,230 @@ def load_visualizations():
         return [f for f in os.listdir(VISUALIZATIONS_DIR) if f.endswith(('.png', '.jpg', '.jpeg'))]
     return []
 
+# Search index files opened by load_index(), replaced when the pipeline rebuilds an index
+search_index_state = {}
+
+def load_index(manifest_key, array_names):
+    """Open an index directory listed in the category manifest, memory-mapped, if there is one."""
+    manifest = load_category_manifest()
+    if manifest is None or manifest_key not in manifest:
+        return None
+    
+    index_dir = os.path.join(CATEGORIES_DIR, manifest[manifest_key])
+    meta_path = os.path.join(index_dir, 'meta.json')
+    if not os.path.exists(meta_path):
+        return None
+    
+    # Memory maps are kept here rather than in the cache, which may copy its values
+    mtime = os.path.getmtime(meta_path)
+    index = search_index_state.get(manifest_key)
+    if index is None or index['path'] != index_dir or index['mtime'] != mtime:
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        index = {name: np.load(os.path.join(index_dir, f'{name}.npy'), mmap_mode='r') for name in array_names}
+        index.update(meta=meta, mtime=mtime, path=index_dir)
+        search_index_state[manifest_key] = index
+    return index
+
+def load_ranked_index():
+    """Open the BM25F index written by the categorizer, if there is one."""
+    index = load_index('ranked_index', ('terms', 'term_offsets', 'postings', 'impacts', 'snippet_offsets'))
+    if index is not None and 'stop_words' not in index:
+        meta = index['meta']
+        index.update(
+            stop_words=frozenset(meta['stop_words']),
+            url_pattern=re.compile(meta['url_pattern']),
+            punctuation_table=str.maketrans('', '', meta['punctuation']),
+            split_off_pattern=re.compile(meta['split_off_pattern']),
+            contraction_pattern=re.compile(meta['contraction_pattern'])
+        )
+    return index
+
+def ranked_query_terms(query, index):
+    """Tokenize a query the way the pipeline's DataPreprocessor tokenized the ranked fields."""
+    text = index['url_pattern'].sub('', query).lower().translate(index['punctuation_table'])
+    text = index['split_off_pattern'].sub(r' \1 ', text)
+    text = index['contraction_pattern'].sub(
+        lambda match: ' ' + ' '.join(group for group in match.groups() if group is not None) + ' ', f' {text} ')
+    return list(dict.fromkeys(term for term in text.split() if len(term) <= index['meta']['max_token_length']))
+
+def rank_posts(index, terms, k):
+    """
+    Find the posts that contain every query term (stopwords are optional unless the
+    query has nothing else) and the k best of them by BM25F score. Returns the top
+    positions, best first, and the number of matching posts.
+    """
+    ranges = {term: find_term(index, term) for term in terms}
+    required = [term for term in terms if term not in index['stop_words']] or terms
+    if not required or any(ranges[term] is None for term in required):
+        return np.array([], dtype=np.int32), 0
+    
+    postings, impacts = index['postings'], index['impacts']
+    optional = [term for term in terms if term not in required and ranges[term] is not None]
+    
+    # Postings are ordered by impact, so one term's best posts are its first k postings
+    if len(required) == 1 and not optional:
+        start, end = ranges[required[0]]
+        return np.asarray(postings[start:min(start + k, end)]), end - start
+    
+    # Otherwise sum the impacts of every term and keep the posts that have all required terms
+    n_posts = index['meta']['total_posts']
+    scores = np.zeros(n_posts, dtype=np.float32)
+    hits = np.zeros(n_posts, dtype=np.int16)
+    for term in required + optional:
+        start, end = ranges[term]
+        term_posts = postings[start:end]
+        scores[term_posts] += impacts[start:end]
+        if term in required:
+            hits[term_posts] += 1
+    candidates = np.flatnonzero(hits == len(required))
+    
+    # Partial selection of the k best, then a full sort of those only (ties in post order)
+    candidate_scores = scores[candidates]
+    if k < len(candidates):
+        threshold = np.partition(candidate_scores, len(candidates) - k)[len(candidates) - k]
+        keep = candidate_scores >= threshold
+        candidates, candidate_scores = candidates[keep], candidate_scores[keep]
+    top = candidates[np.lexsort((candidates, -candidate_scores))][:k]
+    return top, int(np.count_nonzero(hits == len(required)))
+
+def read_snippets(index, positions):
+    """Read the plain-text description starts the ranked index keeps for snippets."""
+    offsets = index['snippet_offsets']
+    snippets = []
+    with open(os.path.join(index['path'], 'snippets.bin'), 'rb') as f:
+        for position in positions:
+            start, end = int(offsets[position]), int(offsets[position + 1])
+            f.seek(start)
+            snippets.append(f.read(end - start).decode('utf-8'))
+    return snippets
+
+def highlight_snippet(text, terms, index):
+    """
+    Cut a snippet around the first query term in a description and mark every query
+    term in it. Returns HTML: the text is escaped and the terms are wrapped in <mark>.
+    """
+    words = list(re.finditer(r'\S+', text))
+    matched = [set(word.group().lower().translate(index['punctuation_table']).split()) & terms for word in words]
+    first = next((i for i, hit in enumerate(matched) if hit), None)
+    
+    start = 0
+    if first is not None and words[first].end() > SNIPPET_LENGTH:
+        start = max(words[first].start() - SNIPPET_CONTEXT, 0)
+    end = start + SNIPPET_LENGTH
+    
+    parts = []
+    for word, hit in zip(words, matched):
+        if word.start() < start:
+            continue
+        if word.end() > end:
+            break
+        parts.append(f'<mark>{html.escape(word.group())}</mark>' if hit else html.escape(word.group()))
+    
+    # A single word longer than the snippet is cut
+    if not parts and words:
+        parts.append(html.escape(text[start:end]))
+    prefix = '… ' if start > 0 else ''
+    suffix = ' …' if end < len(text) else ''
+    return prefix + ' '.join(parts) + suffix
+
+def search_ranked_posts(index, query, page, per_page):
+    """Search the BM25F index. Returns one page of posts, best first, and the exact number of matches."""
+    terms = ranked_query_terms(query, index)
+    offset = max(page - 1, 0) * per_page
+    top, total = rank_posts(index, terms, offset + per_page)
+    positions = top[offset:offset + per_page]
+    if not len(positions):
+        return [], total
+    
+    term_set = set(terms)
+    posts = []
+    for post, snippet in zip(read_store_posts(positions), read_snippets(index, positions)):
+        result = search_result(post)
+        result['snippet'] = highlight_snippet(snippet, term_set, index)
+        posts.append(result)
+    return posts, total
+
+def find_term(index, term):
+    """Get the (start, end) range of a term's postings, or None if it is not indexed."""
+    terms = index['terms']
+    i = int(np.searchsorted(terms, term))
+    if i == len(terms) or terms[i] != term:
+        return None
+    return int(index['term_offsets'][i]), int(index['term_offsets'][i + 1])
+
+def search_result(post):
+    """Keep the fields a search result shows."""
+    return {
+        'title': post.get('title', ''),
+        'description': post.get('description', ''),
+        'accepted_answer': post.get('accepted_answer', ''),
+        'other_answers': post.get('other_answers', ''),
+        'tags': post.get('tags', [])
+    }
+
+def fts_query(query):
+    """
+    Turn a search query into an FTS5 MATCH expression: every word and quoted phrase
+    must match. Each part is quoted, so FTS5 operators in the query are matched as text.
+    """
+    parts = [quoted or word for quoted, word in re.findall(r'"([^"]*)"?|(\S+)', query)]
+    return " ".join('"' + part.replace('"', '""') + '"' for part in parts if re.search(r'\w', part))
+
+def search_database_posts(query, page, per_page):
+    """Search the knowledge base full-text index. Returns one page of posts, best first, and the exact number of matches."""
+    match = fts_query(query)
+    if not match:
+        return [], 0
+    
+    with db_pool.connection() as conn:
+        total = conn.execute("SELECT COUNT(*) FROM posts_fts WHERE posts_fts MATCH ?", (match,)).fetchone()[0]
+        rows = conn.execute(
+            "SELECT p.record FROM posts_fts f JOIN posts p ON p.id = f.rowid "
+            "WHERE posts_fts MATCH ? ORDER BY bm25(posts_fts, ?, ?, ?), f.rowid LIMIT ? OFFSET ?",
+            (match,) + FTS_FIELD_WEIGHTS + (per_page, max(page - 1, 0) * per_page)
+        ).fetchall()
+    return [search_result(json.loads(record)) for record, in rows], total
+
+@cached('search', timeout=PAGE_CACHE_TIMEOUT, unless=lambda rv: rv[2] is not None)  # Errors are not cached
 def search_posts(query, page=1, per_page=50):
-    """Search for posts containing the query string with pagination."""
+    """Search for posts containing the query string with pagination. Returns (posts, total, error)."""
     try:
         if not query:
-            return [], 0
+            return [], 0, None
             
         start_time = time.time()
+        
+        # Posts that contain every query term, ranked by relevance. The ranked index has no
+        # term positions, so quoted phrases go to the knowledge base's full-text index.
+        ranked_index = load_ranked_index() if '"' not in query else None
+        if ranked_index is not None:
+            posts, total_matching = search_ranked_posts(ranked_index, query, page, per_page)
+            logger.info(f"Search for '{query}' found {total_matching} results in {time.time() - start_time:.3f}s")
+            return posts, total_matching, None
+        
+        # All query terms (and quoted phrases) must appear in the title, description or tags
+        if db_pool.available():
+            try:
+                posts, total_matching = search_database_posts(query, page, per_page)
+                logger.info(f"Search for '{query}' found {total_matching} results in {time.time() - start_time:.3f}s")
+                return posts, total_matching, None
+            except sqlite3.Error as e:
+                logger.error(f"Error searching {KNOWLEDGE_BASE_DB}: {e}")
+        
+        # Without an index, scan the dataset for the query (quotes removed) as a substring
         dataset_path = os.path.join(DATA_DIR, 'preprocessed_nlp_dataset.csv')
         if not os.path.exists(dataset_path):
             dataset_path = os.path.join(DATA_DIR, 'nlp_stackoverflow_dataset.csv')
         
         if not os.path.exists(dataset_path):
-            return [], 0
+            return [], 0, None
         
         # Search columns to check
         search_cols = ['title', 'description', 'tags']
-        query_lower = query.lower()
+        query_lower = query.replace('"', '').strip().lower()
+        if not query_lower:
+            return [], 0, None
         
         # Process file in chunks to reduce memory usage
         posts = []
@@ -329,7 +926,7 @@ def search_posts(query, page=1, per_page=50):
                         'description': row['description'] if 'description' in chunk.columns else '',
                         'accepted_answer': row['accepted_answer'] if 'accepted_answer' in chunk.columns else '',
                         'other_answers': row['other_answers'] if 'other_answers' in chunk.columns else '',
-                        'tags': row['tags'].split() if 'tags' in chunk.columns and isinstance(row['tags'], str) else []
+                        'tags': parse_tags(row['tags']) if 'tags' in chunk.columns else []
                     }
                     posts.append(post)
             
@@ -342,16 +939,25 @@ def search_posts(query, page=1, per_page=50):
         gc.collect()
         
         logger.info(f"Search for '{query}' found {total_matching} results in {time.time() - start_time:.2f}s")
-        return posts, total_matching
+        return posts, total_matching, None
             
     except Exception as e:
         logger.error(f"Error searching: {e}")
-        return [], 0
+        return [], 0, f"Error searching: {str(e)}"
 
 @cached('top_tags', timeout=86400)  # Cache for 24 hours
 def load_top_tags():
     """Extract top tags from the visualization data"""
     try:
+        if db_pool.available():
+            try:
+                with db_pool.connection() as conn:
+                    return [[name, count] for name, count in conn.execute(
+                        "SELECT t.name, COUNT(*) AS posts FROM post_tags pt JOIN tags t ON t.id = pt.tag_id "
+                        "GROUP BY pt.tag_id ORDER BY posts DESC, pt.tag_id LIMIT 10")]
+            except sqlite3.Error as e:
+                logger.error(f"Error reading tags from {KNOWLEDGE_BASE_DB}: {e}")
+        
         # Check if we already have this data cached in a file
         tags_cache_file = os.path.join(DATA_DIR, 'top_tags_cache.json')
         if os.path.exists(tags_cache_file):
@@ -363,17 +969,15 @@ def load_top_tags():
             dataset_path = os.path.join(DATA_DIR, 'nlp_stackoverflow_dataset.csv')
             
         if os.path.exists(dataset_path):
-            tag_counts = {}
-            
-            # Process in chunks to save memory
-            for chunk in pd.read_csv(dataset_path, chunksize=CHUNK_SIZE):
-                if 'tags' in chunk.columns:
-                    for tags_str in chunk['tags'].fillna(''):
-                        if isinstance(tags_str, str):
-                            tags = tags_str.strip("[]'").replace("'", "").split(', ')
-                            for tag in tags:
-                                if tag:
-                                    tag_counts[tag] = tag_counts.get(tag, 0) + 1
+            # Parsed tags cached by the pipeline, else parse the CSV in chunks to save memory
+            tag_counts = load_tag_counts(dataset_path)
+            if tag_counts is None:
+                tag_counts = {}
+                for chunk in pd.read_csv(dataset_path, usecols=lambda col: col == 'tags', chunksize=CHUNK_SIZE):
+                    if 'tags' in chunk.columns:
+                        for tags in chunk['tags']:
+                            for tag in parse_tags(tags):
+                                tag_counts[tag] = tag_counts.get(tag, 0) + 1
             
             # Sort by count and take top 10
             top_tags = sorted(tag_counts.items(), key=lambda x: x[1], reverse=True)[:10]
@@ -392,6 +996,17 @@ def load_top_tags():
 def get_dataset_stats():
     """Get statistics about the dataset"""
     try:
+        if db_pool.available():
+            try:
+                with db_pool.connection() as conn:
+                    return {
+                        'total_posts': conn.execute("SELECT COUNT(*) FROM posts").fetchone()[0],
+                        'categories': dict(conn.execute(
+                            "SELECT method, SUM(post_count) FROM categories GROUP BY method ORDER BY MIN(id)").fetchall())
+                    }
+            except sqlite3.Error as e:
+                logger.error(f"Error reading statistics from {KNOWLEDGE_BASE_DB}: {e}")
+        
         # Check for cached stats
         stats_cache_file = os.path.join(DATA_DIR, 'dataset_stats_cache.json')
         if os.path.exists(stats_cache_file):
@@ -513,10 +1128,22 @@ def search():
     page = int(request.args.get('page', 1))
     per_page = int(request.args.get('per_page', 20))
     
-    results, total_count = search_posts(query, page=page, per_page=per_page) if query else ([], 0)
+    results, total_count, error = search_posts(query, page=page, per_page=per_page) if query else ([], 0, None)
     
     total_pages = (total_count + per_page - 1) // per_page if total_count > 0 else 1
     
+    # search_posts has already logged the error
+    if error:
+        return render_template('search.html',
+                             query=query,
+                             results=[],
+                             page=page,
+                             total_pages=0,
+                             total_count=0,
+                             per_page=per_page,
+                             error_message=error,
+                             current_year=datetime.now().year)
+    
     return render_template('search.html', 
                            query=query, 
                            results=results,
@@ -554,7 +1181,9 @@ def api_search():
     page = int(request.args.get('page', 1))
     per_page = int(request.args.get('per_page', 20))
     
-    results, total_count = search_posts(query, page=page, per_page=per_page) if query else ([], 0)
+    results, total_count, error = search_posts(query, page=page, per_page=per_page) if query else ([], 0, None)
+    if error:
+        return jsonify({'error': error}), 500
     
     return jsonify({
         'results': results, 
@@ -611,10 +1240,8 @@ def reprocess_categories():
             
         # Initialize categorizer and reprocess categories
         categorizer = PostCategorizer(data_path)
-        categorizer.keyword_based_categorization()
-        categorizer.task_based_categorization()
-        categorizer.question_type_categorization()
-        categorizer.library_based_categorization()
+        # Saves every method, so the category manifest stays complete
+        categorizer.categorize_all()
         
         # Clear cache after reprocessing
         cache.clear()
@@ -704,11 +1331,13 @@ def memory_usage():
     import sys
     
     process = psutil.Process(os.getpid())
+    cache_stats = cache.stats()
     memory_info = {
         'rss': process.memory_info().rss / 1024 / 1024,  # MB
         'vms': process.memory_info().vms / 1024 / 1024,  # MB
         'percent': process.memory_percent(),
-        'cache_size': len(cache._cache) if hasattr(cache, '_cache') else 'Unknown'
+        'cache_size': cache_stats['entries'],
+        'cache': cache_stats
     }
     
     return jsonify(memory_info)